@@ -1,30 +1,104 @@
+from django.conf import settings
 from django.contrib import admin
-from .models import ProjectPost, ProjectResource, Comment, Like, ServiceRequest, AdminReview, Tariff
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connection
+from django.template.response import TemplateResponse
+from django.urls import path
+from django.utils import timezone
+from django.utils.functional import cached_property
+from .analytics import report_range, service_request_report
+from .exports import service_request_export_response
+from .models import ProjectPost, ProjectResource, Comment, Like, ServiceRequest, AdminReview, Tariff, BackgroundJob
+from .views import serialize_service_request, with_service_request_relations
+
+# Changelists stop counting exactly past this many rows
+APPROXIMATE_COUNT_THRESHOLD = getattr(settings, 'APIED_ADMIN_COUNT_THRESHOLD', 10000)
+
+
+def estimated_row_count(model):
+    """Planner statistics for the model's table, or None if the database has none."""
+    table = model._meta.db_table
+    if connection.vendor == 'postgresql':
+        sql, params = "SELECT reltuples::bigint FROM pg_class WHERE relname = %s", [table]
+    elif connection.vendor == 'sqlite':
+        # Filled by ANALYZE; the first number of each entry is the table's row count
+        sql, params = "SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1", [table]
+    else:
+        return None
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            row = cursor.fetchone()
+    except DatabaseError:
+        return None
+    return int(str(row[0]).split()[0]) if row else None
+
+
+class ApproximateCountPaginator(Paginator):
+    """
+    Counts at most APPROXIMATE_COUNT_THRESHOLD rows instead of running a full
+    COUNT(*). Bigger unfiltered tables report the planner's estimate; bigger
+    filtered results report the threshold.
+    """
+    @cached_property
+    def count(self):
+        exact = self.object_list.order_by().values('pk')[:APPROXIMATE_COUNT_THRESHOLD + 1].count()
+        if exact <= APPROXIMATE_COUNT_THRESHOLD:
+            return exact
+        estimate = None if self.object_list.query.where else estimated_row_count(self.object_list.model)
+        return max(estimate or 0, APPROXIMATE_COUNT_THRESHOLD)
+
+
+class ScalableModelAdmin(admin.ModelAdmin):
+    """Changelist defaults for tables that grow with traffic: bounded counts and no second COUNT(*)."""
+    paginator = ApproximateCountPaginator
+    show_full_result_count = False
+
 
 # Register your models here.
 @admin.register(ProjectPost)
-class ProjectPostAdmin(admin.ModelAdmin):
+class ProjectPostAdmin(ScalableModelAdmin):
     list_display = ('title', 'user', 'project_type', 'is_public', 'created_at')
     list_filter = ('project_type', 'is_public')
+    list_select_related = ('user',)
     search_fields = ('title', 'description', 'user__username')
+    autocomplete_fields = ('user',)
     date_hierarchy = 'created_at'
 
+    def get_queryset(self, request):
+        # __str__ shows the owner, so autocomplete results need it too
+        return super().get_queryset(request).select_related('user')
+
+    def save_model(self, request, obj, form, change):
+        if not change:
+            return super().save_model(request, obj, form, change)
+        # Only what the form changed: a full-row save would write back the counters, activity time
+        # and derivatives as they were when the form was loaded
+        obj.save(update_fields=[*form.changed_data, 'updated_at'])
+
 @admin.register(ProjectResource)
-class ProjectResourceAdmin(admin.ModelAdmin):
+class ProjectResourceAdmin(ScalableModelAdmin):
     list_display = ('name', 'project', 'resource_url')
+    list_select_related = ('project__user',)
     search_fields = ('name', 'project__title')
+    autocomplete_fields = ('project',)
 
+# Filtering by project uses search or ?project__id__exact=<id>; a project list_filter renders every project
 @admin.register(Comment)
-class CommentAdmin(admin.ModelAdmin):
+class CommentAdmin(ScalableModelAdmin):
     list_display = ('user', 'project', 'created_at', 'content')
-    list_filter = ('project',)
-    search_fields = ('user__username', 'content')
+    list_select_related = ('user', 'project__user')  # ProjectPost.__str__ shows the owner
+    search_fields = ('user__username', 'content', 'project__title')
+    autocomplete_fields = ('user', 'project')
+    date_hierarchy = 'created_at'
 
 @admin.register(Like)
-class LikeAdmin(admin.ModelAdmin):
+class LikeAdmin(ScalableModelAdmin):
     list_display = ('user', 'project', 'created_at')
-    list_filter = ('project',)
+    list_select_related = ('user', 'project__user')  # ProjectPost.__str__ shows the owner
     search_fields = ('user__username', 'project__title')
+    autocomplete_fields = ('user', 'project')
+    date_hierarchy = 'created_at'
 
 # --- NEW: Service Request Admin ---
 
@@ -32,21 +106,21 @@ class AdminReviewInline(admin.TabularInline):
     """Allows adding reviews directly within the service request view."""
     model = AdminReview
     extra = 1 # Show one empty review form
-    readonly_fields = ('created_at',)
-    
-    def get_formset(self, request, obj=None, **kwargs):
-        """Automatically set the admin user."""
-        formset = super().get_formset(request, obj, **kwargs)
-        formset.form.base_fields['admin_user'].initial = request.user
-        return formset
+    fields = ('comment', 'admin_user', 'created_at')
+    # The author is set in ServiceRequestAdmin.save_formset(), so no select of every staff user is rendered
+    readonly_fields = ('admin_user', 'created_at')
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('admin_user')
 
 @admin.register(ServiceRequest)
-class ServiceRequestAdmin(admin.ModelAdmin):
+class ServiceRequestAdmin(ScalableModelAdmin):
     list_display = ('request_code', 'organization_name', 'service_type', 'primary_email', 'created_at')
     list_filter = ('service_type', 'budget_range', 'organization_type', 'created_at')
     search_fields = ('request_code', 'organization_name', 'primary_email', 'job_description')
     readonly_fields = ('request_code', 'created_at', 'updated_at', 'user')
     inlines = [AdminReviewInline]
+    actions = ['export_csv', 'export_ndjson']
     
     fieldsets = (
         ('Request Details', {
@@ -66,9 +140,60 @@ class ServiceRequestAdmin(admin.ModelAdmin):
         })
     )
 
+    @admin.action(description="Export selected requests with reviews (CSV)")
+    def export_csv(self, request, queryset):
+        return service_request_export_response(with_service_request_relations(queryset.order_by('-created_at', '-id')), 'csv', serialize_service_request)
+
+    @admin.action(description="Export selected requests with reviews (NDJSON)")
+    def export_ndjson(self, request, queryset):
+        return service_request_export_response(with_service_request_relations(queryset.order_by('-created_at', '-id')), 'ndjson', serialize_service_request)
+
+    def save_formset(self, request, form, formset, change):
+        """Automatically set the admin user on new reviews."""
+        for review in formset.save(commit=False):
+            if review.admin_user_id is None:
+                review.admin_user = request.user
+            review.save()
+        for review in formset.deleted_objects:
+            review.delete()
+        formset.save_m2m()
+
+    def get_urls(self):
+        stats = path('stats/', self.admin_site.admin_view(self.stats_view), name='apied_servicerequest_stats')
+        return [stats] + super().get_urls()
+
+    def stats_view(self, request):
+        """Pipeline dashboard built on the daily rollups (same data as /api/service-requests/stats/)."""
+        try:
+            start, end = report_range(request.GET)
+        except ValueError as e:
+            self.message_user(request, str(e), level='error')
+            start, end = report_range({})
+        report = service_request_report(start, end)
+        labels = {
+            'service_type': dict(ServiceRequest.SERVICE_CHOICES),
+            'budget_range': dict(ServiceRequest.BUDGET_CHOICES),
+            'country': {},
+        }
+        breakdowns = [
+            (field.replace('_', ' ').title(), [(labels[field].get(key, key), n) for key, n in rows.items()])
+            for field, rows in report['breakdown'].items()
+        ]
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': 'Service request pipeline',
+            'report': report,
+            'breakdowns': breakdowns,
+            'peak': max([d['requests'] for d in report['days']] + [1]),
+        }
+        return TemplateResponse(request, 'admin/apied/servicerequest/stats.html', context)
+
 @admin.register(AdminReview)
-class AdminReviewAdmin(admin.ModelAdmin):
+class AdminReviewAdmin(ScalableModelAdmin):
     list_display = ('service_request', 'admin_user', 'created_at')
+    list_select_related = ('service_request', 'admin_user')
+    autocomplete_fields = ('service_request', 'admin_user')
     search_fields = ('service_request__request_code', 'admin_user__username', 'comment')
 
 # --- NEW: Tariff Admin ---
@@ -78,3 +203,18 @@ class TariffAdmin(admin.ModelAdmin):
     list_filter = ('is_active',)
     search_fields = ('title', 'description', 'price')
     list_editable = ('order', 'is_active', 'price') # Allow quick edits from the list view
+
+# --- NEW: Background Job Admin ---
+@admin.register(BackgroundJob)
+class BackgroundJobAdmin(admin.ModelAdmin):
+    list_display = ('name', 'status', 'attempts', 'max_attempts', 'run_at', 'locked_by', 'finished_at')
+    list_filter = ('status', 'name')
+    readonly_fields = ('attempts', 'locked_by', 'locked_until', 'last_error', 'created_at', 'finished_at')
+    actions = ['retry_jobs']
+
+    @admin.action(description="Retry selected jobs now")
+    def retry_jobs(self, request, queryset):
+        updated = queryset.exclude(status='running').update(
+            status='queued', attempts=0, run_at=timezone.now(), finished_at=None, last_error='',
+        )
+        self.message_user(request, f"Queued {updated} job(s) for retry.")
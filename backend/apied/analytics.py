@@ -0,0 +1,110 @@
+# apied/analytics.py
+#
+# Daily service-request rollups (ServiceRequestDailyStat) behind the staff
+# stats endpoint and the admin dashboard. New requests are added incrementally
+# by the signal in apied/signals.py; edits and deletes recompute their day.
+
+from datetime import date, timedelta
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from .models import ServiceRequest, ServiceRequestDailyStat
+
+ROLLUP_DIMENSIONS = ('service_type', 'budget_range', 'country')
+
+# Rough value of each budget band in RWF, used for pipeline estimates only
+BUDGET_ESTIMATES = {
+    'below_20k': 10_000,
+    '20k_50k': 35_000,
+    '50k_100k': 75_000,
+    '100k_200k': 150_000,
+    '200k_500k': 350_000,
+    'above_500k': 500_000,
+}
+
+DEFAULT_REPORT_DAYS = 30
+MAX_REPORT_DAYS = 3660
+
+
+def rollup_key(service_request):
+    key = {dim: getattr(service_request, dim) for dim in ROLLUP_DIMENSIONS}
+    key['day'] = timezone.localdate(service_request.created_at)
+    return key
+
+
+def record_service_request(service_request):
+    """Adds one newly created request to its rollup row."""
+    key = rollup_key(service_request)
+    if ServiceRequestDailyStat.objects.filter(**key).update(requests=F('requests') + 1):
+        return
+    try:
+        with transaction.atomic():
+            ServiceRequestDailyStat.objects.create(requests=1, **key)
+    except IntegrityError:
+        # A concurrent request created the row first
+        ServiceRequestDailyStat.objects.filter(**key).update(requests=F('requests') + 1)
+
+
+def rebuild_rollups(day=None):
+    """
+    Recomputes rollup rows from ServiceRequest for one day, or for every day when
+    `day` is None. Returns the number of rows written.
+    """
+    service_requests = ServiceRequest.objects.all()
+    stats = ServiceRequestDailyStat.objects.all()
+    if day is not None:
+        service_requests = service_requests.filter(created_at__date=day)
+        stats = stats.filter(day=day)
+    rows = (
+        service_requests.annotate(day=TruncDate('created_at'))
+        .values('day', *ROLLUP_DIMENSIONS)
+        .annotate(requests=Count('id'))
+        .order_by()
+    )
+    with transaction.atomic():
+        stats.delete()
+        return len(ServiceRequestDailyStat.objects.bulk_create(ServiceRequestDailyStat(**row) for row in rows))
+
+
+def service_request_report(start, end):
+    """
+    Summarizes requests created from `start` to `end` (inclusive dates): daily
+    totals with empty days filled in, a breakdown per dimension and an estimated
+    pipeline value. Reads only the rollup table, so the cost grows with the
+    number of days and categories rather than the number of requests.
+    """
+    stats = ServiceRequestDailyStat.objects.filter(day__gte=start, day__lte=end)
+    per_day = dict(stats.values_list('day').annotate(total=Sum('requests')).order_by())
+    breakdown = {
+        dim: dict(stats.values_list(dim).annotate(total=Sum('requests')).order_by('-total', dim))
+        for dim in ROLLUP_DIMENSIONS
+    }
+    days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+    return {
+        'from': start,
+        'to': end,
+        'total': sum(per_day.values()),
+        'estimated_budget_rwf': sum(BUDGET_ESTIMATES.get(band, 0) * n for band, n in breakdown['budget_range'].items()),
+        'days': [{'day': day, 'requests': per_day.get(day, 0)} for day in days],
+        'breakdown': breakdown,
+    }
+
+
+def report_range(params):
+    """
+    Reads the 'from'/'to' ISO dates from a QueryDict, defaulting to the last
+    DEFAULT_REPORT_DAYS days. Raises ValueError on malformed or oversized ranges.
+    """
+    today = timezone.localdate()
+    end = date_param(params.get('to')) or today
+    start = date_param(params.get('from')) or end - timedelta(days=DEFAULT_REPORT_DAYS - 1)
+    if start > end:
+        raise ValueError("'from' must not be after 'to'.")
+    if (end - start).days >= MAX_REPORT_DAYS:
+        raise ValueError(f"Reports cover at most {MAX_REPORT_DAYS} days.")
+    return start, end
+
+
+def date_param(value):
+    return date.fromisoformat(value) if value else None
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ApiedConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apied"
+
+    def ready(self):
+        from . import db, instrumentation, signals, tasks  # noqa: F401
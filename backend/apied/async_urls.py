@@ -0,0 +1,19 @@
+# apied/async_urls.py
+
+from django.urls import path
+from . import async_views, urls
+
+# Same routes as apied/urls.py, with the public read endpoints swapped for their async versions
+ASYNC_VIEWS = {
+    'api-projects': async_views.projects_list_create_view,
+    'api-project-detail': async_views.project_detail_update_delete_view,
+    'api-search': async_views.project_search_view,
+    'api-user-portfolio': async_views.user_portfolio_view,
+    'api-service-request-detail': async_views.service_request_detail_view,
+    'api-tariffs': async_views.tariff_list_view,
+}
+
+urlpatterns = [
+    path(str(pattern.pattern), ASYNC_VIEWS.get(pattern.name, pattern.callback), name=pattern.name)
+    for pattern in urls.urlpatterns
+]
@@ -0,0 +1,143 @@
+# apied/async_views.py
+#
+# Async versions of the public read endpoints, served under the ASGI profile
+# (apied_service/settings_asgi.py). They share serializers, cache keys and
+# validators with apied/views.py; writes are handed to the sync views.
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models import aprefetch_related_objects
+from django.shortcuts import aget_object_or_404
+from django.utils.cache import get_conditional_response
+from django.views.decorators.csrf import csrf_exempt
+from . import views
+from .caching import PROJECT_CACHE_TIMEOUT, TARIFF_CACHE_KEY, project_cache_key
+from .models import ProjectPost, ServiceRequest, Tariff
+from .instrumentation import record_cache
+from .pagination import InvalidCursor, apaginate_queryset, get_page_size, set_next_cursor
+from .responses import JsonResponse
+from .search import fts_available, search_project_ids
+from .streaming import astreaming_json_response, wants_stream
+
+# --- Helpers ---
+
+async def cached_project_payloads(projects, request, include_details=False):
+    """Async counterpart of views.cached_project_payloads()."""
+    keys = {p.id: project_cache_key(p, request, include_details) for p in projects}
+    cached = await cache.aget_many(keys.values())
+    missing = [p for p in projects if keys[p.id] not in cached]
+    record_cache(len(projects) - len(missing), len(missing))
+    if missing:
+        if include_details:
+            await aprefetch_related_objects(missing, *views.PROJECT_DETAIL_PREFETCHES)
+        misses = {keys[p.id]: views.serialize_project(p, request, include_details) for p in missing}
+        await cache.aset_many(misses, PROJECT_CACHE_TIMEOUT)
+        cached.update(misses)
+    return views.merge_owner_fields(projects, [cached[keys[p.id]] for p in projects])
+
+async def conditional_project_response(request, projects, build_response, user, with_last_modified=False):
+    """Async counterpart of views.conditional_project_response()."""
+    etag, last_modified = views.project_validators(request, projects, user, with_last_modified)
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = await build_response()
+    return views.set_project_validators(response, etag, last_modified)
+
+async def paginated_project_response(request, projects):
+    """Async counterpart of views.paginated_project_response()."""
+    user = await request.auser()
+    projects = views.with_viewer_state(views.with_project_relations(projects), user)
+    if wants_stream(request):
+        projects = projects.order_by('-created_at', '-id')
+        return astreaming_json_response(projects, lambda p: views.serialize_project_for_viewer(p, request))
+    try:
+        page, next_cursor = await apaginate_queryset(projects, request)
+    except InvalidCursor as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    async def build_response():
+        response = JsonResponse(await cached_project_payloads(page, request), safe=False)
+        return set_next_cursor(response, request, next_cursor)
+    return await conditional_project_response(request, page, build_response, user)
+
+
+# --- Project Views ---
+@csrf_exempt
+async def projects_list_create_view(request):
+    if request.method != 'GET':
+        return await sync_to_async(views.projects_list_create_view)(request)
+    return await paginated_project_response(request, ProjectPost.objects.filter(is_public=True))
+
+
+@csrf_exempt
+async def project_detail_update_delete_view(request, pk):
+    if request.method != 'GET':
+        return await sync_to_async(views.project_detail_update_delete_view)(request, pk)
+
+    user = await request.auser()
+    project = await aget_object_or_404(views.with_viewer_state(views.with_project_relations(ProjectPost.objects.all()), user), pk=pk)
+    # Check if user has access (is owner or project is public)
+    if not project.is_public and project.user_id != user.id:
+        return JsonResponse({'error': 'Project not found or you do not have permission.'}, status=404)
+
+    async def build_response():
+        return JsonResponse((await cached_project_payloads([project], request, include_details=True))[0])
+    return await conditional_project_response(request, [project], build_response, user, with_last_modified=True)
+
+
+async def project_search_view(request):
+    query = request.GET.get('q', '')
+    if not query:
+        return JsonResponse([], safe=False)
+
+    if not fts_available():
+        return await paginated_project_response(request, views.icontains_search_queryset(query))
+
+    # The FTS5 query is raw SQL, which Django only runs synchronously
+    try:
+        ids, next_cursor = await sync_to_async(search_project_ids)(
+            query, get_page_size(request), request.GET.get('cursor'),
+        )
+    except InvalidCursor as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    user = await request.auser()
+    projects = await views.with_viewer_state(views.with_project_relations(ProjectPost.objects.all()), user).ain_bulk(ids)
+    payloads = await cached_project_payloads([projects[pk] for pk in ids if pk in projects], request)
+    return set_next_cursor(JsonResponse(payloads, safe=False), request, next_cursor)
+
+
+async def user_portfolio_view(request, username):
+    owner = await aget_object_or_404(User, username=username)
+    projects = ProjectPost.objects.filter(user=owner)
+    # Filter for public projects if the viewer is not the owner
+    if (await request.auser()).id != owner.id:
+        projects = projects.filter(is_public=True)
+    return await paginated_project_response(request, projects)
+
+
+# --- Service Request and Tariff Views ---
+@csrf_exempt
+async def service_request_detail_view(request):
+    """Fetches a service request by its unique code."""
+    code = request.GET.get('code', '').strip().upper()
+    if not code:
+        return JsonResponse({'error': 'A request code is required.'}, status=400)
+    try:
+        service_request = await views.with_service_request_relations(ServiceRequest.objects.all()).aget(request_code=code)
+    except ServiceRequest.DoesNotExist:
+        return JsonResponse({'error': 'Invalid request code.'}, status=404)
+    return JsonResponse(views.serialize_service_request(service_request))
+
+
+async def tariff_list_view(request):
+    """Async counterpart of views.tariff_list_view(); a cache hit never touches the database."""
+    if request.method not in ('GET', 'HEAD'):
+        return JsonResponse({'error': 'Only GET requests are allowed.'}, status=405)
+    cached = await cache.aget(TARIFF_CACHE_KEY)
+    record_cache(cached is not None, cached is None)
+    if cached is None:
+        tariffs = [t async for t in Tariff.objects.filter(is_active=True).order_by('order')]
+        cached = views.build_tariff_entry(tariffs)
+        await cache.aset(TARIFF_CACHE_KEY, cached, None)
+    return views.tariff_response(request, *cached)
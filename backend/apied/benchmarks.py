@@ -0,0 +1,177 @@
+# apied/benchmarks.py
+#
+# Per-endpoint benchmark scenarios behind `manage.py benchmark_endpoints`.
+# Every named route in apied/urls.py has at least one scenario; each run
+# records latency percentiles, SQL query counts and response sizes so results
+# can be saved as JSON and compared across commits.
+
+import json
+import statistics
+import time
+from collections import namedtuple
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from . import urls as apied_urls
+from .models import Comment, ProjectPost, ServiceRequest
+
+# Seeded users all share this password (see seed_data)
+SEED_PASSWORD = 'seed-password'
+
+
+class BenchmarkContext:
+    """The seeded rows and logged-in clients the scenarios run against."""
+
+    def __init__(self):
+        self.project = (
+            ProjectPost.objects.filter(is_public=True).annotate(n=Count('comments'))
+            .order_by('-n', '-likes_count').select_related('user').first()
+        )
+        if self.project is None:
+            raise ValueError("No public projects to benchmark; seed the database first.")
+        self.owner = self.project.user
+        self.viewer = User.objects.filter(is_staff=False).exclude(pk=self.owner.pk).first() or self.owner
+        self.staff = User.objects.filter(is_staff=True).first()
+        if self.staff is None:
+            raise ValueError("No staff user to benchmark staff endpoints with; seed the database first.")
+        self.service_request = ServiceRequest.objects.order_by('-created_at').first()
+        self.batch_ids = ','.join(str(pk) for pk in ProjectPost.objects.filter(is_public=True).values_list('pk', flat=True)[:50])
+        self.clients = {'anonymous': Client()}
+        for role, user in (('viewer', self.viewer), ('owner', self.owner), ('staff', self.staff)):
+            self.clients[role] = Client()
+            self.clients[role].force_login(user)
+
+
+def project_kwargs(ctx, i):
+    return {'pk': ctx.project.pk}
+
+
+def service_request_body(ctx, i):
+    return {
+        'service_type': 'build_website', 'country': 'Rwanda', 'city': 'Kigali', 'organization_type': 'company',
+        'organization_name': f'Benchmark {i}', 'preferred_language': 'English', 'job_description': 'A website',
+        'primary_phone': '0780000000', 'primary_email': 'bench@example.com', 'budget_range': '50k_100k',
+        'terms_accepted': True,
+    }
+
+
+def new_comment(ctx, i):
+    # Each DELETE needs its own comment; created here, outside the timed request
+    comment = Comment.objects.create(project=ctx.project, user=ctx.viewer, content='To be deleted')
+    return {'pk': ctx.project.pk, 'comment_id': comment.pk}
+
+
+def relogin(ctx, client):
+    client.force_login(ctx.viewer)
+
+
+# role is 'anonymous', 'viewer', 'owner' or 'staff'; any other role gets a fresh client of its own.
+# kwargs(ctx, i) builds the URL kwargs, data(ctx, i) the GET params or request body, setup(ctx, client)
+# runs untimed before each request.
+Scenario = namedtuple('Scenario', 'label route method role kwargs data encoding setup', defaults=(None, None, 'json', None))
+
+SCENARIOS = [
+    Scenario('register', 'api-register', 'POST', 'register',
+             data=lambda ctx, i: {'username': f'bench-{time.time_ns()}', 'password': 'bench-password'}),
+    Scenario('login', 'api-login', 'POST', 'login',
+             data=lambda ctx, i: {'username': ctx.viewer.username, 'password': SEED_PASSWORD}),
+    Scenario('logout', 'api-logout', 'POST', 'logout', setup=relogin),
+    Scenario('current user', 'api-current-user', 'GET', 'viewer'),
+
+    Scenario('feed', 'api-projects', 'GET', 'anonymous'),
+    Scenario('feed (signed in)', 'api-projects', 'GET', 'viewer'),
+    Scenario('feed (200 per page)', 'api-projects', 'GET', 'anonymous', data=lambda ctx, i: {'limit': 200}),
+    Scenario('create project', 'api-projects', 'POST', 'viewer', encoding='form',
+             data=lambda ctx, i: {'title': f'Benchmark {i}', 'project_url': 'https://example.com', 'is_public': 'on'}),
+    Scenario('project detail', 'api-project-detail', 'GET', 'anonymous', project_kwargs),
+    Scenario('update project', 'api-project-detail', 'PUT', 'owner', project_kwargs,
+             data=lambda ctx, i: {'description': f'Edited {i}'}),
+    Scenario('project batch (50)', 'api-project-batch', 'GET', 'anonymous', data=lambda ctx, i: {'ids': ctx.batch_ids}),
+
+    Scenario('like toggle', 'api-like-toggle', 'POST', 'viewer', project_kwargs),
+    Scenario('comments', 'api-comments', 'GET', 'anonymous', project_kwargs),
+    Scenario('post comment', 'api-comments', 'POST', 'viewer', project_kwargs, data=lambda ctx, i: {'content': f'Comment {i}'}),
+    Scenario('delete comment', 'api-comment-delete', 'DELETE', 'viewer', new_comment),
+    Scenario('resources', 'api-resources', 'GET', 'owner', project_kwargs),
+    Scenario('add resource', 'api-resources', 'POST', 'owner', project_kwargs,
+             data=lambda ctx, i: {'name': f'Doc {i}', 'resource_url': 'https://docs.example.com'}),
+
+    Scenario('search', 'api-search', 'GET', 'anonymous', data=lambda ctx, i: {'q': 'django shop'}),
+    Scenario('suggest', 'api-search-suggest', 'GET', 'anonymous', data=lambda ctx, i: {'q': 'da'}),
+    Scenario('portfolio', 'api-user-portfolio', 'GET', 'anonymous', lambda ctx, i: {'username': ctx.owner.username}),
+
+    Scenario('create service request', 'api-service-request-create', 'POST', 'anonymous', data=service_request_body),
+    Scenario('service request lookup', 'api-service-request-detail', 'GET', 'anonymous',
+             data=lambda ctx, i: {'code': ctx.service_request.request_code}),
+    Scenario('service requests (staff)', 'api-service-request-list', 'GET', 'staff'),
+    Scenario('service request export', 'api-service-request-export', 'GET', 'staff'),
+    Scenario('service request stats', 'api-service-request-stats', 'GET', 'staff'),
+    Scenario('tariffs', 'api-tariffs', 'GET', 'anonymous'),
+    Scenario('metrics', 'api-metrics', 'GET', 'staff'),
+]
+
+
+def uncovered_routes(scenarios=SCENARIOS):
+    """Named routes in apied/urls.py that no scenario exercises."""
+    names = {pattern.name for pattern in apied_urls.urlpatterns if pattern.name}
+    return sorted(names - {scenario.route for scenario in scenarios})
+
+
+def percentile(values, pct):
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method='inclusive')[pct - 1]
+
+
+def request(client, method, path, data, encoding):
+    if method == 'GET':
+        return client.get(path, data)
+    if encoding == 'form':
+        return client.post(path, data)
+    return client.generic(method, path, json.dumps(data or {}), content_type='application/json')
+
+
+def run_scenario(ctx, scenario, repeat, warmup=2, cold=False):
+    label, name, method, role, kwargs, data, encoding, setup = scenario
+    client = ctx.clients.setdefault(role, Client())
+    timings, queries, sizes, statuses = [], [], [], set()
+
+    for i in range(warmup + repeat):
+        path = reverse(name, kwargs=kwargs(ctx, i) if kwargs else None)
+        payload = data(ctx, i) if data else None
+        if setup:
+            setup(ctx, client)
+        if cold:
+            cache.clear()
+        with CaptureQueriesContext(connection) as captured:
+            start = time.perf_counter()
+            response = request(client, method, path, payload, encoding)
+            body = b''.join(response.streaming_content) if response.streaming else response.content
+            elapsed = (time.perf_counter() - start) * 1000
+        if i < warmup:
+            continue
+        timings.append(elapsed)
+        queries.append(len(captured))
+        sizes.append(len(body))
+        statuses.add(response.status_code)
+
+    return {
+        'label': label, 'route': name, 'method': method,
+        'p50': percentile(timings, 50), 'p95': percentile(timings, 95), 'p99': percentile(timings, 99),
+        'queries': statistics.median(queries), 'max_queries': max(queries),
+        'bytes': int(statistics.median(sizes)), 'status': sorted(statuses),
+    }
+
+
+def run_benchmarks(repeat, only=None, cold=False):
+    """Runs every scenario (or those whose label or route contains `only`) and returns their results."""
+    ctx = BenchmarkContext()
+    return [
+        run_scenario(ctx, scenario, repeat, cold=cold)
+        for scenario in SCENARIOS
+        if not only or only in scenario.label or only in scenario.route
+    ]
@@ -0,0 +1,34 @@
+# apied/caching.py
+
+from django.conf import settings
+from django.core.cache import cache
+
+# Serialized, ETagged tariff list: (body bytes, etag). Rebuilt on the next request after any change.
+TARIFF_CACHE_KEY = 'apied:tariffs'
+
+
+def invalidate_tariffs():
+    cache.delete(TARIFF_CACHE_KEY)
+
+
+# --- Serialized Project Payloads ---
+# Keyed on a version stamp rather than invalidated: any edit, like, comment or
+# resource change moves updated_at/last_activity_at, so stale entries are simply never read again.
+
+PROJECT_CACHE_TIMEOUT = getattr(settings, 'APIED_PROJECT_CACHE_TIMEOUT', 60 * 60 * 24)
+
+
+def project_changed_at(project):
+    """The latest of the project's own edits and its like/comment/resource activity."""
+    return max(project.updated_at, project.last_activity_at or project.updated_at)
+
+
+def project_version(project):
+    return int(project_changed_at(project).timestamp() * 1_000_000)
+
+
+def project_cache_key(project, request, include_details):
+    # Host is part of the key because screenshot URLs are absolute
+    host = request.get_host() if request else ''
+    detail = 'detail' if include_details else 'card'
+    return f"apied:project:{project.id}:{project_version(project)}:{detail}:{host}"
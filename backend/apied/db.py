@@ -0,0 +1,44 @@
+# apied/db.py
+#
+# Per-connection SQLite tuning. Every new connection runs the PRAGMAs in
+# settings.APIED_SQLITE_PRAGMAS (see apied_service/settings_production.py);
+# nothing is changed when the setting is empty or the database is not SQLite.
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+# SQLite's own defaults (and Python's 5 second busy timeout), for comparison in benchmarks
+SQLITE_DEFAULT_PRAGMAS = {
+    'journal_mode': 'DELETE',
+    'synchronous': 'FULL',
+    'busy_timeout': 5000,
+    'mmap_size': 0,
+    'cache_size': -2000,
+}
+
+
+def apply_pragmas(connection, pragmas):
+    """Runs `PRAGMA name = value` for each entry, in order (journal_mode should come first)."""
+    with connection.cursor() as c:
+        for name, value in pragmas.items():
+            if not name.isidentifier():
+                raise ValueError(f"Invalid PRAGMA name {name!r}")
+            c.execute(f"PRAGMA {name} = {value}")
+
+
+def current_pragmas(connection, names):
+    """Reads back the given PRAGMAs as {name: value}."""
+    values = {}
+    with connection.cursor() as c:
+        for name in names:
+            c.execute(f"PRAGMA {name}")
+            values[name] = c.fetchone()[0]
+    return values
+
+
+@receiver(connection_created)
+def configure_connection(sender, connection, **kwargs):
+    pragmas = getattr(settings, 'APIED_SQLITE_PRAGMAS', None)
+    if pragmas and connection.vendor == 'sqlite':
+        apply_pragmas(connection, pragmas)
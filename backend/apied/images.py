@@ -0,0 +1,73 @@
+# apied/images.py
+
+import os
+from io import BytesIO
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.utils import timezone
+from PIL import Image, ImageOps
+from .jobs import enqueue
+from .models import ProjectPost
+
+# Target widths; the card size serves feed cards, retina covers 2x detail views.
+SCREENSHOT_WIDTHS = getattr(settings, 'APIED_SCREENSHOT_WIDTHS', {'card': 480, 'detail': 1200, 'retina': 2400})
+
+SCREENSHOT_FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+DERIVATIVES_DIR = 'project_screenshots/derivatives'
+
+
+def needs_derivatives(project):
+    return bool(project.screenshot) and (project.screenshot_derivatives or {}).get('source') != project.screenshot.name
+
+
+def schedule_screenshot_derivatives(project_id):
+    """Queues derivative generation for the job worker (manage.py run_jobs)."""
+    enqueue('generate_screenshot_derivatives', {'project_id': project_id}, unique=True)
+
+
+def generate_screenshot_derivatives(project_id):
+    """
+    Writes a resized WebP and JPEG of the project's screenshot for every size in
+    SCREENSHOT_WIDTHS (never upscaling), records them on the project and bumps
+    its version so cached payloads pick up the new srcset.
+    Returns False if there was nothing to do.
+    """
+    project = ProjectPost.objects.filter(pk=project_id).first()
+    if project is None or not project.screenshot:
+        return False
+    source = project.screenshot.name
+    storage = project.screenshot.storage
+
+    with project.screenshot.open('rb') as f:
+        image = ImageOps.exif_transpose(Image.open(f))
+        image = image.convert('RGB')
+
+    sizes, widths = {}, set()
+    for size, target in SCREENSHOT_WIDTHS.items():
+        width = min(target, image.width)
+        if width in widths:
+            continue  # Small originals would otherwise produce duplicate srcset entries
+        widths.add(width)
+        height = round(image.height * width / image.width)
+        resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+
+        derivative = {'width': width}
+        for ext, (fmt, options) in SCREENSHOT_FORMATS.items():
+            buffer = BytesIO()
+            resized.save(buffer, fmt, **options)
+            name = os.path.join(DERIVATIVES_DIR, str(project.pk), f"{size}.{ext}")
+            if storage.exists(name):
+                storage.delete(name)
+            derivative[ext] = storage.save(name, ContentFile(buffer.getvalue()))
+        sizes[size] = derivative
+
+    # Only record the result if the screenshot was not replaced while we worked
+    ProjectPost.objects.filter(pk=project.pk, screenshot=source).update(
+        screenshot_derivatives={'source': source, 'sizes': sizes},
+        last_activity_at=timezone.now(),
+    )
+    return True
@@ -0,0 +1,165 @@
+# apied/instrumentation.py
+#
+# Per-request timing: wall time, SQL (count and time, with session lookups
+# broken out) and JSON encoding. RequestInstrumentationMiddleware reports it
+# in a Server-Timing header and logs requests and queries over the
+# APIED_SLOW_REQUEST_MS / APIED_SLOW_QUERY_MS thresholds, tagged with the
+# resolved URL name. Every request is also counted in apied.metrics.
+#
+# The current request's metrics live in a ContextVar, so ORM work that async
+# views hand to sync_to_async threads is still attributed to the right request.
+# The SQL wrapper is installed on every connection as it is opened (see
+# install_query_timer), which also covers those threads' connections.
+
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from .metrics import registry
+
+logger = logging.getLogger(__name__)
+
+SLOW_REQUEST_MS = getattr(settings, 'APIED_SLOW_REQUEST_MS', 500)
+SLOW_QUERY_MS = getattr(settings, 'APIED_SLOW_QUERY_MS', 100)
+# Longest SQL text kept for the slow-query log
+MAX_LOGGED_SQL = 2000
+
+current_metrics = ContextVar('apied_request_metrics', default=None)
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_ms = 0.0
+        self.session_queries = 0
+        self.session_ms = 0.0
+        self.serialize_ms = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.slow_queries = []
+
+    def elapsed_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    def server_timing(self, total_ms):
+        app_ms = max(0.0, total_ms - self.db_ms - self.serialize_ms)
+        return ', '.join([
+            f'total;dur={total_ms:.3f}',
+            f'db;dur={self.db_ms:.3f};desc="{self.queries} queries"',
+            f'session;dur={self.session_ms:.3f};desc="{self.session_queries} queries"',
+            f'serialize;dur={self.serialize_ms:.3f}',
+            f'app;dur={app_ms:.3f}',
+        ])
+
+
+def record_query(execute, sql, params, many, context):
+    """Connection execute wrapper: times each statement against the current request, if any."""
+    metrics = current_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = (time.perf_counter() - start) * 1000
+        metrics.queries += 1
+        metrics.db_ms += duration
+        if 'django_session' in sql:
+            metrics.session_queries += 1
+            metrics.session_ms += duration
+        if duration >= SLOW_QUERY_MS:
+            metrics.slow_queries.append((duration, sql))
+
+
+@receiver(connection_created)
+def install_query_timer(sender, connection, **kwargs):
+    # connection_created fires again on every reconnect of the same wrapper
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@contextmanager
+def timed(attribute):
+    """Adds the time spent in the block to the current request's `attribute` (e.g. 'serialize_ms')."""
+    metrics = current_metrics.get()
+    if metrics is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        setattr(metrics, attribute, getattr(metrics, attribute) + (time.perf_counter() - start) * 1000)
+
+
+def record_cache(hits, misses):
+    """Counts cache lookups against the current request, for the per-route hit ratio in apied.metrics."""
+    metrics = current_metrics.get()
+    if metrics is not None:
+        metrics.cache_hits += hits
+        metrics.cache_misses += misses
+
+
+def url_name(request):
+    match = getattr(request, 'resolver_match', None)
+    return match.view_name if match else '<unresolved>'
+
+
+class RequestInstrumentationMiddleware:
+    """
+    Adds `Server-Timing: total, db, session, serialize, app` to every response.
+    For streamed responses the figures cover the time until the headers are sent.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return self.finish(request, response, metrics)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return self.finish(request, response, metrics)
+
+    def finish(self, request, response, metrics):
+        total_ms = metrics.elapsed_ms()
+        if getattr(settings, 'APIED_SERVER_TIMING', True):
+            response['Server-Timing'] = metrics.server_timing(total_ms)
+
+        name = url_name(request)
+        registry.observe(
+            name, request.method, response.status_code, total_ms / 1000, metrics.queries, metrics.db_ms / 1000,
+            metrics.cache_hits, metrics.cache_misses,
+        )
+        for duration, sql in metrics.slow_queries:
+            logger.warning("Slow query (%.1f ms) in %s: %s", duration, name, sql[:MAX_LOGGED_SQL])
+        if total_ms >= SLOW_REQUEST_MS:
+            logger.warning(
+                "Slow request %s %s [%s] %s: %.1f ms total, %d queries in %.1f ms, serialize %.1f ms",
+                request.method, request.path, name, response.status_code, total_ms,
+                metrics.queries, metrics.db_ms, metrics.serialize_ms,
+                extra={'url_name': name, 'duration_ms': total_ms, 'queries': metrics.queries},
+            )
+        return response
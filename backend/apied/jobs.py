@@ -0,0 +1,135 @@
+# apied/jobs.py
+#
+# A small job queue kept in the main database (BackgroundJob), so slow side
+# effects can leave the request cycle without an external broker. Tasks are
+# registered with @task in apied/tasks.py and run by `manage.py run_jobs`.
+
+import logging
+import os
+import random
+import socket
+import traceback
+import uuid
+from datetime import timedelta
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils import timezone
+from .models import BackgroundJob
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = getattr(settings, 'APIED_JOB_MAX_ATTEMPTS', 5)
+BATCH_SIZE = getattr(settings, 'APIED_JOB_BATCH_SIZE', 10)
+
+# Seconds a claimed job stays hidden from other workers before it is considered abandoned
+VISIBILITY_TIMEOUT = getattr(settings, 'APIED_JOB_VISIBILITY_TIMEOUT', 300)
+
+# Retry delays grow as BACKOFF_BASE * 2^(attempt - 1) seconds, capped at BACKOFF_MAX
+BACKOFF_BASE = 10
+BACKOFF_MAX = 3600
+
+TASKS = {}
+
+
+def task(func=None, *, name=None):
+    """Registers `func` as a task, under its function name unless `name` is given."""
+    def register(func):
+        TASKS[name or func.__name__] = func
+        return func
+    return register(func) if func else register
+
+
+def enqueue(name, payload=None, delay=0, max_attempts=MAX_ATTEMPTS, unique=False):
+    """
+    Queues task `name`, to be called with `payload` as keyword arguments.
+    The row is written in the caller's transaction, so work queued by a request
+    that rolls back never runs. With unique=True, an identical job that is still
+    waiting to run is reused instead of queueing a duplicate.
+    """
+    if name not in TASKS:
+        raise KeyError(f"Unknown task: {name}")
+    payload = payload or {}
+    if unique:
+        existing = BackgroundJob.objects.filter(name=name, payload=payload, status='queued').first()
+        if existing is not None:
+            return existing
+    return BackgroundJob.objects.create(
+        name=name, payload=payload, max_attempts=max_attempts,
+        run_at=timezone.now() + timedelta(seconds=delay),
+    )
+
+
+def worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def due_jobs(now):
+    """Queued jobs whose run_at has passed, plus running jobs whose lease expired."""
+    return Q(status='queued', run_at__lte=now) | Q(status='running', locked_until__lt=now)
+
+
+def claim_jobs(worker=None, batch_size=BATCH_SIZE, visibility_timeout=VISIBILITY_TIMEOUT):
+    """
+    Leases up to `batch_size` due jobs for `visibility_timeout` seconds and returns them.
+    The lease is taken with one conditional UPDATE, so concurrent workers never
+    claim the same job; each claim counts as an attempt.
+    """
+    now = timezone.now()
+    token = f"{(worker or worker_name())[:47]}:{uuid.uuid4().hex[:16]}"
+    ids = list(BackgroundJob.objects.filter(due_jobs(now)).order_by('run_at', 'id').values_list('id', flat=True)[:batch_size])
+    if not ids:
+        return []
+    BackgroundJob.objects.filter(due_jobs(now), pk__in=ids).update(
+        status='running', locked_by=token, attempts=F('attempts') + 1,
+        locked_until=now + timedelta(seconds=visibility_timeout),
+    )
+    return list(BackgroundJob.objects.filter(locked_by=token, status='running'))
+
+
+def retry_delay(attempts):
+    """Exponential backoff with jitter, so failing jobs don't retry in lockstep."""
+    delay = min(BACKOFF_BASE * 2 ** (attempts - 1), BACKOFF_MAX)
+    return timedelta(seconds=random.uniform(delay / 2, delay))
+
+
+def run_job(job):
+    """
+    Runs one claimed job and records the outcome: done, queued again after a
+    backoff, or failed once max_attempts is used up. Returns True on success.
+    """
+    now = timezone.now()
+    release = {'locked_by': '', 'locked_until': None}
+    try:
+        if job.attempts > job.max_attempts:
+            # Only reachable when earlier leases expired, i.e. the job keeps killing its worker
+            raise RuntimeError(f"Lease expired after {job.max_attempts} attempts.")
+        if job.name not in TASKS:
+            raise KeyError(f"Unknown task: {job.name}")
+        TASKS[job.name](**job.payload)
+    except Exception:
+        logger.exception("Background job %s (%s) failed on attempt %s", job.pk, job.name, job.attempts)
+        outcome = {'last_error': traceback.format_exc()}
+        if job.attempts >= job.max_attempts:
+            outcome.update(status='failed', finished_at=now)
+        else:
+            outcome.update(status='queued', run_at=now + retry_delay(job.attempts))
+        succeeded = False
+    else:
+        outcome = {'status': 'done', 'finished_at': timezone.now(), 'last_error': ''}
+        succeeded = True
+    # If our lease expired and another worker took the job over, its result wins
+    BackgroundJob.objects.filter(pk=job.pk, locked_by=job.locked_by).update(**release, **outcome)
+    return succeeded
+
+
+def run_pending(worker=None, batch_size=BATCH_SIZE, visibility_timeout=VISIBILITY_TIMEOUT):
+    """Claims and runs one batch of due jobs. Returns how many were claimed."""
+    jobs = claim_jobs(worker, batch_size, visibility_timeout)
+    for job in jobs:
+        run_job(job)
+    return len(jobs)
+
+
+def purge_finished(older_than):
+    """Deletes done jobs that finished before `older_than` (a timedelta ago). Failed jobs are kept."""
+    return BackgroundJob.objects.filter(status='done', finished_at__lt=timezone.now() - older_than).delete()[0]
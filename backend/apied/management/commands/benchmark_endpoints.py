@@ -0,0 +1,86 @@
+# apied/management/commands/benchmark_endpoints.py
+
+import json
+import subprocess
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+from apied.benchmarks import run_benchmarks, uncovered_routes
+from .seed_data import volume_arguments
+
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+VOLUME_OPTIONS = ['users', 'projects', 'likes', 'comments', 'resources', 'service_requests', 'reviews', 'days', 'seed']
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds a throwaway test database with seed_data, then times every route in apied/urls.py, "
+        "reporting latency percentiles, SQL query counts and response sizes. "
+        "The real database and cache are never touched."
+    )
+
+    def add_arguments(self, parser):
+        volume_arguments(parser)
+        parser.add_argument('--repeat', type=int, default=30, help="Timed requests per scenario (after 2 warm-up requests).")
+        parser.add_argument('--only', help="Run only scenarios whose label or route name contains this text.")
+        parser.add_argument('--cold', action='store_true', help="Clear the cache before every request.")
+        parser.add_argument('--json', dest='json_path', help="Write the results to this file.")
+        parser.add_argument('--compare', help="A --json file from an earlier run to show deltas against.")
+
+    def handle(self, *args, **options):
+        missing = uncovered_routes()
+        if missing:
+            raise CommandError(f"No benchmark scenario for: {', '.join(missing)}. Add them to apied/benchmarks.py.")
+        baseline = {}
+        if options['compare']:
+            with open(options['compare'], encoding='utf-8') as f:
+                baseline = {r['label']: r for r in json.load(f)['results']}
+
+        volumes = {name: options[name] for name in VOLUME_OPTIONS}
+        old_name = connection.settings_dict['NAME']
+        # As under the test runner: 'testserver' allowed, outgoing mail kept in memory
+        setup_test_environment(debug=False)
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            with override_settings(CACHES=LOCMEM_CACHE, APIED_METRICS_DIR=''):
+                seed_args = [f"--{name.replace('_', '-')}={value}" for name, value in volumes.items()]
+                call_command('seed_data', '--force', *seed_args, stdout=self.stdout)
+                results = run_benchmarks(options['repeat'], only=options['only'], cold=options['cold'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        self.report(results, baseline)
+        if options['json_path']:
+            with open(options['json_path'], 'w', encoding='utf-8') as f:
+                json.dump({'revision': git_revision(), 'volumes': volumes, 'repeat': options['repeat'],
+                           'cold': options['cold'], 'results': results}, f, indent=2)
+            self.stdout.write(f"Wrote {options['json_path']}")
+
+    def report(self, results, baseline):
+        self.stdout.write(
+            f"\n{'scenario':28} {'method':6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'queries':>8} {'bytes':>10}  status"
+        )
+        for r in results:
+            line = (
+                f"{r['label']:28} {r['method']:6} {r['p50']:8.2f} {r['p95']:8.2f} {r['p99']:8.2f} "
+                f"{r['queries']:8g} {r['bytes']:10,}  {','.join(map(str, r['status']))}"
+            )
+            before = baseline.get(r['label'])
+            if before:
+                line += (
+                    f"   p50 {(r['p50'] - before['p50']) / max(before['p50'], 1e-6):+.0%}"
+                    f" queries {r['queries'] - before['queries']:+g}"
+                )
+            if any(status >= 400 for status in r['status']):
+                line = self.style.ERROR(line)
+            self.stdout.write(line)
@@ -0,0 +1,86 @@
+# apied/management/commands/benchmark_json.py
+
+import json
+import random
+import statistics
+import time
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from apied import responses
+
+
+def feed_payload(count, rng):
+    """Shaped like serialize_project() output for a feed page, datetimes left unformatted."""
+    now = timezone.now()
+    return [
+        {
+            'id': i,
+            'title': f"Project {i} " + rng.choice(['Shop', 'Portfolio', 'Dashboard', 'Booking App']),
+            'description': ' '.join(rng.choices(['fast', 'secure', 'django', 'react', 'api', 'mobile'], k=60)),
+            'project_url': f'https://example.com/projects/{i}',
+            'project_type': 'Full-Stack Application',
+            'screenshot_url': f'https://gloex.org/media/project_screenshots/{i}.jpg',
+            'screenshot_srcset': {
+                'webp': ', '.join(f'https://gloex.org/media/d/{i}/{w}.webp {w}w' for w in (480, 1200, 2400)),
+                'jpeg': ', '.join(f'https://gloex.org/media/d/{i}/{w}.jpeg {w}w' for w in (480, 1200, 2400)),
+            },
+            'is_public': True,
+            'created_at': now - timedelta(minutes=i),
+            'username': f'user{i % 40}',
+            'user_id': i % 40,
+            'likes_count': rng.randint(0, 500),
+            'comments_count': rng.randint(0, 50),
+            'source_code_url': f'https://github.com/example/{i}',
+            'custom_field_name': 'Tech Stack',
+            'custom_field_value': 'Django, React, PostgreSQL',
+        }
+        for i in range(count)
+    ]
+
+
+def legacy_dumps(payload):
+    """The pre-helper path: isoformat() in the serializers, then DjangoJSONEncoder."""
+    payload = [dict(item, created_at=item['created_at'].isoformat()) for item in payload]
+    return json.dumps(payload, cls=DjangoJSONEncoder).encode()
+
+
+class Command(BaseCommand):
+    help = "Times JSON encoding of realistic feed payloads with the stdlib and orjson encoders."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[50, 200, 2000], help="Projects per payload.")
+        parser.add_argument('--repeat', type=int, default=200, help="Timed runs per encoder.")
+
+    def handle(self, *args, **options):
+        rng = random.Random(0)
+        orjson = responses.orjson
+        encoders = [('DjangoJSONEncoder', legacy_dumps), ('stdlib fallback', self.stdlib_dumps)]
+        if orjson is not None:
+            encoders.append(('orjson', responses.dumps))
+        else:
+            self.stdout.write(self.style.WARNING("orjson is not installed; only the stdlib encoders are timed."))
+
+        for size in options['sizes']:
+            payload = feed_payload(size, rng)
+            self.stdout.write(f"\n{size} projects")
+            for name, encode in encoders:
+                body = encode(payload)
+                median = self.measure(lambda: encode(payload), options['repeat'])
+                self.stdout.write(f"  {name:18} {median * 1000:9.3f} ms   {len(body) / 1024:8.1f} KiB")
+
+    def stdlib_dumps(self, payload):
+        orjson, responses.orjson = responses.orjson, None
+        try:
+            return responses.dumps(payload)
+        finally:
+            responses.orjson = orjson
+
+    def measure(self, fn, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - start)
+        return statistics.median(timings)
@@ -0,0 +1,89 @@
+# apied/management/commands/benchmark_search.py
+
+import random
+import statistics
+import time
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Q
+from apied.models import ProjectPost
+from apied.search import fts_available, rebuild_search_index, search_project_ids
+
+WORDS = (
+    "django react vue flask api shop portfolio dashboard mobile payments chat booking school "
+    "clinic farm logistics inventory analytics blog gallery kigali rwanda cloud secure fast"
+).split()
+
+QUERIES = ['django', 'shop', 'kig', 'mobile payments', 'user42', 'nomatch']
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares the FTS5 search index with the old icontains Q() filter on synthetic data. "
+        "Runs against a throwaway test database; the real database is never touched."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000], help="Project counts to benchmark.")
+        parser.add_argument('--repeat', type=int, default=20, help="Timed runs per query.")
+        parser.add_argument('--limit', type=int, default=50, help="Page size for both strategies.")
+
+    def handle(self, *args, **options):
+        if not fts_available():
+            raise CommandError("The project search index requires SQLite FTS5.")
+
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            seeded = 0
+            for rows in sorted(options['rows']):
+                self.seed(rows - seeded)
+                seeded = rows
+                self.stdout.write(f"\n{rows:,} projects (median / p95 per query, ms)")
+                for query in QUERIES:
+                    fts = self.measure(lambda: search_project_ids(query, options['limit']), options['repeat'])
+                    scan = self.measure(lambda: self.icontains_page(query, options['limit']), options['repeat'])
+                    self.stdout.write(
+                        f"  {query!r:18} fts5 {fts[0]:8.2f} / {fts[1]:8.2f}   "
+                        f"icontains {scan[0]:8.2f} / {scan[1]:8.2f}   speedup {scan[0] / max(fts[0], 1e-6):.1f}x"
+                    )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def seed(self, count, batch_size=5000):
+        rng = random.Random(count)
+        users = list(User.objects.all()) or User.objects.bulk_create(User(username=f'user{i}') for i in range(500))
+        for start in range(0, count, batch_size):
+            ProjectPost.objects.bulk_create(
+                ProjectPost(
+                    user=rng.choice(users),
+                    title=' '.join(rng.sample(WORDS, 3)).title(),
+                    description=' '.join(rng.choices(WORDS, k=40)),
+                    custom_field_value=', '.join(rng.sample(WORDS, 4)),
+                    project_url='https://example.com',
+                )
+                for _ in range(min(batch_size, count - start))
+            )
+        # bulk_create sends no post_save, so the search index is filled in one pass
+        rebuild_search_index()
+
+    def icontains_page(self, query, limit):
+        """The pre-FTS search: a full scan with three LIKE predicates, newest first."""
+        projects = ProjectPost.objects.filter(
+            Q(is_public=True) & (
+                Q(title__icontains=query) |
+                Q(description__icontains=query) |
+                Q(user__username__icontains=query)
+            )
+        ).order_by('-created_at', '-id')
+        return list(projects.values_list('id', flat=True)[:limit])
+
+    def measure(self, fn, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        return statistics.median(timings), timings[int(len(timings) * 0.95) - 1]
@@ -0,0 +1,140 @@
+# apied/management/commands/benchmark_sqlite_concurrency.py
+
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, connections, transaction
+from django.test.utils import override_settings
+from apied.db import SQLITE_DEFAULT_PRAGMAS
+from apied.models import Comment, Like, ProjectPost
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures feed read throughput while like toggles and comment posts are being written, "
+        "once with SQLite's default settings and once with the production PRAGMAs. "
+        "Runs against a throwaway database file; the real database is never touched."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, default=4, help="Reader threads.")
+        parser.add_argument('--writers', type=int, default=2, help="Writer threads.")
+        parser.add_argument('--seconds', type=float, default=5, help="Duration of each run.")
+        parser.add_argument('--projects', type=int, default=5000, help="Projects seeded before the runs.")
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError("This benchmark only applies to SQLite.")
+        from apied_service.settings_production import APIED_SQLITE_PRAGMAS, DATABASES
+        profiles = [
+            ('SQLite defaults', SQLITE_DEFAULT_PRAGMAS, {}),
+            ('production', APIED_SQLITE_PRAGMAS, DATABASES['default']['OPTIONS']),
+        ]
+
+        # Concurrency needs a real file: the default SQLite test database lives in memory
+        workdir = tempfile.mkdtemp()
+        connection.settings_dict['TEST']['NAME'] = os.path.join(workdir, 'benchmark.sqlite3')
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            self.seed(options['projects'])
+            for label, pragmas, db_options in profiles:
+                settings = ', '.join(f'{k}={v}' for k, v in {**pragmas, **db_options}.items())
+                self.stdout.write(f"\n{label}: {settings}")
+                self.run(pragmas, db_options, options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    def seed(self, count, batch_size=5000):
+        rng = random.Random(count)
+        users = User.objects.bulk_create(User(username=f'user{i}') for i in range(200))
+        for start in range(0, count, batch_size):
+            ProjectPost.objects.bulk_create(
+                ProjectPost(user=rng.choice(users), title=f'Project {start + i}', project_url='https://example.com')
+                for i in range(min(batch_size, count - start))
+            )
+
+    def run(self, pragmas, db_options, options):
+        connections.close_all()
+        # Every thread's connection shares this settings dict
+        connection.settings_dict['OPTIONS'] = db_options
+        with override_settings(APIED_SQLITE_PRAGMAS=pragmas):
+            stop = threading.Event()
+            results = {'read': [], 'write': [], 'errors': 0}
+            lock = threading.Lock()
+            project_ids = list(ProjectPost.objects.values_list('pk', flat=True))
+            user_ids = list(User.objects.values_list('pk', flat=True))
+            connection.close()
+
+            threads = [threading.Thread(target=self.worker, args=(self.read, 'read', stop, results, lock, project_ids, user_ids, seed))
+                       for seed in range(options['readers'])]
+            threads += [threading.Thread(target=self.worker, args=(self.write, 'write', stop, results, lock, project_ids, user_ids, seed))
+                        for seed in range(options['writers'])]
+            for thread in threads:
+                thread.start()
+            time.sleep(options['seconds'])
+            stop.set()
+            for thread in threads:
+                thread.join()
+
+        reads, writes = sorted(results['read']), sorted(results['write'])
+        seconds = options['seconds']
+        self.stdout.write(
+            f"  reads  {len(reads) / seconds:9,.0f}/s   p50 {self.percentile(reads, 50):7.2f} ms   p99 {self.percentile(reads, 99):8.2f} ms"
+        )
+        self.stdout.write(
+            f"  writes {len(writes) / seconds:9,.0f}/s   p50 {self.percentile(writes, 50):7.2f} ms   p99 {self.percentile(writes, 99):8.2f} ms"
+        )
+        self.stdout.write(f"  'database is locked' errors: {results['errors']}")
+
+    def worker(self, operation, kind, stop, results, lock, project_ids, user_ids, seed):
+        rng = random.Random(seed)
+        timings, errors = [], 0
+        try:
+            while not stop.is_set():
+                start = time.perf_counter()
+                try:
+                    operation(rng, project_ids, user_ids)
+                except OperationalError:
+                    errors += 1
+                    continue
+                timings.append((time.perf_counter() - start) * 1000)
+        finally:
+            connection.close()
+        with lock:
+            results[kind].extend(timings)
+            results['errors'] += errors
+
+    def read(self, rng, project_ids, user_ids):
+        """One feed page, as project_list_view queries it."""
+        list(
+            ProjectPost.objects.filter(is_public=True).select_related('user')
+            .order_by('-created_at', '-id')
+            .values('id', 'title', 'likes_count', 'comments_count', 'user__username')[:50]
+        )
+
+    def write(self, rng, project_ids, user_ids):
+        """A like toggle or a comment post, with the same statements as the views."""
+        project_id = rng.choice(project_ids)
+        with transaction.atomic():
+            if rng.random() < 0.5:
+                # The counter and suggestion weight updates come from apied/signals.py, as in the views
+                like, created = Like.objects.get_or_create(project_id=project_id, user_id=rng.choice(user_ids))
+                if not created:
+                    Like.objects.filter(pk=like.pk).delete()
+            else:
+                Comment.objects.create(project_id=project_id, user_id=rng.choice(user_ids), content='Benchmark comment')
+
+    def percentile(self, timings, pct):
+        if not timings:
+            return float('nan')
+        if len(timings) == 1:
+            return timings[0]
+        return statistics.quantiles(timings, n=100)[pct - 1] if pct < 100 else timings[-1]
@@ -0,0 +1,24 @@
+# apied/management/commands/generate_screenshot_derivatives.py
+
+from django.core.management.base import BaseCommand
+from apied.images import generate_screenshot_derivatives, needs_derivatives
+from apied.models import ProjectPost
+
+
+class Command(BaseCommand):
+    help = "Generates resized WebP/JPEG screenshot derivatives for projects that are missing them."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help="Regenerate every project, not just missing ones.")
+
+    def handle(self, *args, **options):
+        projects = ProjectPost.objects.exclude(screenshot='').exclude(screenshot__isnull=True)
+        generated = 0
+        for project in projects.only('id', 'screenshot', 'screenshot_derivatives').iterator():
+            if not (options['all'] or needs_derivatives(project)):
+                continue
+            try:
+                generated += generate_screenshot_derivatives(project.pk)
+            except (OSError, ValueError) as e:
+                self.stderr.write(f"Project {project.pk}: {e}")
+        self.stdout.write(self.style.SUCCESS(f"Generated derivatives for {generated} project(s)."))
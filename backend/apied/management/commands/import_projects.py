@@ -0,0 +1,186 @@
+# apied/management/commands/import_projects.py
+
+import csv
+import json
+import time
+from itertools import islice
+from pathlib import Path
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from apied.models import ProjectPost, ProjectResource
+from apied.search import index_projects
+from apied.suggest import rebuild_suggestions
+
+FORMATS = {'.jsonl': 'jsonl', '.ndjson': 'jsonl', '.csv': 'csv'}
+
+# Source keys copied straight onto ProjectPost; screenshot_url maps to the fallback link
+PROJECT_FIELDS = ['title', 'description', 'project_url', 'project_type', 'source_code_url', 'custom_field_name', 'custom_field_value']
+
+TRUE_VALUES = {'1', 'true', 'yes', 'y', 'on'}
+
+
+def read_records(path, fmt, skip):
+    """
+    Yields (line_number, record) from a JSON Lines or CSV file. Lines that are
+    not valid JSON are reported through skip(line_number, reason) instead.
+    """
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        if fmt == 'csv':
+            reader = csv.DictReader(f)
+            for record in reader:
+                yield reader.line_num, record
+        else:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    skip(line_number, f"invalid JSON: {e}")
+                    continue
+                yield line_number, record
+
+
+def as_bool(value, default=True):
+    if value is None or value == '':
+        return default
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in TRUE_VALUES
+
+
+def parse_created_at(value):
+    """ISO 8601 timestamp or None; naive values are taken to be in the current time zone."""
+    if not value:
+        return None
+    when = parse_datetime(value)
+    if when is None:
+        raise ValueError(f"invalid created_at {value!r}")
+    return when if timezone.is_aware(when) else timezone.make_aware(when)
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-imports projects and their resources from JSON Lines or CSV files. "
+        "Each record needs username, title and project_url; resources is a list of {name, url}."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='+', help="Files ending in .jsonl, .ndjson or .csv.")
+        parser.add_argument('--format', choices=['jsonl', 'csv'], help="Override the format implied by the file extension.")
+        parser.add_argument('--batch-size', type=int, default=2000, help="Projects inserted per transaction.")
+        parser.add_argument('--create-users', action='store_true', help="Create missing users (with unusable passwords) instead of skipping their projects.")
+        parser.add_argument('--skip-suggestions', action='store_true', help="Do not rebuild the search suggestion index afterwards.")
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size must be positive.")
+        self.create_users = options['create_users']
+        self.imported = self.resources = self.skipped = 0
+        start = time.perf_counter()
+
+        for path in options['paths']:
+            fmt = options['format'] or FORMATS.get(Path(path).suffix.lower())
+            if fmt is None:
+                raise CommandError(f"{path}: cannot tell the format from the extension; pass --format.")
+            try:
+                records = read_records(path, fmt, lambda line_number, reason: self.skip(path, line_number, reason))
+                while batch := list(islice(records, options['batch_size'])):
+                    self.import_batch(path, batch)
+                    elapsed = time.perf_counter() - start
+                    self.stdout.write(f"{self.imported:,} projects ({self.imported / elapsed:,.0f}/s)")
+            except (OSError, ValueError, csv.Error) as e:  # UnicodeDecodeError is a ValueError
+                raise CommandError(f"{path}: {e}")
+
+        # bulk_create skips post_save, so the suggestion index is refreshed in one pass here.
+        # The FTS5 search index is filled batch by batch in import_batch.
+        if self.imported and not options['skip_suggestions']:
+            rebuild_suggestions()
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {self.imported} project(s) and {self.resources} resource(s) in {elapsed:.1f}s "
+            f"({self.imported / max(elapsed, 1e-6):,.0f} projects/s); skipped {self.skipped}."
+        ))
+
+    def import_batch(self, path, batch):
+        records = []
+        for line_number, record in batch:
+            # Any JSON value parses; only objects are records
+            if isinstance(record, dict):
+                records.append((line_number, record))
+            else:
+                self.skip(path, line_number, f"expected a JSON object, got {type(record).__name__}")
+        users = self.resolve_users({str(record.get('username') or '') for _, record in records} - {''})
+        projects, resources, created_at = [], [], []
+
+        for line_number, record in records:
+            user_id = users.get(str(record.get('username') or ''))
+            if user_id is None:
+                self.skip(path, line_number, f"unknown user {record.get('username')!r}")
+                continue
+            project = ProjectPost(
+                user_id=user_id,
+                is_public=as_bool(record.get('is_public')),
+                screenshot_url_fallback=record.get('screenshot_url') or None,
+                **{field: record[field] for field in PROJECT_FIELDS if record.get(field) not in (None, '')},
+            )
+            try:
+                project.clean_fields(exclude=['user'])
+                when = parse_created_at(record.get('created_at'))
+                resources_in = record.get('resources') or []
+                if isinstance(resources_in, str):
+                    # CSV cells carry the resource list as a JSON array
+                    resources_in = json.loads(resources_in)
+                project_resources = [
+                    ProjectResource(name=resource['name'], resource_url=resource['url'])
+                    for resource in resources_in
+                ]
+                for resource in project_resources:
+                    resource.clean_fields(exclude=['project'])
+            except (ValidationError, ValueError, KeyError, TypeError) as e:
+                self.skip(path, line_number, e)
+                continue
+            projects.append(project)
+            resources.append(project_resources)
+            created_at.append(when)
+
+        with transaction.atomic():
+            ProjectPost.objects.bulk_create(projects)
+            # auto_now_add overwrote created_at on insert; restore the source dates in one UPDATE
+            dated = []
+            for project, when in zip(projects, created_at):
+                if when is not None:
+                    project.created_at = when
+                    dated.append(project)
+            if dated:
+                ProjectPost.objects.bulk_update(dated, ['created_at'])
+
+            rows = []
+            for project, project_resources in zip(projects, resources):
+                for resource in project_resources:
+                    resource.project = project
+                    rows.append(resource)
+            ProjectResource.objects.bulk_create(rows)
+            index_projects(project.pk for project in projects)
+
+        self.imported += len(projects)
+        self.resources += len(rows)
+
+    def resolve_users(self, usernames):
+        """Maps every username in the batch to a user id with one query (plus one insert with --create-users)."""
+        users = dict(User.objects.filter(username__in=usernames).values_list('username', 'pk'))
+        missing = usernames - users.keys()
+        if missing and self.create_users:
+            User.objects.bulk_create(User(username=name, password=make_password(None)) for name in missing)
+            users.update(User.objects.filter(username__in=missing).values_list('username', 'pk'))
+        return users
+
+    def skip(self, path, line_number, reason):
+        self.skipped += 1
+        self.stderr.write(f"{path}:{line_number}: skipped ({reason})")
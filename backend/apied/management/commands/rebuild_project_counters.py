@@ -0,0 +1,28 @@
+# apied/management/commands/rebuild_project_counters.py
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from apied.models import ProjectPost, Like, Comment
+
+
+def count_subquery(model):
+    """Correlated COUNT(*) of `model` rows pointing at the outer project."""
+    counts = model.objects.filter(project=OuterRef('pk')).order_by().values('project').annotate(n=Count('pk')).values('n')
+    return Coalesce(Subquery(counts), 0)
+
+
+class Command(BaseCommand):
+    help = "Recomputes ProjectPost.likes_count and comments_count from the Like and Comment tables."
+
+    def handle(self, *args, **options):
+        drifted = ProjectPost.objects.annotate(
+            actual_likes=count_subquery(Like),
+            actual_comments=count_subquery(Comment),
+        ).exclude(likes_count=F('actual_likes'), comments_count=F('actual_comments'))
+
+        fixed = ProjectPost.objects.filter(pk__in=drifted.values('pk')).update(
+            likes_count=count_subquery(Like),
+            comments_count=count_subquery(Comment),
+        )
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt counters for {fixed} drifted project(s)."))
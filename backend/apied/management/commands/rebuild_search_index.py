@@ -0,0 +1,14 @@
+# apied/management/commands/rebuild_search_index.py
+
+from django.core.management.base import BaseCommand, CommandError
+from apied.search import fts_available, rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the FTS5 project search index from the ProjectPost table."
+
+    def handle(self, *args, **options):
+        if not fts_available():
+            raise CommandError("The project search index requires SQLite FTS5.")
+        indexed = rebuild_search_index()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} project(s)."))
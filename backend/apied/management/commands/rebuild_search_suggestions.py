@@ -0,0 +1,12 @@
+# apied/management/commands/rebuild_search_suggestions.py
+
+from django.core.management.base import BaseCommand
+from apied.suggest import rebuild_suggestions
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the title/username prefix index used by /api/search/suggest/."
+
+    def handle(self, *args, **options):
+        entries = rebuild_suggestions()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {entries} suggestion(s)."))
@@ -0,0 +1,12 @@
+# apied/management/commands/rebuild_service_request_rollups.py
+
+from django.core.management.base import BaseCommand
+from apied.analytics import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Recomputes the ServiceRequestDailyStat rollups from the ServiceRequest table."
+
+    def handle(self, *args, **options):
+        rows = rebuild_rollups()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} daily rollup row(s)."))
@@ -0,0 +1,39 @@
+# apied/management/commands/run_jobs.py
+
+import time
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from apied.jobs import BATCH_SIZE, VISIBILITY_TIMEOUT, purge_finished, run_pending, worker_name
+
+
+class Command(BaseCommand):
+    help = "Runs queued background jobs (see apied/jobs.py), polling the queue until interrupted."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help="Jobs claimed per round trip.")
+        parser.add_argument(
+            '--visibility-timeout', type=int, default=VISIBILITY_TIMEOUT,
+            help="Seconds a claimed job stays hidden from other workers before it is retried.",
+        )
+        parser.add_argument('--poll-interval', type=float, default=2.0, help="Seconds to sleep when the queue is empty.")
+        parser.add_argument('--keep-days', type=int, default=7, help="Delete finished jobs older than this on startup.")
+        parser.add_argument('--once', action='store_true', help="Exit as soon as no job is due, instead of polling.")
+
+    def handle(self, *args, **options):
+        worker = worker_name()
+        purged = purge_finished(timedelta(days=options['keep_days']))
+        self.stdout.write(f"Worker {worker} started; purged {purged} finished job(s).")
+        processed = 0
+        try:
+            while True:
+                close_old_connections()
+                claimed = run_pending(worker, options['batch_size'], options['visibility_timeout'])
+                processed += claimed
+                if not claimed:
+                    if options['once']:
+                        break
+                    time.sleep(options['poll_interval'])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed} job(s)."))
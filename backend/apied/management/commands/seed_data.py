@@ -0,0 +1,209 @@
+# apied/management/commands/seed_data.py
+
+import random
+import time
+import uuid
+from contextlib import contextmanager, nullcontext
+from datetime import timedelta
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from apied.analytics import rebuild_rollups
+from apied.models import (
+    PROJECT_TYPE_CHOICES, AdminReview, Comment, Like, ProjectPost, ProjectResource, ServiceRequest, Tariff,
+)
+from apied.search import fts_available, rebuild_search_index
+from apied.suggest import rebuild_suggestions
+
+WORDS = (
+    "django react vue flask api shop portfolio dashboard mobile payments chat booking school "
+    "clinic farm logistics inventory analytics blog gallery kigali rwanda cloud secure fast"
+).split()
+
+
+def volume_arguments(parser):
+    """The --users/--projects/... options, shared with benchmark_endpoints."""
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--projects', type=int, default=2000)
+    parser.add_argument('--likes', type=float, default=10, help="Average likes per project.")
+    parser.add_argument('--comments', type=float, default=5, help="Average comments per project.")
+    parser.add_argument('--resources', type=int, default=2, help="Resources per project.")
+    parser.add_argument('--service-requests', type=int, default=500)
+    parser.add_argument('--reviews', type=int, default=2, help="Admin reviews per service request.")
+    parser.add_argument('--days', type=int, default=365, help="Spread created_at over this many past days.")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed, so runs are reproducible.")
+
+
+@contextmanager
+def keep_created_at(model):
+    """Lets bulk_create store preset created_at values instead of auto_now_add's current time."""
+    field = model._meta.get_field('created_at')
+    field.auto_now_add = False
+    try:
+        yield
+    finally:
+        field.auto_now_add = True
+
+
+class Command(BaseCommand):
+    help = (
+        "Fills the database with synthetic users, projects, likes, comments, resources, service requests "
+        "and reviews. Rows are bulk-inserted; counters and the search indexes are rebuilt afterwards."
+    )
+
+    def add_arguments(self, parser):
+        volume_arguments(parser)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--force', action='store_true', help="Allow seeding when DEBUG is off.")
+
+    def handle(self, *args, **options):
+        if not (settings.DEBUG or options['force']):
+            raise CommandError("Refusing to seed a database with DEBUG off; pass --force if you mean it.")
+        if min(options['users'], options['projects']) < 1:
+            raise CommandError("--users and --projects must be positive.")
+
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.now = timezone.now()
+        self.days = max(1, options['days'])
+        # Tag usernames so repeated runs never collide
+        self.tag = uuid.UUID(int=self.rng.getrandbits(128)).hex[:6]
+        start = time.perf_counter()
+
+        with transaction.atomic():
+            users = self.seed_users(options['users'])
+            staff = self.seed_users(max(1, options['users'] // 50), is_staff=True)
+            projects = self.seed_projects(users, options['projects'])
+            likes = self.seed_likes(users, projects, options['likes'])
+            comments = self.seed_comments(users, projects, options['comments'])
+            resources = self.seed_resources(projects, options['resources'])
+            requests, reviews = self.seed_service_requests(users, staff, options['service_requests'], options['reviews'])
+            tariffs = self.seed_tariffs()
+
+            # bulk_create sends no signals: bring the derived data up to date in one pass each
+            call_command('rebuild_project_counters', stdout=self.stdout)
+            rebuild_suggestions()
+            rebuild_rollups()
+            if fts_available():
+                rebuild_search_index()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {len(users) + len(staff)} users, {len(projects)} projects, {likes} likes, {comments} comments, "
+            f"{resources} resources, {requests} service requests, {reviews} reviews and {tariffs} tariffs "
+            f"in {time.perf_counter() - start:.1f}s."
+        ))
+
+    # --- Helpers ---
+
+    def past(self):
+        return self.now - timedelta(seconds=self.rng.uniform(0, self.days * 86400))
+
+    def insert(self, model, objects, dated=False):
+        """bulk_create in batches; with dated=True, created_at is spread over the past --days."""
+        created = []
+        with keep_created_at(model) if dated else nullcontext():
+            for start in range(0, len(objects), self.batch_size):
+                batch = objects[start:start + self.batch_size]
+                if dated:
+                    for obj in batch:
+                        obj.created_at = self.past()
+                created += model.objects.bulk_create(batch)
+        return created
+
+    def sentence(self, words):
+        return ' '.join(self.rng.choices(WORDS, k=words)).capitalize()
+
+    # --- Seeders ---
+
+    def seed_users(self, count, is_staff=False):
+        # One shared hash: real hashing would dominate the run time
+        password = make_password('seed-password')
+        prefix = 'seed-staff' if is_staff else 'seed'
+        return self.insert(User, [
+            User(username=f'{prefix}-{self.tag}-{i}', password=password, is_staff=is_staff, email=f'{prefix}{i}@example.com')
+            for i in range(count)
+        ])
+
+    def seed_projects(self, users, count):
+        project_types = [value for value, label in PROJECT_TYPE_CHOICES]
+        return self.insert(ProjectPost, [
+            ProjectPost(
+                user_id=self.rng.choice(users).pk,
+                title=' '.join(self.rng.sample(WORDS, 3)).title(),
+                description=self.sentence(self.rng.randint(10, 80)),
+                project_url=f'https://example.com/projects/{i}',
+                project_type=self.rng.choice(project_types),
+                screenshot_url_fallback=f'https://picsum.photos/seed/{i}/1200/800',
+                source_code_url=f'https://github.com/example/project-{i}' if self.rng.random() < 0.6 else None,
+                custom_field_name='Tech Stack',
+                custom_field_value=', '.join(self.rng.sample(WORDS, 4)),
+                is_public=self.rng.random() < 0.9,
+            )
+            for i in range(count)
+        ], dated=True)
+
+    def seed_likes(self, users, projects, average):
+        likes = []
+        for project in projects:
+            # Long-tailed: most projects get a few likes, a handful get many
+            count = min(len(users), int(self.rng.expovariate(1 / average))) if average else 0
+            likes += [Like(project_id=project.pk, user_id=user.pk) for user in self.rng.sample(users, count)]
+        return len(self.insert(Like, likes))
+
+    def seed_comments(self, users, projects, average):
+        comments = [
+            Comment(project_id=project.pk, user_id=self.rng.choice(users).pk, content=self.sentence(self.rng.randint(3, 40)))
+            for project in projects
+            for _ in range(int(self.rng.expovariate(1 / average)) if average else 0)
+        ]
+        return len(self.insert(Comment, comments, dated=True))
+
+    def seed_resources(self, projects, per_project):
+        resources = [
+            ProjectResource(project_id=project.pk, name=f'Resource {i + 1}', resource_url=f'https://docs.example.com/{project.pk}/{i}')
+            for project in projects
+            for i in range(per_project)
+        ]
+        return len(self.insert(ProjectResource, resources))
+
+    def seed_service_requests(self, users, staff, count, reviews_each):
+        service_types = [value for value, label in ServiceRequest.SERVICE_CHOICES]
+        budgets = [value for value, label in ServiceRequest.BUDGET_CHOICES]
+        org_types = [value for value, label in ServiceRequest.ORGANIZATION_TYPE_CHOICES]
+        requests = self.insert(ServiceRequest, [
+            ServiceRequest(
+                user=self.rng.choice(users) if self.rng.random() < 0.5 else None,
+                service_type=self.rng.choice(service_types),
+                country=self.rng.choice(['Rwanda', 'Uganda', 'Kenya', 'Tanzania', 'Burundi']),
+                city=self.rng.choice(['Kigali', 'Kampala', 'Nairobi', 'Arusha', 'Bujumbura']),
+                organization_type=self.rng.choice(org_types),
+                organization_name=f'Client {i}',
+                preferred_language=self.rng.choice(['English', 'French', 'Kinyarwanda']),
+                job_category=self.rng.choice(['E-commerce', 'Portfolio', 'ERP System', '']),
+                job_description=self.sentence(self.rng.randint(20, 120)),
+                primary_phone=f'078{i:07d}'[-10:],
+                primary_email=f'client{i}@example.com',
+                budget_range=self.rng.choice(budgets),
+                terms_accepted=True,
+            )
+            for i in range(count)
+        ], dated=True)
+        reviews = self.insert(AdminReview, [
+            AdminReview(service_request_id=service_request.pk, admin_user_id=self.rng.choice(staff).pk, comment=self.sentence(12))
+            for service_request in requests
+            for _ in range(reviews_each)
+        ], dated=True)
+        return len(requests), len(reviews)
+
+    def seed_tariffs(self):
+        if Tariff.objects.exists():
+            return 0
+        return len(self.insert(Tariff, [
+            Tariff(title=f'Package {i + 1}', description=self.sentence(15), price=f'{(i + 1) * 50_000:,} RWF',
+                   redirect_url='https://gloex.org/request', order=i)
+            for i in range(6)
+        ]))
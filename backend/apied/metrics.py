@@ -0,0 +1,173 @@
+# apied/metrics.py
+#
+# Per-route request metrics in the Prometheus text format, served by
+# /api/metrics/. Each process keeps its own counters in memory and writes a
+# snapshot to APIED_METRICS_DIR at most every APIED_METRICS_FLUSH_SECONDS
+# (and at exit); a scrape merges every process's file, so all workers are
+# counted whichever one answers. Clear the directory when redeploying, as
+# files from old processes are kept so counters never go backwards.
+
+import atexit
+import json
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict
+from pathlib import Path
+from django.conf import settings
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+DB_TIME_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+HISTOGRAMS = {
+    'apied_request_duration_seconds': ("Request wall time, by route.", LATENCY_BUCKETS),
+    'apied_db_duration_seconds': ("Time spent in SQL per request, by route.", DB_TIME_BUCKETS),
+    'apied_db_queries_per_request': ("SQL queries per request, by route.", QUERY_BUCKETS),
+}
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def metrics_dir():
+    path = getattr(settings, 'APIED_METRICS_DIR', None)
+    return Path(path) if path else None
+
+
+class MetricsRegistry:
+    """This process's counters. Thread-safe; re-initialized in forked children."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.pid = os.getpid()
+        # One file per process lifetime, so a reused pid never overwrites a dead worker's counts
+        self.token = f'{self.pid}-{uuid.uuid4().hex[:8]}'
+        self.last_flush = time.monotonic()
+        self.requests = defaultdict(int)               # (route, method, status) -> count
+        self.histograms = {name: {} for name in HISTOGRAMS}  # name -> route -> [bucket counts..., +Inf, sum]
+        self.cache = defaultdict(lambda: [0, 0])       # route -> [hits, misses]
+
+    def ensure_own_process(self):
+        # Counters copied into a forked worker belong to the parent, not to it
+        if self.pid != os.getpid():
+            self.reset()
+
+    def observe(self, route, method, status, duration, queries, db_duration, cache_hits=0, cache_misses=0):
+        with self.lock:
+            self.ensure_own_process()
+            self.requests[(route, method, str(status))] += 1
+            for name, value in (
+                ('apied_request_duration_seconds', duration),
+                ('apied_db_duration_seconds', db_duration),
+                ('apied_db_queries_per_request', queries),
+            ):
+                buckets = HISTOGRAMS[name][1]
+                counts = self.histograms[name].setdefault(route, [0] * (len(buckets) + 2))
+                counts[next((i for i, bound in enumerate(buckets) if value <= bound), len(buckets))] += 1
+                counts[-1] += value
+            if cache_hits or cache_misses:
+                self.cache[route][0] += cache_hits
+                self.cache[route][1] += cache_misses
+        self.maybe_flush()
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                'requests': [[*key, count] for key, count in self.requests.items()],
+                'histograms': {name: dict(routes) for name, routes in self.histograms.items()},
+                'cache': dict(self.cache),
+            }
+
+    def maybe_flush(self):
+        if time.monotonic() - self.last_flush >= getattr(settings, 'APIED_METRICS_FLUSH_SECONDS', 5):
+            self.flush()
+
+    def flush(self):
+        """Writes this process's snapshot atomically; a no-op without APIED_METRICS_DIR."""
+        directory = metrics_dir()
+        self.last_flush = time.monotonic()
+        if directory is None or self.pid != os.getpid():
+            return
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f'apied-{self.token}.json'
+        tmp = path.with_suffix(f'.{threading.get_ident()}.tmp')
+        tmp.write_text(json.dumps(self.snapshot()), encoding='utf-8')
+        os.replace(tmp, path)
+
+
+registry = MetricsRegistry()
+atexit.register(registry.flush)
+
+
+def collect():
+    """Sums every process's snapshot (this one's taken live) into one."""
+    with registry.lock:
+        registry.ensure_own_process()
+    registry.flush()
+    snapshots = [registry.snapshot()]
+    directory = metrics_dir()
+    if directory is not None and directory.is_dir():
+        own = f'apied-{registry.token}.json'
+        for path in directory.glob('apied-*.json'):
+            if path.name == own:
+                continue
+            try:
+                snapshots.append(json.loads(path.read_text(encoding='utf-8')))
+            except (OSError, ValueError):
+                continue  # Being replaced right now, or unreadable: skip this scrape
+
+    merged = {'requests': defaultdict(int), 'histograms': {name: {} for name in HISTOGRAMS}, 'cache': defaultdict(lambda: [0, 0])}
+    for snapshot in snapshots:
+        for route, method, status, count in snapshot['requests']:
+            merged['requests'][(route, method, status)] += count
+        for name, routes in snapshot['histograms'].items():
+            for route, counts in routes.items():
+                total = merged['histograms'][name].setdefault(route, [0] * len(counts))
+                for i, value in enumerate(counts):
+                    total[i] += value
+        for route, (hits, misses) in snapshot['cache'].items():
+            merged['cache'][route][0] += hits
+            merged['cache'][route][1] += misses
+    return merged
+
+
+def label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render(merged):
+    """The merged metrics in the Prometheus text exposition format."""
+    lines = [
+        '# HELP apied_requests_total Requests handled, by route, method and status.',
+        '# TYPE apied_requests_total counter',
+    ]
+    for (route, method, status), count in sorted(merged['requests'].items()):
+        lines.append(f'apied_requests_total{{route="{label(route)}",method="{label(method)}",status="{status}"}} {count}')
+
+    for name, (help_text, buckets) in HISTOGRAMS.items():
+        lines += [f'# HELP {name} {help_text}', f'# TYPE {name} histogram']
+        for route, counts in sorted(merged['histograms'][name].items()):
+            cumulative = 0
+            for bound, count in zip([*map(format_number, buckets), '+Inf'], counts[:-1]):
+                cumulative += count
+                lines.append(f'{name}_bucket{{route="{label(route)}",le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_sum{{route="{label(route)}"}} {format_number(counts[-1])}')
+            lines.append(f'{name}_count{{route="{label(route)}"}} {cumulative}')
+
+    lines += ['# HELP apied_cache_requests_total Cache lookups, by route and result.', '# TYPE apied_cache_requests_total counter']
+    ratios = []
+    for route, (hits, misses) in sorted(merged['cache'].items()):
+        lines.append(f'apied_cache_requests_total{{route="{label(route)}",result="hit"}} {hits}')
+        lines.append(f'apied_cache_requests_total{{route="{label(route)}",result="miss"}} {misses}')
+        if hits + misses:
+            ratios.append(f'apied_cache_hit_ratio{{route="{label(route)}"}} {hits / (hits + misses):.4f}')
+    lines += ['# HELP apied_cache_hit_ratio Share of cache lookups that hit, by route.', '# TYPE apied_cache_hit_ratio gauge', *ratios]
+    return '\n'.join(lines) + '\n'
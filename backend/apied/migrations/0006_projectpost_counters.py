@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:51
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    ProjectPost = apps.get_model("apied", "ProjectPost")
+    Like = apps.get_model("apied", "Like")
+    Comment = apps.get_model("apied", "Comment")
+
+    def count_subquery(model):
+        counts = (
+            model.objects.filter(project=OuterRef("pk"))
+            .order_by()
+            .values("project")
+            .annotate(n=Count("pk"))
+            .values("n")
+        )
+        return Coalesce(Subquery(counts), 0)
+
+    ProjectPost.objects.update(
+        likes_count=count_subquery(Like),
+        comments_count=count_subquery(Comment),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("apied", "0005_tariff"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="projectpost",
+            name="comments_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="projectpost",
+            name="likes_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
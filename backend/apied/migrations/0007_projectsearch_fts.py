@@ -0,0 +1,81 @@
+# Full-text search index for ProjectPost (SQLite FTS5 only).
+
+from django.db import migrations
+
+# Column weights for bm25(): title, description, custom_field_value, username
+CREATE_SQL = [
+    """
+    CREATE VIRTUAL TABLE apied_projectsearch USING fts5(
+        title, description, custom_field_value, username,
+        prefix='2 3', tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    "INSERT INTO apied_projectsearch(apied_projectsearch, rank) VALUES('rank', 'bm25(10.0, 1.0, 2.0, 5.0)')",
+    """
+    CREATE TRIGGER apied_projectsearch_ai AFTER INSERT ON apied_projectpost BEGIN
+        INSERT INTO apied_projectsearch(rowid, title, description, custom_field_value, username)
+        SELECT new.id, new.title, new.description, COALESCE(new.custom_field_value, ''), username
+        FROM auth_user WHERE id = new.user_id;
+    END
+    """,
+    """
+    CREATE TRIGGER apied_projectsearch_au AFTER UPDATE OF title, description, custom_field_value, user_id
+    ON apied_projectpost
+    WHEN new.title IS NOT old.title OR new.description IS NOT old.description
+        OR new.custom_field_value IS NOT old.custom_field_value OR new.user_id IS NOT old.user_id
+    BEGIN
+        DELETE FROM apied_projectsearch WHERE rowid = old.id;
+        INSERT INTO apied_projectsearch(rowid, title, description, custom_field_value, username)
+        SELECT new.id, new.title, new.description, COALESCE(new.custom_field_value, ''), username
+        FROM auth_user WHERE id = new.user_id;
+    END
+    """,
+    """
+    CREATE TRIGGER apied_projectsearch_ad AFTER DELETE ON apied_projectpost BEGIN
+        DELETE FROM apied_projectsearch WHERE rowid = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER apied_projectsearch_user_au AFTER UPDATE OF username ON auth_user
+    WHEN new.username IS NOT old.username
+    BEGIN
+        UPDATE apied_projectsearch SET username = new.username
+        WHERE rowid IN (SELECT id FROM apied_projectpost WHERE user_id = new.id);
+    END
+    """,
+    """
+    INSERT INTO apied_projectsearch(rowid, title, description, custom_field_value, username)
+    SELECT p.id, p.title, p.description, COALESCE(p.custom_field_value, ''), u.username
+    FROM apied_projectpost p JOIN auth_user u ON u.id = p.user_id
+    """,
+]
+
+DROP_SQL = [
+    "DROP TRIGGER IF EXISTS apied_projectsearch_user_au",
+    "DROP TRIGGER IF EXISTS apied_projectsearch_ad",
+    "DROP TRIGGER IF EXISTS apied_projectsearch_au",
+    "DROP TRIGGER IF EXISTS apied_projectsearch_ai",
+    "DROP TABLE IF EXISTS apied_projectsearch",
+]
+
+
+def run_on_sqlite(statements):
+    def operation(apps, schema_editor):
+        if schema_editor.connection.vendor != "sqlite":
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("apied", "0006_projectpost_counters"),
+        ("auth", "0012_alter_user_first_name_max_length"),
+    ]
+
+    operations = [
+        migrations.RunPython(run_on_sqlite(CREATE_SQL), run_on_sqlite(DROP_SQL)),
+    ]
@@ -0,0 +1,110 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:53
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def normalize(text):
+    return " ".join(text.split()).casefold()
+
+
+def backfill_suggestions(apps, schema_editor):
+    ProjectPost = apps.get_model("apied", "ProjectPost")
+    SearchSuggestion = apps.get_model("apied", "SearchSuggestion")
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+
+    SearchSuggestion.objects.bulk_create(
+        SearchSuggestion(
+            kind="title",
+            text=p.title,
+            normalized=normalize(p.title),
+            weight=p.likes_count,
+            project_id=p.pk,
+            user_id=p.user_id,
+        )
+        for p in ProjectPost.objects.filter(is_public=True)
+    )
+    users = User.objects.annotate(
+        public_projects=Count("projects", filter=Q(projects__is_public=True))
+    ).filter(public_projects__gt=0)
+    SearchSuggestion.objects.bulk_create(
+        SearchSuggestion(
+            kind="username",
+            text=u.username,
+            normalized=normalize(u.username),
+            weight=u.public_projects,
+            user_id=u.pk,
+        )
+        for u in users
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("apied", "0007_projectsearch_fts"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchSuggestion",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[("title", "Project Title"), ("username", "Username")],
+                        max_length=10,
+                    ),
+                ),
+                ("text", models.CharField(max_length=150)),
+                ("normalized", models.CharField(max_length=150)),
+                (
+                    "weight",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="Likes for titles, public projects for usernames.",
+                    ),
+                ),
+                (
+                    "project",
+                    models.OneToOneField(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="suggestion",
+                        to="apied.projectpost",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="search_suggestions",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Search Suggestion",
+                "verbose_name_plural": "Search Suggestions",
+                "indexes": [
+                    models.Index(
+                        fields=["kind", "normalized"], name="apied_suggest_prefix_idx"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_suggestions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:56
+
+from django.db import migrations, models
+from django.db.models import Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+
+
+def backfill_last_activity(apps, schema_editor):
+    ProjectPost = apps.get_model("apied", "ProjectPost")
+    Like = apps.get_model("apied", "Like")
+    Comment = apps.get_model("apied", "Comment")
+
+    def latest(model):
+        return Subquery(
+            model.objects.filter(project=OuterRef("pk"))
+            .order_by()
+            .values("project")
+            .annotate(latest=Max("created_at"))
+            .values("latest")
+        )
+
+    likes, comments = latest(Like), latest(Comment)
+    # SQLite's MAX() is NULL if either side is; fall back to whichever exists
+    ProjectPost.objects.update(
+        last_activity_at=Greatest(Coalesce(likes, comments), Coalesce(comments, likes))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("apied", "0008_searchsuggestion"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="projectpost",
+            name="last_activity_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_last_activity, migrations.RunPython.noop),
+    ]
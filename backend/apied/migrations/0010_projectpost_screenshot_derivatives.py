@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("apied", "0009_projectpost_last_activity_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="projectpost",
+            name="screenshot_derivatives",
+            field=models.JSONField(blank=True, editable=False, null=True),
+        ),
+    ]
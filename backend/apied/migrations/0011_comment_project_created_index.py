@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-16 21:04
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("apied", "0010_projectpost_screenshot_derivatives"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["project", "created_at"], name="apied_comment_project_created"
+            ),
+        ),
+    ]
@@ -0,0 +1,88 @@
+# Generated by Django 5.2.18 on 2026-10-16 21:10
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def backfill_rollups(apps, schema_editor):
+    ServiceRequest = apps.get_model("apied", "ServiceRequest")
+    ServiceRequestDailyStat = apps.get_model("apied", "ServiceRequestDailyStat")
+    rows = (
+        ServiceRequest.objects.annotate(day=TruncDate("created_at"))
+        .values("day", "service_type", "budget_range", "country")
+        .annotate(requests=Count("id"))
+        .order_by()
+    )
+    ServiceRequestDailyStat.objects.bulk_create(
+        ServiceRequestDailyStat(**row) for row in rows
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("apied", "0012_backgroundjob"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ServiceRequestDailyStat",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                (
+                    "service_type",
+                    models.CharField(
+                        choices=[
+                            ("build_idea", "Build Your Idea"),
+                            ("build_website", "Build a Website"),
+                            ("build_software", "Build Software"),
+                            ("cybersecurity", "Cybersecurity Services"),
+                            ("training", "Training"),
+                            ("team_management", "Team Management"),
+                            ("join_us", "Join Us"),
+                            ("other", "Other"),
+                        ],
+                        max_length=50,
+                    ),
+                ),
+                (
+                    "budget_range",
+                    models.CharField(
+                        choices=[
+                            ("below_20k", "Below 20,000 RWF"),
+                            ("20k_50k", "20,000 - 50,000 RWF"),
+                            ("50k_100k", "50,000 - 100,000 RWF"),
+                            ("100k_200k", "100,000 - 200,000 RWF"),
+                            ("200k_500k", "200,000 - 500,000 RWF"),
+                            ("above_500k", "Above 500,000 RWF"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("country", models.CharField(max_length=100)),
+                ("requests", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name": "Service Request Daily Stat",
+                "verbose_name_plural": "Service Request Daily Stats",
+                "ordering": ["-day"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("day", "service_type", "budget_range", "country"),
+                        name="apied_request_stat_unique",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
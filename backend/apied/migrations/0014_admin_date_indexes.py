@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-16 21:13
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("apied", "0013_servicerequestdailystat"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(fields=["created_at"], name="apied_comment_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="like",
+            index=models.Index(fields=["created_at"], name="apied_like_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="projectpost",
+            index=models.Index(fields=["created_at"], name="apied_project_created_idx"),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:26
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("apied", "0014_admin_date_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="projectpost",
+            index=models.Index(
+                condition=models.Q(("is_public", True)),
+                fields=["created_at"],
+                name="apied_project_public_feed",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="projectpost",
+            index=models.Index(
+                condition=models.Q(("is_public", True)),
+                fields=["user", "created_at"],
+                name="apied_project_portfolio",
+            ),
+        ),
+    ]
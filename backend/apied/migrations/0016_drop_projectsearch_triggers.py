@@ -0,0 +1,27 @@
+# The search index is maintained from model signals (apied.signals); SQLite
+# triggers on apied_projectpost are lost whenever a migration rebuilds the table.
+
+from importlib import import_module
+
+from django.db import migrations
+
+fts = import_module("apied.migrations.0007_projectsearch_fts")
+
+DROP_TRIGGERS_SQL = fts.DROP_SQL[:4]
+
+# The CREATE TRIGGER statements from 0007, in order
+CREATE_TRIGGERS_SQL = fts.CREATE_SQL[2:6]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("apied", "0015_feed_portfolio_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            fts.run_on_sqlite(DROP_TRIGGERS_SQL),
+            fts.run_on_sqlite(CREATE_TRIGGERS_SQL),
+        ),
+    ]
@@ -27,6 +27,8 @@ class ProjectPost(models.Model):
     # Image Upload/Link Fields
     screenshot = models.ImageField(upload_to='project_screenshots/', blank=True, null=True, help_text="Upload a screenshot of the project.")
     screenshot_url_fallback = models.URLField(max_length=500, blank=True, null=True, verbose_name="Fallback Image Link", help_text="A direct URL to a public image if no file is uploaded.")
+    # Resized WebP/JPEG copies of the upload, written by apied.images (see SCREENSHOT_WIDTHS)
+    screenshot_derivatives = models.JSONField(null=True, blank=True, editable=False)
     
     # --- NEW: Additional Optional Fields ---
     source_code_url = models.URLField(max_length=500, blank=True, null=True, verbose_name="Source Code Link", help_text="Link to the GitHub repository or source code download.")
@@ -34,11 +36,28 @@ class ProjectPost(models.Model):
     custom_field_value = models.TextField(blank=True, null=True, verbose_name="Custom Field Content", help_text="Optional: The content for your custom field (e.g., 'Django, React, PostgreSQL').")
     
     is_public = models.BooleanField(default=True, verbose_name="Publicly Visible", help_text="If unchecked, only you can see it on your portfolio.")
+
+    # Denormalized counters, kept in step by the Like/Comment signals (see rebuild_project_counters)
+    likes_count = models.PositiveIntegerField(default=0, editable=False)
+    comments_count = models.PositiveIntegerField(default=0, editable=False)
+    # Bumped with the counters and on resource changes; together with updated_at it drives ETag/Last-Modified
+    last_activity_at = models.DateTimeField(null=True, blank=True, editable=False)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at'], name='apied_project_created_idx'),
+            # Keep these ascending: SQLite appends the rowid ascending, so a backward scan yields
+            # exactly ORDER BY created_at DESC, id DESC (a DESC column would need a temp B-tree)
+            # Public feed: only public rows
+            models.Index(fields=['created_at'], condition=models.Q(is_public=True), name='apied_project_public_feed'),
+            # Portfolio seen by visitors: one user's public projects. Django filters booleans as a bare
+            # `WHERE is_public`, which SQLite can match to a partial index but not seek on as a column
+            models.Index(fields=['user', 'created_at'], condition=models.Q(is_public=True), name='apied_project_portfolio'),
+        ]
         verbose_name = "Project Post"
         verbose_name_plural = "Project Posts"
 
@@ -56,6 +75,27 @@ class ProjectPost(models.Model):
             return self.screenshot.url
         return self.screenshot_url_fallback
 
+    def get_screenshot_srcset(self, request=None):
+        """
+        Returns {'webp': srcset, 'jpeg': srcset} for the generated derivatives,
+        or None until they exist (or if the project has no uploaded screenshot).
+        """
+        if not self.screenshot or not self.screenshot_derivatives:
+            return None
+        derivatives = self.screenshot_derivatives.get('sizes')
+        if not derivatives or self.screenshot_derivatives.get('source') != self.screenshot.name:
+            return None
+        srcset = {}
+        for fmt in ('webp', 'jpeg'):
+            candidates = []
+            for derivative in sorted(derivatives.values(), key=lambda d: d['width']):
+                url = self.screenshot.storage.url(derivative[fmt])
+                if request:
+                    url = request.build_absolute_uri(url)
+                candidates.append(f"{url} {derivative['width']}w")
+            srcset[fmt] = ', '.join(candidates)
+        return srcset
+
 
 class ProjectResource(models.Model):
     """
@@ -80,6 +120,10 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['project', 'created_at'], name='apied_comment_project_created'),
+            models.Index(fields=['created_at'], name='apied_comment_created_idx'),
+        ]
 
     def __str__(self):
         return f"Comment by {self.user.username} on {self.project.title}"
@@ -95,12 +139,41 @@ class Like(models.Model):
 
     class Meta:
         unique_together = ('project', 'user') # Enforces one like per user per project
+        indexes = [models.Index(fields=['created_at'], name='apied_like_created_idx')]
         verbose_name = "Like"
         verbose_name_plural = "Likes"
 
     def __str__(self):
         return f"Like by {self.user.username} on {self.project.title}"
 
+# --- NEW: Search Suggestion Index ---
+
+class SearchSuggestion(models.Model):
+    """
+    Precomputed, case-folded prefix index behind /api/search/suggest/.
+    One row per public project title and one per user with public projects,
+    maintained by the signals in apied/signals.py.
+    """
+    KIND_CHOICES = [
+        ('title', 'Project Title'),
+        ('username', 'Username'),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    text = models.CharField(max_length=150)
+    normalized = models.CharField(max_length=150)
+    weight = models.PositiveIntegerField(default=0, help_text="Likes for titles, public projects for usernames.")
+    project = models.OneToOneField(ProjectPost, on_delete=models.CASCADE, null=True, blank=True, related_name='suggestion')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='search_suggestions')
+
+    class Meta:
+        indexes = [models.Index(fields=['kind', 'normalized'], name='apied_suggest_prefix_idx')]
+        verbose_name = "Search Suggestion"
+        verbose_name_plural = "Search Suggestions"
+
+    def __str__(self):
+        return f"{self.get_kind_display()}: {self.text}"
+
 # --- NEW: Service Request Models ---
 
 def generate_request_code():
@@ -184,6 +257,29 @@ class AdminReview(models.Model):
     def __str__(self):
         return f"Review by {self.admin_user.username} on {self.service_request.request_code}"
 
+# --- NEW: Service Request Analytics ---
+class ServiceRequestDailyStat(models.Model):
+    """
+    Daily count of service requests per (service type, budget range, country),
+    kept up to date by apied/analytics.py so staff reports never scan ServiceRequest.
+    """
+    day = models.DateField()
+    service_type = models.CharField(max_length=50, choices=ServiceRequest.SERVICE_CHOICES)
+    budget_range = models.CharField(max_length=20, choices=ServiceRequest.BUDGET_CHOICES)
+    country = models.CharField(max_length=100)
+    requests = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['-day']
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'service_type', 'budget_range', 'country'], name='apied_request_stat_unique'),
+        ]
+        verbose_name = "Service Request Daily Stat"
+        verbose_name_plural = "Service Request Daily Stats"
+
+    def __str__(self):
+        return f"{self.day} {self.service_type}/{self.budget_range}/{self.country}: {self.requests}"
+
 # --- NEW: Tariff/Pricing Model ---
 class Tariff(models.Model):
     """
@@ -205,3 +301,39 @@ class Tariff(models.Model):
 
     def __str__(self):
         return f"{self.title} - {self.price}"
+
+
+# --- NEW: Background Job Queue ---
+class BackgroundJob(models.Model):
+    """
+    A unit of deferred work, stored in the main database and executed by
+    `manage.py run_jobs`. See apied/jobs.py for enqueueing and the worker loop.
+    """
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    name = models.CharField(max_length=100, help_text="Registered task name, see apied/tasks.py.")
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_at = models.DateTimeField(help_text="Earliest time the job may (re)run.")
+    locked_by = models.CharField(max_length=64, blank=True)
+    locked_until = models.DateTimeField(null=True, blank=True, help_text="Claims expire after this, so crashed workers' jobs are retried.")
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['run_at', 'id']
+        indexes = [models.Index(fields=['status', 'run_at'], name='apied_job_ready_idx')]
+        verbose_name = "Background Job"
+        verbose_name_plural = "Background Jobs"
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.status})"
+
@@ -0,0 +1,93 @@
+# apied/pagination.py
+
+import base64
+from datetime import datetime
+from django.conf import settings
+from django.db.models import Q
+
+DEFAULT_PAGE_SIZE = getattr(settings, 'APIED_PAGE_SIZE', 50)
+MAX_PAGE_SIZE = getattr(settings, 'APIED_MAX_PAGE_SIZE', 200)
+
+
+class InvalidCursor(ValueError):
+    """Raised when a client sends a cursor we did not issue."""
+
+
+def encode_cursor(key, pk):
+    """Packs a (sort key, id) position into an opaque, URL-safe token."""
+    raw = f"{key}|{pk}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor, parse_key=str):
+    """
+    Reverses encode_cursor(), converting the sort key with `parse_key`.
+    Raises InvalidCursor on anything malformed.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        key, pk = base64.urlsafe_b64decode(padded).decode().split('|')
+        return parse_key(key), int(pk)
+    except (ValueError, UnicodeDecodeError):
+        raise InvalidCursor('Invalid cursor.')
+
+
+def get_page_size(request):
+    """Reads the 'limit' query parameter, clamped to [1, MAX_PAGE_SIZE]."""
+    try:
+        limit = int(request.GET.get('limit', DEFAULT_PAGE_SIZE))
+    except (TypeError, ValueError):
+        limit = DEFAULT_PAGE_SIZE
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def page_queryset(queryset, request):
+    """
+    Returns (queryset, limit): the keyset slice for the requested page, with one
+    extra row so split_page() can tell whether another page follows.
+    """
+    limit = get_page_size(request)
+    cursor = request.GET.get('cursor')
+    queryset = queryset.order_by('-created_at', '-id')
+    if cursor:
+        created_at, pk = decode_cursor(cursor, datetime.fromisoformat)
+        queryset = queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+    return queryset[:limit + 1], limit
+
+
+def split_page(items, limit):
+    """Trims the look-ahead row from a fetched page and derives the next cursor."""
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor(items[-1].created_at.isoformat(), items[-1].id)
+    return items, next_cursor
+
+
+def paginate_queryset(queryset, request):
+    """
+    Keyset pagination over (created_at, id), newest first.
+    Returns (items, next_cursor); next_cursor is None on the last page.
+    Every page is a single indexed range scan, no matter how deep it is.
+    """
+    page, limit = page_queryset(queryset, request)
+    return split_page(list(page), limit)
+
+
+async def apaginate_queryset(queryset, request):
+    """Async counterpart of paginate_queryset() for the ASGI read path."""
+    page, limit = page_queryset(queryset, request)
+    return split_page([item async for item in page], limit)
+
+
+def set_next_cursor(response, request, next_cursor):
+    """
+    Exposes the next page through headers, so the body stays a plain JSON array.
+    """
+    if next_cursor:
+        params = request.GET.copy()
+        params['cursor'] = next_cursor
+        next_url = request.build_absolute_uri(f"{request.path}?{params.urlencode()}")
+        response['X-Next-Cursor'] = next_cursor
+        response['Link'] = f'<{next_url}>; rel="next"'
+    return response
@@ -0,0 +1,49 @@
+# apied/responses.py
+
+import json
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+from .instrumentation import timed
+
+try:
+    import orjson
+except ImportError:  # Optional: fall back to the stdlib encoder
+    orjson = None
+
+
+class ApiedJSONEncoder(DjangoJSONEncoder):
+    """
+    Stdlib fallback that matches orjson's output: datetimes and dates are
+    written with full isoformat() precision rather than Django's truncated form.
+    """
+
+    def default(self, o):
+        if hasattr(o, 'isoformat'):
+            return o.isoformat()
+        return super().default(o)
+
+
+def _orjson_default(o):
+    # orjson handles datetime/date/UUID natively; this covers Decimal, lazy strings, etc.
+    return DjangoJSONEncoder().default(o)
+
+
+def dumps(data):
+    """Serializes `data` to compact JSON bytes with the fastest available encoder."""
+    with timed('serialize_ms'):
+        if orjson is not None:
+            return orjson.dumps(data, default=_orjson_default)
+        return json.dumps(data, cls=ApiedJSONEncoder, separators=(',', ':'), ensure_ascii=False).encode()
+
+
+class JsonResponse(HttpResponse):
+    """
+    Drop-in replacement for django.http.JsonResponse used by every apied view.
+    Serializes with orjson when it is installed, so datetimes can be passed as-is.
+    """
+
+    def __init__(self, data, safe=True, **kwargs):
+        if safe and not isinstance(data, dict):
+            raise TypeError("In order to allow non-dict objects to be serialized set the safe parameter to False.")
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(content=dumps(data), **kwargs)
@@ -0,0 +1,117 @@
+# apied/search.py
+
+import re
+from django.db import connection, transaction
+from .pagination import decode_cursor, encode_cursor
+
+# FTS5 table created by migration 0007; rowid is the ProjectPost id.
+# Kept in sync by the ProjectPost and User receivers in apied/signals.py, like
+# the suggestion index. (Migration 0016 dropped the original SQLite triggers,
+# which broke every rebuild of apied_projectpost.) Bulk inserts send no signals:
+# call index_projects() for them, or rebuild_search_index().
+SEARCH_TABLE = 'apied_projectsearch'
+
+# ProjectPost fields copied into the index
+INDEXED_FIELDS = {'title', 'description', 'custom_field_value', 'user', 'user_id'}
+
+# Ids per statement, well under SQLite's bound-variable limit
+INDEX_BATCH = 500
+
+INDEX_ROWS_SQL = (
+    f"INSERT INTO {SEARCH_TABLE}(rowid, title, description, custom_field_value, username) "
+    "SELECT p.id, p.title, p.description, COALESCE(p.custom_field_value, ''), u.username "
+    "FROM apied_projectpost p JOIN auth_user u ON u.id = p.user_id"
+)
+
+WORD_RE = re.compile(r'\w+')
+
+
+def fts_available():
+    """Full-text search is only wired up on SQLite (FTS5)."""
+    return connection.vendor == 'sqlite'
+
+
+def build_match_expression(query):
+    """
+    Turns free text into a safe FTS5 query: every word must match, and the last
+    one is treated as a prefix so results update on each keystroke.
+    Returns None when the text contains no searchable words.
+    """
+    words = WORD_RE.findall(query)
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def search_project_ids(query, limit, cursor=None):
+    """
+    Returns (ids, next_cursor) for public projects matching `query`, best BM25 rank first.
+    Pages are keyed on (rank, id); column weights are configured on the table itself.
+    """
+    match = build_match_expression(query)
+    if match is None:
+        return [], None
+
+    sql = (
+        f"SELECT s.rowid, s.rank FROM {SEARCH_TABLE} s "
+        "JOIN apied_projectpost p ON p.id = s.rowid "
+        f"WHERE s.{SEARCH_TABLE} MATCH %s AND p.is_public = 1"
+    )
+    params = [match]
+    if cursor:
+        rank, pk = decode_cursor(cursor, float)
+        sql += " AND (s.rank > %s OR (s.rank = %s AND s.rowid > %s))"
+        params += [rank, rank, pk]
+    sql += " ORDER BY s.rank, s.rowid LIMIT %s"
+    params.append(limit + 1)
+
+    with connection.cursor() as c:
+        c.execute(sql, params)
+        rows = c.fetchall()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(repr(rows[-1][1]), rows[-1][0])
+    return [pk for pk, rank in rows], next_cursor
+
+
+def index_projects(ids):
+    """(Re-)indexes the given projects from their current rows."""
+    if not fts_available():
+        return
+    ids = list(ids)
+    with connection.cursor() as c:
+        for start in range(0, len(ids), INDEX_BATCH):
+            batch = ids[start:start + INDEX_BATCH]
+            placeholders = ', '.join(['%s'] * len(batch))
+            c.execute(f"DELETE FROM {SEARCH_TABLE} WHERE rowid IN ({placeholders})", batch)
+            c.execute(f"{INDEX_ROWS_SQL} WHERE p.id IN ({placeholders})", batch)
+
+
+def unindex_project(project_id):
+    if fts_available():
+        with connection.cursor() as c:
+            c.execute(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s", [project_id])
+
+
+def reindex_username(user_id, username):
+    """Updates the username column of every project the user owns."""
+    if fts_available():
+        with connection.cursor() as c:
+            c.execute(
+                f"UPDATE {SEARCH_TABLE} SET username = %s "
+                "WHERE rowid IN (SELECT id FROM apied_projectpost WHERE user_id = %s)",
+                [username, user_id],
+            )
+
+
+def rebuild_search_index():
+    """Re-creates every row of the search index from apied_projectpost. Returns the row count."""
+    with transaction.atomic(), connection.cursor() as c:
+        c.execute(f"DELETE FROM {SEARCH_TABLE}")
+        c.execute(INDEX_ROWS_SQL)
+        c.execute(f"SELECT COUNT(*) FROM {SEARCH_TABLE}")
+        return c.fetchone()[0]
@@ -0,0 +1,139 @@
+# apied/signals.py
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import F, Q
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from .analytics import rebuild_rollups, record_service_request
+from .caching import invalidate_tariffs
+from .images import needs_derivatives, schedule_screenshot_derivatives
+from .models import Comment, Like, ProjectPost, ProjectResource, SearchSuggestion, ServiceRequest, Tariff
+from .search import INDEXED_FIELDS, index_projects, reindex_username, unindex_project
+from .suggest import normalize, refresh_project_suggestion, refresh_user_suggestion
+
+
+# --- Search Indexes and Screenshot Derivatives ---
+
+@receiver(post_save, sender=ProjectPost)
+def project_saved(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    if update_fields is None or INDEXED_FIELDS & set(update_fields):
+        index_projects([instance.pk])
+    refresh_project_suggestion(instance)
+    refresh_user_suggestion(instance.user_id)
+    if needs_derivatives(instance):
+        schedule_screenshot_derivatives(instance.pk)
+
+
+@receiver(post_delete, sender=ProjectPost)
+def project_deleted(sender, instance, **kwargs):
+    unindex_project(instance.pk)
+    # The title entry goes with the project (CASCADE); only the username weight changes
+    refresh_user_suggestion(instance.user_id)
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and 'username' not in update_fields):
+        return
+    SearchSuggestion.objects.filter(kind='username', user=instance).update(
+        text=instance.username, normalized=normalize(instance.username),
+    )
+    reindex_username(instance.pk, instance.username)
+    # Cached payloads and ETags show the name on the user's projects and comments
+    transaction.on_commit(lambda: ProjectPost.objects.filter(
+        Q(user=instance) | Q(pk__in=Comment.objects.filter(user=instance).values('project_id'))
+    ).update(last_activity_at=timezone.now()))
+
+
+# --- Like and Comment Counters, Project Payload Versions ---
+# Kept here rather than in the views so likes, comments and resources added,
+# edited or removed in the admin, or deleted along with their user, are counted
+# and move the project's last_activity_at, which versions its cached payload and
+# ETag (apied/caching.py). Bulk inserts (seed_data, import_projects) skip signals
+# and run rebuild_project_counters.
+
+def adjust_counter(project_id, field, delta):
+    """Moves a denormalized counter by delta, never below zero."""
+    ProjectPost.objects.filter(pk=project_id).update(**{field: Greatest(F(field) + delta, 0)})
+
+
+def bump_project_version(project_id):
+    """Moves last_activity_at once the change has committed, so no new version is issued for rows not yet visible."""
+    transaction.on_commit(
+        lambda: ProjectPost.objects.filter(pk=project_id).update(last_activity_at=timezone.now())
+    )
+
+
+@receiver(post_save, sender=Like)
+def like_saved(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        like_counted(instance.project_id, 1)
+
+
+@receiver(post_delete, sender=Like)
+def like_deleted(sender, instance, **kwargs):
+    like_counted(instance.project_id, -1)
+
+
+def like_counted(project_id, delta):
+    adjust_counter(project_id, 'likes_count', delta)
+    SearchSuggestion.objects.filter(project_id=project_id).update(weight=Greatest(F('weight') + delta, 0))
+    bump_project_version(project_id)
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        adjust_counter(instance.project_id, 'comments_count', 1)
+    bump_project_version(instance.project_id)
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    adjust_counter(instance.project_id, 'comments_count', -1)
+    bump_project_version(instance.project_id)
+
+
+@receiver(post_save, sender=ProjectResource)
+def resource_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        bump_project_version(instance.project_id)
+
+
+@receiver(post_delete, sender=ProjectResource)
+def resource_deleted(sender, instance, **kwargs):
+    bump_project_version(instance.project_id)
+
+
+# --- Service Request Rollups ---
+
+@receiver(post_save, sender=ServiceRequest)
+def service_request_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        record_service_request(instance)
+    else:
+        # Staff may have recategorized the request; its day never changes (created_at is fixed)
+        rebuild_rollups(timezone.localdate(instance.created_at))
+
+
+@receiver(post_delete, sender=ServiceRequest)
+def service_request_deleted(sender, instance, **kwargs):
+    rebuild_rollups(timezone.localdate(instance.created_at))
+
+
+# --- Tariff Cache ---
+
+@receiver(post_save, sender=Tariff)
+@receiver(post_delete, sender=Tariff)
+def tariff_changed(sender, **kwargs):
+    # After commit: dropped any earlier, a concurrent request could re-cache the old rows with no expiry
+    transaction.on_commit(invalidate_tariffs)
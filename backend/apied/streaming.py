@@ -0,0 +1,71 @@
+# apied/streaming.py
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from .responses import dumps
+
+STREAM_CHUNK_SIZE = getattr(settings, 'APIED_STREAM_CHUNK_SIZE', 500)
+
+
+def wants_stream(request):
+    """True when the client asked for the whole result set as a streamed array (?stream=1)."""
+    return request.GET.get('stream') in ('1', 'true')
+
+
+def iter_json_array(items, serialize, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Yields a JSON array (as bytes) one chunk of serialized items at a time,
+    so only `chunk_size` rows are ever held in memory.
+    """
+    yield b'['
+    buffer = []
+    separator = b''
+    for item in items:
+        buffer.append(separator + dumps(serialize(item)))
+        separator = b','
+        if len(buffer) >= chunk_size:
+            yield b''.join(buffer)
+            buffer = []
+    if buffer:
+        yield b''.join(buffer)
+    yield b']'
+
+
+def streaming_json_response(queryset, serialize, chunk_size=STREAM_CHUNK_SIZE):
+    """Streams `queryset` as a JSON array, reading it with a server-side iterator."""
+    items = queryset.iterator(chunk_size=chunk_size)
+    return StreamingHttpResponse(iter_json_array(items, serialize, chunk_size), content_type='application/json')
+
+
+def iter_ndjson(items, serialize, chunk_size=STREAM_CHUNK_SIZE):
+    """Yields newline-delimited JSON (one object per line), `chunk_size` lines at a time."""
+    buffer = []
+    for item in items:
+        buffer.append(dumps(serialize(item)) + b'\n')
+        if len(buffer) >= chunk_size:
+            yield b''.join(buffer)
+            buffer = []
+    if buffer:
+        yield b''.join(buffer)
+
+
+async def aiter_json_array(items, serialize, chunk_size=STREAM_CHUNK_SIZE):
+    """Async counterpart of iter_json_array() over an async iterator."""
+    yield b'['
+    buffer = []
+    separator = b''
+    async for item in items:
+        buffer.append(separator + dumps(serialize(item)))
+        separator = b','
+        if len(buffer) >= chunk_size:
+            yield b''.join(buffer)
+            buffer = []
+    if buffer:
+        yield b''.join(buffer)
+    yield b']'
+
+
+def astreaming_json_response(queryset, serialize, chunk_size=STREAM_CHUNK_SIZE):
+    """Streams `queryset` with aiterator(), so ASGI servers never block a thread on it."""
+    items = queryset.aiterator(chunk_size=chunk_size)
+    return StreamingHttpResponse(aiter_json_array(items, serialize, chunk_size), content_type='application/json')
@@ -0,0 +1,106 @@
+# apied/suggest.py
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Count, Q
+from .models import ProjectPost, SearchSuggestion
+
+DEFAULT_SUGGESTIONS = getattr(settings, 'APIED_SUGGEST_LIMIT', 8)
+MAX_SUGGESTIONS = 20
+
+# Heaviest index entries read per kind, so duplicate texts can be dropped and still fill the limit
+CANDIDATE_FACTOR = 5
+
+# Sorts after every real character, so [prefix, prefix + PREFIX_END) is an index range scan
+PREFIX_END = '\U0010ffff'
+
+
+def normalize(text):
+    return ' '.join(text.split()).casefold()
+
+
+def suggest(prefix, limit=DEFAULT_SUGGESTIONS):
+    """
+    Returns {'titles': [...], 'usernames': [...]} completing `prefix`, heaviest first.
+    Each kind costs one range scan on (kind, normalized) feeding a top-N sort by weight;
+    ProjectPost is never read.
+    """
+    prefix = normalize(prefix)
+    results = {'titles': [], 'usernames': []}
+    if not prefix:
+        return results
+
+    for kind, key in (('title', 'titles'), ('username', 'usernames')):
+        candidates = (
+            SearchSuggestion.objects
+            .filter(kind=kind, normalized__gte=prefix, normalized__lt=prefix + PREFIX_END)
+            .order_by('-weight', 'normalized')
+            .values_list('text', 'weight')[:limit * CANDIDATE_FACTOR]
+        )
+        seen = set()
+        for text, weight in sorted(candidates, key=lambda c: (-c[1], len(c[0]))):
+            if text not in seen:
+                seen.add(text)
+                results[key].append(text)
+        results[key] = results[key][:limit]
+    return results
+
+
+def refresh_project_suggestion(project):
+    """Upserts or drops the title entry for one project."""
+    if not project.is_public:
+        SearchSuggestion.objects.filter(project=project).delete()
+        return
+    SearchSuggestion.objects.update_or_create(
+        project=project,
+        defaults={
+            'kind': 'title',
+            'text': project.title,
+            'normalized': normalize(project.title),
+            'weight': project.likes_count,
+            'user_id': project.user_id,
+        },
+    )
+
+
+def refresh_user_suggestion(user_id):
+    """Upserts or drops the username entry, weighted by the user's public project count."""
+    public_projects = ProjectPost.objects.filter(user_id=user_id, is_public=True).count()
+    if not public_projects:
+        SearchSuggestion.objects.filter(kind='username', user_id=user_id).delete()
+        return
+    username = User.objects.values_list('username', flat=True).get(pk=user_id)
+    SearchSuggestion.objects.update_or_create(
+        kind='username', user_id=user_id,
+        defaults={'text': username, 'normalized': normalize(username), 'weight': public_projects},
+    )
+
+
+def rebuild_suggestions():
+    """Regenerates the whole index from ProjectPost and User. Returns the entry count."""
+    with transaction.atomic():
+        SearchSuggestion.objects.all().delete()
+        titles = (
+            SearchSuggestion(
+                kind='title', text=title, normalized=normalize(title),
+                weight=likes, project_id=pk, user_id=user_id,
+            )
+            for pk, title, likes, user_id in ProjectPost.objects.filter(is_public=True)
+            .values_list('pk', 'title', 'likes_count', 'user_id').iterator()
+        )
+        SearchSuggestion.objects.bulk_create(titles, batch_size=1000)
+
+        users = (
+            User.objects.annotate(public_projects=Count('projects', filter=Q(projects__is_public=True)))
+            .filter(public_projects__gt=0)
+            .values_list('pk', 'username', 'public_projects')
+        )
+        SearchSuggestion.objects.bulk_create(
+            (
+                SearchSuggestion(kind='username', text=username, normalized=normalize(username), weight=count, user_id=pk)
+                for pk, username, count in users.iterator()
+            ),
+            batch_size=1000,
+        )
+        return SearchSuggestion.objects.count()
@@ -0,0 +1,31 @@
+# apied/tasks.py
+#
+# Background tasks, queued with jobs.enqueue() and run by `manage.py run_jobs`.
+
+from io import StringIO
+from django.core.mail import mail_managers
+from django.core.management import call_command
+from .images import generate_screenshot_derivatives
+from .jobs import task
+from .models import ServiceRequest
+
+task(generate_screenshot_derivatives)
+
+
+@task
+def notify_service_request(request_id):
+    """Emails the site MANAGERS about a newly submitted service request."""
+    service_request = ServiceRequest.objects.filter(pk=request_id).first()
+    if service_request is None:
+        return
+    mail_managers(
+        f"New service request {service_request.request_code}",
+        f"{service_request.organization_name} ({service_request.primary_email}) requested "
+        f"{service_request.get_service_type_display()} in {service_request.city}, {service_request.country}.\n\n"
+        f"{service_request.job_description}",
+    )
+
+
+@task
+def rebuild_project_counters():
+    call_command('rebuild_project_counters', stdout=StringIO())
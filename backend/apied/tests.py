@@ -1,3 +1,1368 @@
-from django.test import TestCase
+import csv
+import importlib
+import json
+import shutil
+import tempfile
+import time
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from io import BytesIO, StringIO
+from pathlib import Path
+from unittest import mock, skipIf
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
+from django.core import mail
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.db import models
+from django.db.models import Sum
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils.http import http_date
+from PIL import Image
+
+from . import admin as apied_admin, responses
+from .benchmarks import run_benchmarks, uncovered_routes
+from .caching import TARIFF_CACHE_KEY
+from .db import apply_pragmas, configure_connection, current_pragmas
+from .images import generate_screenshot_derivatives
+from .jobs import claim_jobs, enqueue, run_pending, task
+from .metrics import registry
+from .models import AdminReview, BackgroundJob, ServiceRequestDailyStat, Comment, Like, ProjectPost, ProjectResource, SearchSuggestion, ServiceRequest, Tariff
+from .pagination import MAX_PAGE_SIZE
+from .search import search_project_ids
+from .suggest import CANDIDATE_FACTOR, DEFAULT_SUGGESTIONS
+
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class CacheIsolatedTestCase(TestCase):
+    """Runs against a private in-memory cache, emptied before every test."""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+
+class CursorPaginationTests(CacheIsolatedTestCase):
+    """Feed and portfolio pages visit every project exactly once, newest first."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', password='pw')
+        projects = [
+            ProjectPost.objects.create(user=cls.owner, title=f'Project {i}', project_url='https://example.com')
+            for i in range(7)
+        ]
+        # Several projects share a timestamp: only the id tiebreak keeps them apart across pages
+        ProjectPost.objects.filter(pk__in=[p.pk for p in projects[1:6]]).update(created_at=projects[0].created_at)
+        cls.newest_first = list(ProjectPost.objects.order_by('-created_at', '-id').values_list('pk', flat=True))
+
+    def walk(self, url, limit):
+        """Follows X-Next-Cursor to the last page, returning the ids seen in order."""
+        seen, cursor = [], None
+        while True:
+            response = self.client.get(url, {'limit': limit, **({'cursor': cursor} if cursor else {})})
+            self.assertEqual(response.status_code, 200)
+            page = [p['id'] for p in response.json()]
+            self.assertLessEqual(len(page), limit)
+            seen += page
+            cursor = response.get('X-Next-Cursor')
+            if not cursor:
+                self.assertNotIn('Link', response)
+                return seen
+
+    def test_feed_pages_have_no_duplicates_or_gaps_when_timestamps_tie(self):
+        for limit in (1, 2, 3):
+            self.assertEqual(self.walk('/api/projects/', limit), self.newest_first)
+
+    def test_portfolio_pages_have_no_duplicates_or_gaps_when_timestamps_tie(self):
+        self.assertEqual(self.walk('/api/portfolio/owner/', 2), self.newest_first)
+
+    def test_next_page_is_advertised_in_headers(self):
+        response = self.client.get('/api/projects/', {'limit': 3})
+        cursor = response['X-Next-Cursor']
+        self.assertEqual(
+            response['Link'], f'<http://testserver/api/projects/?limit=3&cursor={cursor}>; rel="next"',
+        )
+        following = self.client.get('/api/projects/', {'limit': 3, 'cursor': cursor})
+        self.assertEqual([p['id'] for p in following.json()], self.newest_first[3:6])
+
+    def test_malformed_cursor_is_rejected(self):
+        for cursor in ('not-a-cursor', '!!!', 'MjAyNXxub3QtYW4taWQ'):  # the last is "2025|not-an-id"
+            for url in ('/api/projects/', '/api/portfolio/owner/'):
+                response = self.client.get(url, {'cursor': cursor})
+                self.assertEqual(response.status_code, 400, (url, cursor))
+                self.assertEqual(response.json(), {'error': 'Invalid cursor.'})
+
+    def test_limit_is_clamped_to_max_page_size(self):
+        ProjectPost.objects.bulk_create(
+            ProjectPost(user=self.owner, title=f'Bulk {i}', project_url='https://example.com')
+            for i in range(MAX_PAGE_SIZE)
+        )
+        response = self.client.get('/api/projects/', {'limit': MAX_PAGE_SIZE + 100})
+        self.assertEqual(len(response.json()), MAX_PAGE_SIZE)
+        self.assertIn('X-Next-Cursor', response)
+        self.assertEqual(len(self.client.get('/api/projects/', {'limit': 0}).json()), 1)
+
+
+class QueryBudgetTests(CacheIsolatedTestCase):
+    """
+    Every read endpoint must cost a fixed number of queries, however many
+    projects, likes, comments or reviews it returns.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [User.objects.create_user(f'user{i}', password='pw') for i in range(5)]
+        cls.staff = User.objects.create_user('staff', password='pw', is_staff=True)
+        cls.projects = []
+        for i in range(20):
+            project = ProjectPost.objects.create(
+                user=cls.users[i % 5], title=f'Project {i}', project_url='https://example.com',
+            )
+            cls.projects.append(project)
+            for user in cls.users[:3]:
+                Like.objects.create(project=project, user=user)
+        cls.project = cls.projects[0]
+        for i in range(10):
+            Comment.objects.create(project=cls.project, user=cls.users[i % 5], content=f'Comment {i}')
+            ProjectResource.objects.create(project=cls.project, name=f'Doc {i}', resource_url='https://example.com')
+        cls.service_request = ServiceRequest.objects.create(
+            service_type='build_website', country='Rwanda', city='Kigali', organization_type='company',
+            organization_name='Acme', preferred_language='English', job_description='A website',
+            primary_phone='0780000000', primary_email='acme@example.com', budget_range='50k_100k',
+            terms_accepted=True, user=cls.users[0],
+        )
+        for i in range(5):
+            AdminReview.objects.create(service_request=cls.service_request, admin_user=cls.staff, comment=f'Note {i}')
+        call_command('rebuild_project_counters', stdout=StringIO())
+
+    def test_project_feed(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/projects/')
+        self.assertEqual(len(response.json()), 20)
+        self.assertEqual(response.json()[0]['likes_count'], 3)
+
+    def test_project_search(self):
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/search/', {'q': 'Project'})
+        self.assertEqual(len(response.json()), 20)
+
+    def test_user_portfolio(self):
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/portfolio/user0/')
+        self.assertEqual(len(response.json()), 4)
+
+    def test_project_detail(self):
+        with self.assertNumQueries(3):
+            response = self.client.get(f'/api/projects/{self.project.pk}/')
+        data = response.json()
+        self.assertEqual(len(data['comments']), 10)
+        self.assertEqual(len(data['resources']), 10)
+        self.assertEqual(data['likes_count'], 3)
+
+    def test_service_request_detail(self):
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/service-request/view/', {'code': self.service_request.request_code})
+        self.assertEqual(len(response.json()['reviews']), 5)
+
+
+class ProjectCounterTests(CacheIsolatedTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', password='pw')
+        cls.project = ProjectPost.objects.create(user=cls.owner, title='Counted', project_url='https://example.com')
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.owner)
+
+    def test_like_toggle_updates_counter(self):
+        url = f'/api/projects/{self.project.pk}/like/'
+        self.assertEqual(self.client.post(url).json(), {'action': 'liked', 'likes_count': 1})
+        self.assertEqual(self.client.post(url).json(), {'action': 'unliked', 'likes_count': 0})
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.likes_count, 0)
+
+    def test_comment_create_and_delete_update_counter(self):
+        url = f'/api/projects/{self.project.pk}/comments/'
+        comment_id = self.client.post(url, {'content': 'Nice'}, content_type='application/json').json()['id']
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.comments_count, 1)
+
+        self.client.delete(f'{url}{comment_id}/')
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.comments_count, 0)
+
+    def test_likes_and_comments_made_outside_the_views_are_counted(self):
+        fan = User.objects.create_user('fan', password='pw')
+        Like.objects.create(project=self.project, user=self.owner)  # As the admin does
+        Like.objects.create(project=self.project, user=fan)
+        Comment.objects.create(project=self.project, user=fan, content='From the admin')
+        self.project.refresh_from_db()
+        self.assertEqual((self.project.likes_count, self.project.comments_count), (2, 1))
+
+        url = f'/api/projects/{self.project.pk}/like/'
+        self.assertEqual(self.client.post(url).json(), {'action': 'unliked', 'likes_count': 1})
+        fan.delete()  # Cascades to the fan's like and comment
+        self.project.refresh_from_db()
+        self.assertEqual((self.project.likes_count, self.project.comments_count), (0, 0))
+
+    def test_unlike_never_drives_the_counter_below_zero(self):
+        Like.objects.create(project=self.project, user=self.owner)
+        ProjectPost.objects.filter(pk=self.project.pk).update(likes_count=0)  # Drifted
+        response = self.client.post(f'/api/projects/{self.project.pk}/like/')
+        self.assertEqual(response.json(), {'action': 'unliked', 'likes_count': 0})
+
+    def liked_between_load_and_save(self):
+        """Patches ProjectPost.save so another user likes the project just before the edit is written."""
+        fan = User.objects.create_user('fan', password='pw')
+        save = ProjectPost.save
+
+        def like_then_save(project, *args, **kwargs):
+            Like.objects.create(project_id=project.pk, user=fan)
+            return save(project, *args, **kwargs)
+        return mock.patch.object(ProjectPost, 'save', like_then_save)
+
+    def test_api_edit_keeps_a_concurrent_like(self):
+        with self.liked_between_load_and_save():
+            response = self.client.put(
+                f'/api/projects/{self.project.pk}/', {'title': 'Renamed'}, content_type='application/json',
+            )
+        self.assertEqual(response.status_code, 200)
+        self.project.refresh_from_db()
+        self.assertEqual((self.project.title, self.project.likes_count), ('Renamed', 1))
+
+    def test_admin_edit_keeps_a_concurrent_like(self):
+        self.client.force_login(User.objects.create_superuser('root', password='pw'))
+        with self.liked_between_load_and_save():
+            response = self.client.post(f'/admin/apied/projectpost/{self.project.pk}/change/', {
+                'user': self.owner.pk, 'title': 'Renamed', 'description': '', 'project_url': 'https://example.com',
+                'project_type': self.project.project_type, 'is_public': 'on',
+            })
+        self.assertEqual(response.status_code, 302)
+        self.project.refresh_from_db()
+        self.assertEqual((self.project.title, self.project.likes_count), ('Renamed', 1))
+
+    def test_rebuild_command_fixes_drift(self):
+        # Bulk inserts skip the counting signals, as in seed_data and import_projects
+        Like.objects.bulk_create([Like(project=self.project, user=self.owner)])
+        Comment.objects.bulk_create([Comment(project=self.project, user=self.owner, content='Untracked')])
+        out = StringIO()
+        call_command('rebuild_project_counters', stdout=out)
+        self.assertIn('1 drifted', out.getvalue())
+        self.project.refresh_from_db()
+        self.assertEqual((self.project.likes_count, self.project.comments_count), (1, 1))
+
+
+class ProjectSearchTests(CacheIsolatedTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.alice = User.objects.create_user('alice', password='pw')
+        cls.bob = User.objects.create_user('bob', password='pw')
+        cls.in_title = ProjectPost.objects.create(user=cls.bob, title='Django shop', project_url='https://example.com')
+        cls.in_description = ProjectPost.objects.create(
+            user=cls.bob, title='Storefront', description='Built with django', project_url='https://example.com',
+        )
+        cls.by_username = ProjectPost.objects.create(user=cls.alice, title='Landing page', project_url='https://example.com')
+        ProjectPost.objects.create(user=cls.alice, title='Django secret', project_url='https://example.com', is_public=False)
+
+    def search(self, q, **params):
+        return [p['id'] for p in self.client.get('/api/search/', {'q': q, **params}).json()]
+
+    def test_ranks_title_matches_first(self):
+        self.assertEqual(self.search('django'), [self.in_title.pk, self.in_description.pk])
+
+    def test_prefix_and_username_matches(self):
+        self.assertEqual(self.search('dja'), [self.in_title.pk, self.in_description.pk])
+        self.assertEqual(self.search('alice'), [self.by_username.pk])
+
+    def test_index_follows_edits_and_deletes(self):
+        self.in_title.title = 'Flask shop'
+        self.in_title.save()
+        self.assertEqual(self.search('flask'), [self.in_title.pk])
+        self.in_description.delete()
+        self.assertEqual(self.search('django'), [])
+
+        self.alice.username = 'alicia'
+        self.alice.save()
+        self.assertEqual(self.search('alicia'), [self.by_username.pk])
+
+    def test_cursor_pagination(self):
+        response = self.client.get('/api/search/', {'q': 'django', 'limit': 1})
+        self.assertEqual([p['id'] for p in response.json()], [self.in_title.pk])
+        self.assertEqual(self.search('django', limit=1, cursor=response['X-Next-Cursor']), [self.in_description.pk])
+
+    def test_punctuation_only_query(self):
+        self.assertEqual(self.search('"*'), [])
+
+
+@skipIf(connection.vendor != 'sqlite', 'the search index is SQLite FTS5 only')
+class ProjectSearchRebuildTests(TransactionTestCase):
+    """The SQLite schema editor rebuilds tables outside a transaction, hence TransactionTestCase."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('carol', password='pw')
+        self.project = ProjectPost.objects.create(user=self.user, title='Django shop', project_url='https://example.com')
+
+    def tearDown(self):
+        # The FTS table is not a model, so the per-test flush leaves it alone
+        with connection.cursor() as c:
+            c.execute("DELETE FROM apied_projectsearch")
+
+    def alter_title(self, max_length):
+        old_field = ProjectPost._meta.get_field('title')
+        new_field = models.CharField(max_length=max_length)
+        new_field.set_attributes_from_name('title')
+        new_field.model = ProjectPost
+        with connection.schema_editor() as editor:
+            editor.alter_field(ProjectPost, old_field, new_field)
+        return new_field
+
+    def test_index_survives_a_table_rebuild(self):
+        new_field = self.alter_title(150)
+        try:
+            self.project.title = 'Flask shop'
+            self.project.save()
+            added = ProjectPost.objects.create(user=self.user, title='Flask blog', project_url='https://example.com')
+        finally:
+            with connection.schema_editor() as editor:
+                editor.alter_field(ProjectPost, new_field, ProjectPost._meta.get_field('title'))
+        self.assertEqual(sorted(search_project_ids('flask', 10)[0]), [self.project.pk, added.pk])
+        self.assertEqual(search_project_ids('django', 10)[0], [])
+
+
+class SearchSuggestionTests(CacheIsolatedTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.dana = User.objects.create_user('dana', password='pw')
+        cls.daniel = User.objects.create_user('Daniel', password='pw')
+        cls.shop = ProjectPost.objects.create(user=cls.dana, title='Dashboard Kit', project_url='https://example.com')
+        ProjectPost.objects.create(user=cls.daniel, title='Data Viz', project_url='https://example.com')
+        ProjectPost.objects.create(user=cls.daniel, title='Dairy Farm', project_url='https://example.com')
+        ProjectPost.objects.create(user=cls.dana, title='Darkroom', project_url='https://example.com', is_public=False)
+
+    def suggest(self, q):
+        return self.client.get('/api/search/suggest/', {'q': q}).json()
+
+    def test_prefix_matches_titles_and_usernames(self):
+        with self.assertNumQueries(2):
+            data = self.suggest('DA')
+        self.assertEqual(sorted(data['titles']), ['Dairy Farm', 'Dashboard Kit', 'Data Viz'])
+        # Daniel has two public projects, dana only one
+        self.assertEqual(data['usernames'], ['Daniel', 'dana'])
+
+    def test_likes_raise_title_weight(self):
+        self.client.force_login(self.daniel)
+        self.client.post(f'/api/projects/{self.shop.pk}/like/')
+        self.assertEqual(self.suggest('da')['titles'][0], 'Dashboard Kit')
+
+    def test_heaviest_match_wins_beyond_the_candidate_window(self):
+        SearchSuggestion.objects.bulk_create(
+            SearchSuggestion(kind='title', text=f'Da {i:03}', normalized=f'da {i:03}', user=self.dana)
+            for i in range(DEFAULT_SUGGESTIONS * CANDIDATE_FACTOR + 1)
+        )
+        heavy = ProjectPost.objects.create(user=self.dana, title='Dazzle', project_url='https://example.com')
+        SearchSuggestion.objects.filter(project=heavy).update(weight=50)
+        self.assertEqual(self.suggest('da')['titles'][0], 'Dazzle')
+
+    def test_index_follows_edits_deletes_and_renames(self):
+        self.shop.title = 'Admin Kit'
+        self.shop.save()
+        self.assertEqual(self.suggest('adm')['titles'], ['Admin Kit'])
+        self.shop.delete()
+        self.assertEqual(self.suggest('adm')['titles'], [])
+        self.assertEqual(self.suggest('dana')['usernames'], [])
+
+        self.daniel.username = 'dan'
+        self.daniel.save()
+        self.assertEqual(self.suggest('dan')['usernames'], ['dan'])
+
+    def test_rebuild_command(self):
+        SearchSuggestion.objects.all().delete()
+        call_command('rebuild_search_suggestions', stdout=StringIO())
+        self.assertEqual(len(self.suggest('da')['titles']), 3)
+
+
+class TariffCacheTests(CacheIsolatedTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.tariff = Tariff.objects.create(title='Starter', price='50,000 RWF', redirect_url='https://example.com')
+
+    def test_repeat_requests_skip_the_database(self):
+        first = self.client.get('/api/tariffs/')
+        self.assertEqual(first.json()[0]['title'], 'Starter')
+        self.assertIn('no-cache', first['Cache-Control'])
+
+        with self.assertNumQueries(0):
+            again = self.client.get('/api/tariffs/')
+            not_modified = self.client.get('/api/tariffs/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(again.content, first.content)
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_save_and_delete_invalidate(self):
+        etag = self.client.get('/api/tariffs/')['ETag']
+        self.tariff.price = '60,000 RWF'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tariff.save()
+            # Until the save commits, other requests would still read the old rows
+            self.assertIsNotNone(cache.get(TARIFF_CACHE_KEY))
+        response = self.client.get('/api/tariffs/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()[0]['price'], '60,000 RWF')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tariff.delete()
+        self.assertEqual(self.client.get('/api/tariffs/').json(), [])
+
+
+class ConditionalProjectGetTests(CacheIsolatedTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', password='pw')
+        cls.project = ProjectPost.objects.create(user=cls.owner, title='Cached', project_url='https://example.com')
+        Comment.objects.create(project=cls.project, user=cls.owner, content='First')
+
+    def test_detail_revalidates_without_loading_comments(self):
+        url = f'/api/projects/{self.project.pk}/'
+        first = self.client.get(url)
+        self.assertIn('Last-Modified', first)
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 304)
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_activity_changes_validators(self):
+        etags = {}
+        for url in ('/api/projects/', f'/api/projects/{self.project.pk}/', '/api/portfolio/owner/'):
+            etags[url] = self.client.get(url)['ETag']
+
+        self.client.force_login(self.owner)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f'/api/projects/{self.project.pk}/like/')
+        self.client.logout()
+        for url, etag in etags.items():
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200, url)
+
+    def test_lists_are_validated_by_etag_alone(self):
+        doomed = ProjectPost.objects.create(user=self.owner, title='Doomed', project_url='https://example.com')
+        for url in ('/api/projects/', '/api/portfolio/owner/'):
+            first = self.client.get(url)
+            self.assertNotIn('Last-Modified', first, url)
+            self.assertIn('ETag', first, url)
+        since = http_date(time.time() + 60)
+
+        doomed.delete()
+        for url in ('/api/projects/', '/api/portfolio/owner/'):
+            response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=since)
+            self.assertEqual(response.status_code, 200, url)
+            self.assertNotIn('Doomed', [p['title'] for p in response.json()])
+
+    def test_feed_page_etag_depends_on_viewer(self):
+        etag = self.client.get('/api/projects/')['ETag']
+        self.client.force_login(self.owner)
+        self.assertEqual(self.client.get('/api/projects/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class ProjectPayloadCacheTests(CacheIsolatedTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', password='pw')
+        cls.fan = User.objects.create_user('fan', password='pw')
+        cls.project = ProjectPost.objects.create(user=cls.owner, title='Popular', project_url='https://example.com')
+        Comment.objects.create(project=cls.project, user=cls.fan, content='Great')
+        ProjectResource.objects.create(project=cls.project, name='Docs', resource_url='https://example.com')
+
+    def detail(self):
+        return self.client.get(f'/api/projects/{self.project.pk}/').json()
+
+    def test_warm_detail_skips_comments_and_resources(self):
+        self.detail()
+        with self.assertNumQueries(1):
+            data = self.detail()
+        self.assertEqual(len(data['comments']), 1)
+        self.assertEqual(len(data['resources']), 1)
+
+    def test_viewer_state_is_merged_per_request(self):
+        Like.objects.create(project=self.project, user=self.fan)
+        self.assertFalse(self.detail()['user_has_liked'])
+        self.client.force_login(self.fan)
+        self.assertTrue(self.detail()['user_has_liked'])
+
+    def test_interactions_bump_the_version(self):
+        # Versions move on commit, which the test transaction never reaches on its own
+        self.detail()
+        self.client.force_login(self.fan)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f'/api/projects/{self.project.pk}/like/')
+        self.assertEqual(self.detail()['likes_count'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            comment_id = self.client.post(
+                f'/api/projects/{self.project.pk}/comments/', {'content': 'Again'}, content_type='application/json',
+            ).json()['id']
+        self.assertEqual(len(self.detail()['comments']), 2)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(f'/api/projects/{self.project.pk}/comments/{comment_id}/')
+        self.assertEqual(len(self.detail()['comments']), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.resources.get().delete()
+        self.assertEqual(self.detail()['resources'], [])
+
+    def test_admin_and_cascade_changes_bump_the_version(self):
+        staff = User.objects.create_user('staff', password='pw', is_staff=True, is_superuser=True)
+        Like.objects.create(project=self.project, user=self.fan)
+        self.assertEqual(self.detail()['comments_count'], 1)
+
+        self.client.force_login(staff)
+        comment = self.project.comments.get()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f'/admin/apied/comment/{comment.pk}/delete/', {'post': 'yes'})
+        data = self.detail()
+        self.assertEqual((data['comments'], data['comments_count'], data['likes_count']), ([], 0, 1))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.fan.delete()
+        self.assertEqual(self.detail()['likes_count'], 0)
+
+    def test_owner_rename_is_not_cached(self):
+        self.detail()
+        self.owner.username = 'renamed'
+        self.owner.save()
+        self.assertEqual(self.detail()['username'], 'renamed')
+
+    def test_commenter_rename_bumps_the_version(self):
+        url = f'/api/projects/{self.project.pk}/'
+        etag = self.client.get(url)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.fan.username = 'renamed'
+            self.fan.save(update_fields=['username'])
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['comments'][0]['username'], 'renamed')
+
+
+class ScreenshotDerivativeTests(CacheIsolatedTestCase):
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        media_override = override_settings(MEDIA_ROOT=media_root)
+        media_override.enable()
+        self.addCleanup(media_override.disable)
+        self.owner = User.objects.create_user('owner', password='pw')
+
+    def upload(self, width, height):
+        buffer = BytesIO()
+        Image.new('RGB', (width, height), 'teal').save(buffer, 'PNG')
+        project = ProjectPost.objects.create(
+            user=self.owner, title='Shot', project_url='https://example.com',
+            screenshot=SimpleUploadedFile('shot.png', buffer.getvalue(), content_type='image/png'),
+        )
+        # Queued for the worker, not run inline
+        job = BackgroundJob.objects.get(name='generate_screenshot_derivatives')
+        self.assertEqual(job.payload, {'project_id': project.pk})
+        return project
+
+    def test_generates_sizes_and_srcset(self):
+        project = self.upload(3000, 1500)
+        self.assertIsNone(self.client.get(f'/api/projects/{project.pk}/').json()['screenshot_srcset'])
+
+        self.assertTrue(generate_screenshot_derivatives(project.pk))
+        project.refresh_from_db()
+        sizes = project.screenshot_derivatives['sizes']
+        self.assertEqual({name: d['width'] for name, d in sizes.items()}, {'card': 480, 'detail': 1200, 'retina': 2400})
+        with project.screenshot.storage.open(sizes['card']['webp']) as f:
+            self.assertEqual(Image.open(f).size, (480, 240))
+
+        srcset = self.client.get('/api/projects/').json()[0]['screenshot_srcset']
+        self.assertTrue(srcset['webp'].startswith('http://testserver/media/project_screenshots/derivatives/'))
+        self.assertIn('card.jpeg 480w', srcset['jpeg'])
+
+    def test_small_originals_are_not_upscaled(self):
+        project = self.upload(600, 400)
+        generate_screenshot_derivatives(project.pk)
+        project.refresh_from_db()
+        self.assertEqual([d['width'] for d in project.screenshot_derivatives['sizes'].values()], [480, 600])
+
+
+class StreamingListTests(CacheIsolatedTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', password='pw')
+        cls.staff = User.objects.create_user('staff', password='pw', is_staff=True)
+        for i in range(5):
+            ProjectPost.objects.create(user=cls.owner, title=f'Project {i}', project_url='https://example.com')
+        for i in range(3):
+            service_request = ServiceRequest.objects.create(
+                service_type='training', country='Rwanda', city='Kigali', organization_type='individual',
+                organization_name=f'Client {i}', preferred_language='English', job_description='Course',
+                primary_phone='0780000000', primary_email='client@example.com', budget_range='below_20k',
+                terms_accepted=True,
+            )
+            AdminReview.objects.create(service_request=service_request, admin_user=cls.staff, comment='Seen')
+
+    def stream(self, url, **params):
+        response = self.client.get(url, {'stream': '1', **params})
+        self.assertTrue(response.streaming)
+        return json.loads(b''.join(response.streaming_content))
+
+    def test_feed_and_portfolio_stream_every_project(self):
+        # limit only applies to paginated responses
+        titles = [p['title'] for p in self.stream('/api/projects/', limit=2)]
+        self.assertEqual(titles, [f'Project {i}' for i in range(4, -1, -1)])
+        self.assertEqual(len(self.stream('/api/portfolio/owner/')), 5)
+
+    def test_staff_service_request_listing(self):
+        self.assertEqual(self.client.get('/api/service-requests/').status_code, 403)
+        self.client.force_login(self.staff)
+        response = self.client.get('/api/service-requests/')
+        data = json.loads(b''.join(response.streaming_content))
+        self.assertEqual([r['organization_name'] for r in data], ['Client 2', 'Client 1', 'Client 0'])
+        self.assertEqual(data[0]['reviews'][0]['admin_username'], 'staff')
+        self.assertEqual(self.client.get('/api/service-requests/', {'service_type': 'other'}).getvalue(), b'[]')
+
+
+class JsonEncoderTests(TestCase):
+    payload = {
+        'created_at': datetime(2025, 10, 4, 16, 26, 1, 123456, tzinfo=timezone.utc),
+        'due_date': date(2025, 12, 1),
+        'price': Decimal('1.50'),
+        'title': 'Café',
+    }
+    expected = {
+        'created_at': '2025-10-04T16:26:01.123456+00:00',
+        'due_date': '2025-12-01',
+        'price': '1.50',
+        'title': 'Café',
+    }
+
+    def test_stdlib_fallback(self):
+        with mock.patch.object(responses, 'orjson', None):
+            self.assertEqual(json.loads(responses.dumps(self.payload)), self.expected)
+
+    @skipIf(responses.orjson is None, "orjson is not installed")
+    def test_orjson_matches_fallback(self):
+        with mock.patch.object(responses, 'orjson', None):
+            fallback = responses.dumps(self.payload)
+        self.assertEqual(responses.dumps(self.payload), fallback)
+
+    def test_response_rejects_non_dict_unless_unsafe(self):
+        with self.assertRaises(TypeError):
+            responses.JsonResponse([1])
+        self.assertEqual(responses.JsonResponse([1], safe=False, status=201).status_code, 201)
+
+
+@override_settings(ROOT_URLCONF='apied_service.asgi_urls')
+class AsyncReadPathTests(CacheIsolatedTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', password='pw')
+        cls.public = ProjectPost.objects.create(user=cls.owner, title='Async shop', project_url='https://example.com')
+        cls.private = ProjectPost.objects.create(
+            user=cls.owner, title='Async secret', project_url='https://example.com', is_public=False,
+        )
+        Comment.objects.create(project=cls.public, user=cls.owner, content='Hello')
+        cls.service_request = ServiceRequest.objects.create(
+            service_type='other', country='Rwanda', city='Huye', organization_type='individual',
+            organization_name='Solo', preferred_language='French', job_description='Help',
+            primary_phone='0780000000', primary_email='solo@example.com', budget_range='below_20k',
+            terms_accepted=True,
+        )
+        Tariff.objects.create(title='Basic', price='Contact Us', redirect_url='https://example.com')
+
+    async def test_feed_search_and_portfolio(self):
+        feed = await self.async_client.get('/api/projects/')
+        self.assertEqual([p['title'] for p in feed.json()], ['Async shop'])
+        not_modified = await self.async_client.get('/api/projects/', headers={'if-none-match': feed['ETag']})
+        self.assertEqual(not_modified.status_code, 304)
+
+        search = await self.async_client.get('/api/search/', {'q': 'async'})
+        self.assertEqual([p['id'] for p in search.json()], [self.public.pk])
+
+        portfolio = await self.async_client.get('/api/portfolio/owner/')
+        self.assertEqual(len(portfolio.json()), 1)
+        await self.async_client.aforce_login(self.owner)
+        portfolio = await self.async_client.get('/api/portfolio/owner/')
+        self.assertEqual(len(portfolio.json()), 2)
+
+    async def test_detail_and_private_projects(self):
+        detail = (await self.async_client.get(f'/api/projects/{self.public.pk}/')).json()
+        self.assertEqual(detail['comments'][0]['content'], 'Hello')
+        self.assertFalse(detail['user_has_liked'])
+        response = await self.async_client.get(f'/api/projects/{self.private.pk}/')
+        self.assertEqual(response.status_code, 404)
+
+    async def test_writes_fall_through_to_sync_views(self):
+        await self.async_client.aforce_login(self.owner)
+        response = await self.async_client.put(
+            f'/api/projects/{self.public.pk}/', {'title': 'Renamed'}, content_type='application/json',
+        )
+        self.assertEqual(response.json()['title'], 'Renamed')
+
+    async def test_tariffs_and_service_request_lookup(self):
+        tariffs = await self.async_client.get('/api/tariffs/')
+        self.assertEqual(tariffs.json()[0]['title'], 'Basic')
+        cached = await self.async_client.get('/api/tariffs/', headers={'if-none-match': tariffs['ETag']})
+        self.assertEqual(cached.status_code, 304)
+
+        lookup = await self.async_client.get('/api/service-request/view/', {'code': self.service_request.request_code})
+        self.assertEqual(lookup.json()['organization_name'], 'Solo')
+        missing = await self.async_client.get('/api/service-request/view/', {'code': 'NOPE'})
+        self.assertEqual(missing.status_code, 404)
+
+    async def test_streamed_feed(self):
+        response = await self.async_client.get('/api/projects/', {'stream': '1'})
+        body = b''.join([chunk async for chunk in response.streaming_content])
+        self.assertEqual([p['title'] for p in json.loads(body)], ['Async shop'])
+
+
+class CommentPaginationTests(CacheIsolatedTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', password='pw')
+        cls.project = ProjectPost.objects.create(user=cls.owner, title='Busy', project_url='https://example.com')
+        for i in range(25):
+            Comment.objects.create(project=cls.project, user=cls.owner, content=f'Comment {i}')
+        call_command('rebuild_project_counters', stdout=StringIO())
+
+    def test_detail_embeds_only_the_newest_comments(self):
+        with self.assertNumQueries(3):
+            data = self.client.get(f'/api/projects/{self.project.pk}/').json()
+        self.assertEqual([c['content'] for c in data['comments']], [f'Comment {i}' for i in range(24, 4, -1)])
+        self.assertEqual(data['comments_count'], 25)
+
+        older = self.client.get(
+            f'/api/projects/{self.project.pk}/comments/', {'cursor': data['comments_next_cursor'], 'limit': 2},
+        ).json()
+        self.assertEqual([c['content'] for c in older], ['Comment 4', 'Comment 3'])
+
+    def test_comment_pages(self):
+        url = f'/api/projects/{self.project.pk}/comments/'
+        seen, cursor = [], None
+        while True:
+            with self.assertNumQueries(2):
+                response = self.client.get(url, {'limit': 10, **({'cursor': cursor} if cursor else {})})
+            seen += [c['content'] for c in response.json()]
+            cursor = response.get('X-Next-Cursor')
+            if not cursor:
+                break
+        self.assertEqual(seen, [f'Comment {i}' for i in range(24, -1, -1)])
+
+    def test_private_project_comments_are_hidden(self):
+        ProjectPost.objects.filter(pk=self.project.pk).update(is_public=False)
+        self.assertEqual(self.client.get(f'/api/projects/{self.project.pk}/comments/').status_code, 404)
+        self.assertEqual(
+            self.client.post(f'/api/projects/{self.project.pk}/comments/', {'content': 'x'}, content_type='application/json').status_code,
+            403,
+        )
+
+
+class ProjectBatchTests(CacheIsolatedTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', password='pw')
+        cls.other = User.objects.create_user('other', password='pw')
+        cls.projects = [
+            ProjectPost.objects.create(user=cls.owner, title=f'Batch {i}', project_url='https://example.com')
+            for i in range(10)
+        ]
+        for project in cls.projects:
+            Comment.objects.create(project=project, user=cls.other, content='Hi')
+        cls.hidden = ProjectPost.objects.create(
+            user=cls.owner, title='Hidden', project_url='https://example.com', is_public=False,
+        )
+        Like.objects.create(project=cls.projects[0], user=cls.other)
+
+    def batch(self, ids):
+        return self.client.get('/api/projects/batch/', {'ids': ','.join(map(str, ids))})
+
+    def test_constant_queries_and_permissions(self):
+        ids = [p.pk for p in self.projects] + [self.hidden.pk, 999999]
+        self.client.force_login(self.other)
+        # session + user, projects (with like state), resources + comments
+        with self.assertNumQueries(5):
+            data = self.batch(ids).json()
+        self.assertEqual(list(data['results']), [str(p.pk) for p in self.projects])
+        self.assertEqual(data['missing'], [self.hidden.pk, 999999])
+        self.assertTrue(data['results'][str(self.projects[0].pk)]['user_has_liked'])
+        self.assertEqual(len(data['results'][str(self.projects[1].pk)]['comments']), 1)
+
+    def test_owner_sees_private_projects(self):
+        self.client.force_login(self.owner)
+        self.assertEqual(self.batch([self.hidden.pk]).json()['missing'], [])
+
+    def test_rejects_bad_input(self):
+        self.assertEqual(self.batch([]).status_code, 400)
+        self.assertEqual(self.client.get('/api/projects/batch/', {'ids': '1,x'}).status_code, 400)
+        self.assertEqual(self.batch(range(1, 52)).status_code, 400)
+
+
+class ViewerLikeStateTests(CacheIsolatedTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', password='pw')
+        cls.viewer = User.objects.create_user('viewer', password='pw')
+        cls.liked = ProjectPost.objects.create(user=cls.owner, title='Liked widget', project_url='https://example.com')
+        cls.other = ProjectPost.objects.create(user=cls.owner, title='Other widget', project_url='https://example.com')
+        Like.objects.create(project=cls.liked, user=cls.viewer)
+
+    def like_state(self, url, params=None):
+        return {p['id']: p['user_has_liked'] for p in self.client.get(url, params).json()}
+
+    def test_list_endpoints_report_viewer_likes(self):
+        self.client.force_login(self.viewer)
+        expected = {self.liked.pk: True, self.other.pk: False}
+        for url, params in [
+            ('/api/projects/', None),
+            ('/api/projects/', {'stream': '1'}),
+            ('/api/search/', {'q': 'widget'}),
+            ('/api/portfolio/owner/', None),
+        ]:
+            with self.subTest(url=url, params=params):
+                if params and 'stream' in params:
+                    data = json.loads(b''.join(self.client.get(url, params).streaming_content))
+                    self.assertEqual({p['id']: p['user_has_liked'] for p in data}, expected)
+                else:
+                    self.assertEqual(self.like_state(url, params), expected)
+
+    def test_like_state_is_per_viewer_and_costs_no_extra_query(self):
+        self.client.force_login(self.viewer)
+        self.client.get('/api/projects/')
+        self.client.force_login(self.owner)
+        # session + user, projects (with like state); payloads come from the cache
+        with self.assertNumQueries(3):
+            state = self.like_state('/api/projects/')
+        self.assertEqual(state, {self.liked.pk: False, self.other.pk: False})
+        self.client.logout()
+        self.assertEqual(self.like_state('/api/projects/'), {self.liked.pk: False, self.other.pk: False})
+
+
+@task(name='test_flaky')
+def flaky_task(fail):
+    if fail:
+        raise ValueError('boom')
+
+
+class BackgroundJobTests(TestCase):
+    def test_runs_due_jobs_in_batches(self):
+        for _ in range(3):
+            enqueue('test_flaky', {'fail': False})
+        later = enqueue('test_flaky', {'fail': False}, delay=60)
+        self.assertEqual(run_pending(batch_size=2), 2)
+        self.assertEqual(run_pending(batch_size=2), 1)
+        self.assertEqual(run_pending(batch_size=2), 0)
+        self.assertEqual(BackgroundJob.objects.filter(status='done').count(), 3)
+        later.refresh_from_db()
+        self.assertEqual(later.status, 'queued')
+
+    def test_failures_back_off_then_fail(self):
+        job = enqueue('test_flaky', {'fail': True}, max_attempts=2)
+        with self.assertLogs('apied.jobs', 'ERROR'):
+            run_pending()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('queued', 1))
+        self.assertIn('ValueError: boom', job.last_error)
+        self.assertGreater(job.run_at, job.created_at)
+
+        BackgroundJob.objects.filter(pk=job.pk).update(run_at=job.created_at)
+        with self.assertLogs('apied.jobs', 'ERROR'):
+            run_pending()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('failed', 2))
+
+    def test_claims_are_exclusive_until_the_lease_expires(self):
+        job = enqueue('test_flaky', {'fail': False})
+        self.assertEqual(len(claim_jobs('a', visibility_timeout=60)), 1)
+        self.assertEqual(claim_jobs('b'), [])
+
+        # A crashed worker's lease runs out and another worker picks the job up
+        BackgroundJob.objects.filter(pk=job.pk).update(locked_until=job.created_at)
+        reclaimed = claim_jobs('b')
+        self.assertEqual([j.attempts for j in reclaimed], [2])
+        self.assertTrue(reclaimed[0].locked_by.startswith('b:'))
+
+    def test_unique_jobs_are_not_queued_twice(self):
+        first = enqueue('test_flaky', {'fail': False}, unique=True)
+        self.assertEqual(enqueue('test_flaky', {'fail': False}, unique=True), first)
+        self.assertEqual(BackgroundJob.objects.count(), 1)
+
+    @override_settings(MANAGERS=[('Ops', 'ops@example.com')])
+    def test_service_request_notification_is_queued(self):
+        response = self.client.post('/api/service-request/create/', {
+            'service_type': 'build_website', 'country': 'Rwanda', 'city': 'Kigali',
+            'organization_type': 'company', 'organization_name': 'Acme', 'preferred_language': 'English',
+            'job_description': 'A shop', 'primary_phone': '0780000000', 'primary_email': 'a@example.com',
+            'budget_range': 'below_20k', 'terms_accepted': True,
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(mail.outbox, [])
+
+        call_command('run_jobs', once=True, stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn(response.json()['request_code'], mail.outbox[0].subject)
+
+
+class ServiceRequestRollupTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user('staff', password='pw', is_staff=True, is_superuser=True)
+
+    def create_request(self, **fields):
+        defaults = dict(
+            service_type='build_website', country='Rwanda', city='Kigali', organization_type='company',
+            organization_name='Acme', preferred_language='English', job_description='A website',
+            primary_phone='0780000000', primary_email='acme@example.com', budget_range='50k_100k',
+            terms_accepted=True,
+        )
+        return ServiceRequest.objects.create(**{**defaults, **fields})
+
+    def test_rollups_follow_creates_edits_and_deletes(self):
+        first = self.create_request()
+        self.create_request()
+        self.create_request(country='Kenya', budget_range='below_20k')
+        self.assertEqual(
+            sorted(ServiceRequestDailyStat.objects.values_list('country', 'budget_range', 'requests')),
+            [('Kenya', 'below_20k', 1), ('Rwanda', '50k_100k', 2)],
+        )
+        first.service_type = 'training'
+        first.save()
+        first.delete()
+        self.assertEqual(
+            sorted(ServiceRequestDailyStat.objects.values_list('country', 'requests')),
+            [('Kenya', 1), ('Rwanda', 1)],
+        )
+        ServiceRequestDailyStat.objects.all().delete()
+        call_command('rebuild_service_request_rollups', stdout=StringIO())
+        self.assertEqual(ServiceRequestDailyStat.objects.count(), 2)
+
+    def test_stats_endpoint_reads_only_rollups(self):
+        for _ in range(3):
+            self.create_request()
+        self.create_request(budget_range='above_500k')
+        self.assertEqual(self.client.get('/api/service-requests/stats/').status_code, 403)
+
+        self.client.force_login(self.staff)
+        start = datetime.now(timezone.utc).date().replace(day=1) - timedelta(days=40)
+        # session + user, then daily totals and one breakdown per dimension
+        with self.assertNumQueries(6):
+            report = self.client.get('/api/service-requests/stats/', {'from': start.isoformat()}).json()
+        self.assertEqual(report['total'], 4)
+        self.assertEqual(report['breakdown']['budget_range'], {'50k_100k': 3, 'above_500k': 1})
+        self.assertEqual(report['estimated_budget_rwf'], 3 * 75_000 + 500_000)
+        self.assertEqual(report['days'][0], {'day': start.isoformat(), 'requests': 0})
+        self.assertEqual(sum(d['requests'] for d in report['days']), 4)
+
+        bad = self.client.get('/api/service-requests/stats/', {'from': '2020-02-01', 'to': '2020-01-01'})
+        self.assertEqual(bad.status_code, 400)
+
+    def test_admin_dashboard(self):
+        self.create_request()
+        self.client.force_login(self.staff)
+        response = self.client.get('/admin/apied/servicerequest/stats/')
+        self.assertContains(response, 'Build a Website')
+        self.assertContains(self.client.get('/admin/apied/servicerequest/'), 'Pipeline stats')
+
+
+class AdminScaleTests(TestCase):
+    CHANGELISTS = ['projectpost', 'comment', 'like', 'projectresource', 'adminreview']
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user('staff', password='pw', is_staff=True, is_superuser=True)
+        cls.service_request = ServiceRequest.objects.create(
+            service_type='build_website', country='Rwanda', city='Kigali', organization_type='company',
+            organization_name='Acme', preferred_language='English', job_description='A website',
+            primary_phone='0780000000', primary_email='acme@example.com', budget_range='50k_100k',
+            terms_accepted=True,
+        )
+        cls.seed(5)
+
+    @classmethod
+    def seed(cls, n):
+        start = User.objects.count()
+        for i in range(start, start + n):
+            user = User.objects.create_user(f'member{i}', password='pw', is_staff=True)
+            project = ProjectPost.objects.create(user=user, title=f'Project {i}', project_url='https://example.com')
+            ProjectResource.objects.create(project=project, name='Docs', resource_url='https://example.com/docs')
+            Comment.objects.create(project=project, user=user, content='Nice')
+            Like.objects.create(project=project, user=user)
+            AdminReview.objects.create(service_request=cls.service_request, admin_user=user, comment='Checked')
+
+    def changelist_queries(self):
+        counts = {}
+        for model in self.CHANGELISTS:
+            with CaptureQueriesContext(connection) as ctx:
+                self.assertEqual(self.client.get(f'/admin/apied/{model}/').status_code, 200)
+            counts[model] = len(ctx.captured_queries)
+        return counts
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        self.client.force_login(self.staff)
+        before = self.changelist_queries()
+        self.seed(20)
+        self.assertEqual(self.changelist_queries(), before)
+
+    def test_counts_stop_at_the_threshold(self):
+        self.client.force_login(self.staff)
+        with mock.patch.object(apied_admin, 'APPROXIMATE_COUNT_THRESHOLD', 3):
+            response = self.client.get('/admin/apied/comment/')
+        self.assertEqual(response.context['cl'].result_count, 3)
+
+    def test_review_inline_sets_author_without_listing_staff(self):
+        self.client.force_login(self.staff)
+        url = f'/admin/apied/servicerequest/{self.service_request.pk}/change/'
+        page = self.client.get(url)
+        self.assertNotContains(page, '<option value="%d">' % self.staff.pk)
+
+        formset = page.context['inline_admin_formsets'][0].formset
+        data = {
+            f'{formset.prefix}-TOTAL_FORMS': formset.total_form_count(),
+            f'{formset.prefix}-INITIAL_FORMS': formset.initial_form_count(),
+        }
+        for i, form in enumerate(formset.initial_forms):
+            data[f'{formset.prefix}-{i}-id'] = form.instance.pk
+            data[f'{formset.prefix}-{i}-service_request'] = self.service_request.pk
+            data[f'{formset.prefix}-{i}-comment'] = form.instance.comment
+        new = formset.initial_form_count()
+        data[f'{formset.prefix}-{new}-comment'] = 'Called the client'
+        form = page.context['adminform'].form
+        data.update({name: value for name, value in form.initial.items() if name in form.fields and value is not None})
+        response = self.client.post(url, data)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(AdminReview.objects.get(comment='Called the client').admin_user, self.staff)
+
+
+class ServiceRequestExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user('staff', password='pw', is_staff=True, is_superuser=True)
+        for i in range(6):
+            service_request = ServiceRequest.objects.create(
+                service_type='training', country='Rwanda', city='Kigali', organization_type='individual',
+                organization_name='=HYPERLINK("x")' if i == 0 else f'Client {i}', preferred_language='English',
+                job_description='Line one\nline two', primary_phone='0780000000', primary_email='client@example.com',
+                budget_range='below_20k', terms_accepted=True,
+            )
+            for note in ('Called', 'Quoted'):
+                AdminReview.objects.create(service_request=service_request, admin_user=cls.staff, comment=note)
+
+    def export(self, **params):
+        response = self.client.get('/api/service-requests/export/', params)
+        return response, b''.join(response.streaming_content).decode()
+
+    def test_csv_export_streams_with_constant_queries(self):
+        self.assertEqual(self.client.get('/api/service-requests/export/').status_code, 403)
+        self.client.force_login(self.staff)
+        # session + user, requests (with users), then reviews prefetched once per chunk
+        with self.assertNumQueries(4):
+            response, body = self.export()
+        self.assertTrue(response.streaming)
+        self.assertIn('attachment; filename="service-requests-', response['Content-Disposition'])
+        rows = list(csv.DictReader(body.splitlines(keepends=True)))
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(rows[0]['review_count'], '2')
+        self.assertEqual(rows[0]['job_description'], 'Line one\nline two')
+        self.assertTrue(rows[-1]['organization_name'].startswith("'="))  # Not a live formula
+
+    def test_ndjson_export(self):
+        self.client.force_login(self.staff)
+        response, body = self.export(format='ndjson')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        records = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual(len(records), 6)
+        self.assertEqual([r['comment'] for r in records[0]['reviews']], ['Quoted', 'Called'])
+        self.assertEqual(self.client.get('/api/service-requests/export/', {'format': 'xml'}).status_code, 400)
+
+    def test_admin_action(self):
+        self.client.force_login(self.staff)
+        selected = ServiceRequest.objects.values_list('pk', flat=True)[:2]
+        response = self.client.post('/admin/apied/servicerequest/', {
+            'action': 'export_csv', '_selected_action': list(selected),
+        })
+        self.assertEqual(len(list(csv.reader(b''.join(response.streaming_content).decode().splitlines(keepends=True)))), 3)
+
+
+class ImportProjectsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.alice = User.objects.create_user('alice', password='pw')
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+
+    def write(self, name, content):
+        path = f'{self.tmpdir}/{name}'
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return path
+
+    def test_jsonl_import_in_batches(self):
+        records = [
+            {
+                'username': 'alice', 'title': f'Imported Shop {i}', 'project_url': f'https://example.com/{i}',
+                'created_at': '2021-03-04T05:06:07Z', 'resources': [{'name': 'Docs', 'url': f'https://docs.example.com/{i}'}],
+            }
+            for i in range(5)
+        ]
+        records.append({'username': 'ghost', 'title': 'Orphan', 'project_url': 'https://example.com'})
+        records.append({'username': 'alice', 'title': 'Bad link', 'project_url': 'not a url'})
+        path = self.write('projects.jsonl', '\n'.join(json.dumps(r) for r in records))
+
+        out, err = StringIO(), StringIO()
+        # Per batch of two: user lookup, project insert, created_at update, resource insert, search index delete + insert
+        with CaptureQueriesContext(connection) as queries:
+            call_command('import_projects', path, '--batch-size', '2', '--skip-suggestions', stdout=out, stderr=err)
+        self.assertLessEqual(len(queries), 4 * 6 + 8)  # plus savepoints
+        self.assertIn('Imported 5 project(s) and 5 resource(s)', out.getvalue())
+        self.assertIn('skipped 2', out.getvalue())
+        self.assertIn("projects.jsonl:6: skipped (unknown user 'ghost')", err.getvalue())
+
+        project = ProjectPost.objects.get(title='Imported Shop 3')
+        self.assertEqual(project.created_at, datetime(2021, 3, 4, 5, 6, 7, tzinfo=timezone.utc))
+        self.assertEqual(list(project.resources.values_list('resource_url', flat=True)), ['https://docs.example.com/3'])
+        # Each imported batch is indexed for search too
+        self.assertEqual(len(search_project_ids('imported', 10)[0]), 5)
+
+    def test_lines_that_are_not_objects_are_skipped(self):
+        path = self.write('projects.jsonl', '\n'.join([
+            '[]', '"x"', '42',
+            json.dumps({'username': 'alice', 'title': 'Kept', 'project_url': 'https://example.com'}),
+        ]))
+        out, err = StringIO(), StringIO()
+        call_command('import_projects', path, '--skip-suggestions', stdout=out, stderr=err)
+        self.assertIn('Imported 1 project(s)', out.getvalue())
+        self.assertIn('skipped 3', out.getvalue())
+        self.assertIn('projects.jsonl:1: skipped (expected a JSON object, got list)', err.getvalue())
+        self.assertIn('projects.jsonl:2: skipped (expected a JSON object, got str)', err.getvalue())
+
+    def test_malformed_lines_are_skipped(self):
+        good = [json.dumps({'username': 'alice', 'title': f'Kept {i}', 'project_url': 'https://example.com'}) for i in range(2)]
+        path = self.write('projects.jsonl', '\n'.join([good[0], '{"username": "alice", "title": ', good[1]]))
+        out, err = StringIO(), StringIO()
+        # The first batch is already committed when the broken line is read
+        call_command('import_projects', path, '--batch-size', '1', '--skip-suggestions', stdout=out, stderr=err)
+        self.assertIn('Imported 2 project(s)', out.getvalue())
+        self.assertIn('skipped 1', out.getvalue())
+        self.assertIn('projects.jsonl:2: skipped (invalid JSON: ', err.getvalue())
+
+    def test_csv_import_creates_users_and_suggestions(self):
+        path = self.write('projects.csv', (
+            'username,title,project_url,is_public,resources\n'
+            'bob,Booking App,https://example.com/b,yes,"[{""name"": ""Repo"", ""url"": ""https://git.example.com/b""}]"\n'
+            'bob,Hidden,https://example.com/h,no,\n'
+        ))
+        call_command('import_projects', path, '--create-users', stdout=StringIO(), stderr=StringIO())
+        bob = User.objects.get(username='bob')
+        self.assertFalse(bob.has_usable_password())
+        self.assertEqual(
+            list(bob.projects.order_by('title').values_list('title', 'is_public')),
+            [('Booking App', True), ('Hidden', False)],
+        )
+        self.assertEqual(ProjectResource.objects.filter(project__user=bob).count(), 1)
+        self.assertTrue(SearchSuggestion.objects.filter(kind='title', text='Booking App').exists())
+        self.assertFalse(SearchSuggestion.objects.filter(kind='title', text='Hidden').exists())
+
+
+class SqliteTuningTests(TestCase):
+    def test_connection_hook_applies_configured_pragmas(self):
+        # TestCase wraps each test in a transaction, so stick to PRAGMAs allowed inside one
+        with override_settings(APIED_SQLITE_PRAGMAS={'cache_size': -4096, 'busy_timeout': 1234}):
+            configure_connection(sender=type(connection), connection=connection)
+        self.assertEqual(current_pragmas(connection, ['cache_size', 'busy_timeout']), {'cache_size': -4096, 'busy_timeout': 1234})
+        apply_pragmas(connection, {'cache_size': -2000, 'busy_timeout': 5000})
+
+    def test_rejects_malformed_pragma_names(self):
+        with self.assertRaises(ValueError):
+            apply_pragmas(connection, {'cache_size; DROP TABLE apied_tariff': 0})
+
+
+class QueryPlanTests(CacheIsolatedTestCase):
+    """The hot list queries walk an index in order instead of sorting in a temp B-tree."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', password='pw')
+        cls.visitor = User.objects.create_user('visitor', password='pw')
+        for i in range(30):
+            ProjectPost.objects.create(user=cls.owner, title=f'Project {i}', project_url='https://example.com', is_public=i % 3 != 0)
+        cls.project = ProjectPost.objects.filter(is_public=True).first()
+        for i in range(5):
+            Comment.objects.create(project=cls.project, user=cls.visitor, content=f'Comment {i}')
+
+    def query_plan(self, url, table, params=None):
+        """EXPLAIN QUERY PLAN of the ordered query the endpoint runs against `table`."""
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(url, params).status_code, 200)
+        sql = next(q['sql'] for q in queries if f'FROM "{table}"' in q['sql'] and 'ORDER BY' in q['sql'])
+        with connection.cursor() as c:
+            c.execute(f'EXPLAIN QUERY PLAN {sql}')
+            return ' | '.join(row[-1] for row in c.fetchall())
+
+    def assertUsesIndex(self, plan, index):
+        self.assertIn(f'INDEX {index}', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_feed_uses_partial_index(self):
+        self.assertUsesIndex(self.query_plan('/api/projects/', 'apied_projectpost'), 'apied_project_public_feed')
+        cursor = self.client.get('/api/projects/', {'limit': 5})['X-Next-Cursor']
+        plan = self.query_plan('/api/projects/', 'apied_projectpost', {'limit': 5, 'cursor': cursor})
+        self.assertUsesIndex(plan, 'apied_project_public_feed')
+
+    def test_portfolio_uses_composite_index(self):
+        self.client.force_login(self.visitor)
+        self.assertUsesIndex(self.query_plan('/api/portfolio/owner/', 'apied_projectpost'), 'apied_project_portfolio')
+
+    def test_comment_pages_use_project_index(self):
+        plan = self.query_plan(f'/api/projects/{self.project.pk}/comments/', 'apied_comment')
+        self.assertUsesIndex(plan, 'apied_comment_project_created')
+
+
+class SeedAndBenchmarkTests(CacheIsolatedTestCase):
+    def setUp(self):
+        super().setUp()
+        # register/login hash passwords, which is slow on purpose; keep their warnings out of the test output
+        for name in ('SLOW_REQUEST_MS', 'SLOW_QUERY_MS'):
+            patcher = mock.patch(f'apied.instrumentation.{name}', 60_000)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_seed_data_fills_every_table_consistently(self):
+        with self.assertRaises(CommandError):
+            call_command('seed_data', stdout=StringIO())
+        call_command(
+            'seed_data', '--force', '--users=10', '--projects=30', '--likes=3', '--comments=2',
+            '--service-requests=8', '--reviews=1', stdout=StringIO(),
+        )
+        self.assertEqual(ProjectPost.objects.count(), 30)
+        self.assertEqual(ProjectResource.objects.count(), 60)
+        self.assertEqual(AdminReview.objects.count(), 8)
+        project = ProjectPost.objects.order_by('-likes_count').first()
+        self.assertEqual(project.likes_count, project.likes.count())
+        self.assertLess(ProjectPost.objects.earliest('created_at').created_at, project.updated_at - timedelta(days=1))
+        self.assertEqual(ServiceRequestDailyStat.objects.aggregate(n=Sum('requests'))['n'], 8)
+        self.assertTrue(SearchSuggestion.objects.filter(kind='username').exists())
+
+    def test_every_route_has_a_scenario_that_succeeds(self):
+        self.assertEqual(uncovered_routes(), [])
+        call_command('seed_data', '--force', '--users=10', '--projects=20', '--service-requests=5', stdout=StringIO())
+        for result in run_benchmarks(repeat=1):
+            self.assertTrue(all(status < 400 for status in result['status']), result)
+
+
+class RequestInstrumentationTests(CacheIsolatedTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', password='pw')
+        ProjectPost.objects.create(user=cls.owner, title='Timed', project_url='https://example.com')
+
+    def timings(self, response):
+        """Server-Timing as {metric: (duration, description)}."""
+        metrics = {}
+        for entry in response['Server-Timing'].split(', '):
+            name, *params = entry.split(';')
+            params = dict(p.split('=', 1) for p in params)
+            metrics[name] = (float(params['dur']), params.get('desc', '').strip('"'))
+        return metrics
+
+    def test_server_timing_breaks_down_the_request(self):
+        self.client.force_login(self.owner)
+        with CaptureQueriesContext(connection) as queries:
+            metrics = self.timings(self.client.get('/api/projects/'))
+        self.assertEqual(set(metrics), {'total', 'db', 'session', 'serialize', 'app'})
+        self.assertEqual(metrics['db'][1], f'{len(queries)} queries')
+        self.assertEqual(metrics['session'][1], '1 queries')
+        self.assertGreater(metrics['serialize'][0], 0)
+        self.assertLessEqual(metrics['db'][0] + metrics['serialize'][0], metrics['total'][0])
+
+    @override_settings(ROOT_URLCONF='apied_service.asgi_urls')
+    async def test_async_views_count_queries_run_in_threads(self):
+        metrics = self.timings(await self.async_client.get('/api/projects/'))
+        self.assertNotEqual(metrics['db'][1], '0 queries')
+
+    def test_slow_requests_and_queries_are_logged_with_the_url_name(self):
+        with mock.patch('apied.instrumentation.SLOW_REQUEST_MS', 0), mock.patch('apied.instrumentation.SLOW_QUERY_MS', 0):
+            with self.assertLogs('apied.instrumentation', 'WARNING') as logs:
+                self.client.get('/api/projects/')
+        self.assertTrue(any(line.startswith('WARNING:apied.instrumentation:Slow query') and 'api-projects' in line for line in logs.output))
+        self.assertIn('Slow request GET /api/projects/ [api-projects] 200', logs.output[-1])
+
+    @override_settings(APIED_SERVER_TIMING=False)
+    def test_header_can_be_disabled(self):
+        self.assertNotIn('Server-Timing', self.client.get('/api/projects/'))
+
+    def test_production_profile_leaves_the_header_off(self):
+        self.assertFalse(importlib.import_module('apied_service.settings_production').APIED_SERVER_TIMING)
+
+
+class MetricsEndpointTests(CacheIsolatedTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user('staff', password='pw', is_staff=True)
+        Tariff.objects.create(title='Starter', price='50,000 RWF', redirect_url='https://example.com')
+
+    def setUp(self):
+        super().setUp()
+        self.metrics_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.metrics_dir)
+        settings_override = override_settings(APIED_METRICS_DIR=self.metrics_dir)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        registry.reset()
+
+    def scrape(self, **extra):
+        self.client.force_login(self.staff)
+        response = self.client.get('/api/metrics/', **extra)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        return response.content.decode().splitlines()
+
+    def test_only_staff_can_scrape_by_default(self):
+        self.assertEqual(self.client.get('/api/metrics/').status_code, 403)  # From the test client's 127.0.0.1
+        self.scrape(REMOTE_ADDR='10.0.0.1')
+
+    def test_allowed_addresses_must_connect_directly(self):
+        with mock.patch('apied.views.METRICS_ALLOWED_IPS', ['127.0.0.1']):
+            self.assertEqual(self.client.get('/api/metrics/').status_code, 200)
+            self.assertEqual(self.client.get('/api/metrics/', REMOTE_ADDR='10.0.0.1').status_code, 403)
+            # Relayed by a reverse proxy on the same host
+            for header in ({'HTTP_X_FORWARDED_FOR': '203.0.113.7'}, {'HTTP_FORWARDED': 'for=203.0.113.7'}):
+                self.assertEqual(self.client.get('/api/metrics/', **header).status_code, 403, header)
+
+    def test_requests_are_counted_by_route_with_histograms_and_cache_hit_ratio(self):
+        self.client.get('/api/tariffs/')
+        self.client.get('/api/tariffs/')
+        self.client.post('/api/tariffs/')
+        lines = self.scrape()
+        self.assertIn('apied_requests_total{route="api-tariffs",method="GET",status="200"} 2', lines)
+        self.assertIn('apied_requests_total{route="api-tariffs",method="POST",status="405"} 1', lines)
+        self.assertIn('apied_request_duration_seconds_bucket{route="api-tariffs",le="+Inf"} 3', lines)
+        self.assertIn('apied_request_duration_seconds_count{route="api-tariffs"} 3', lines)
+        self.assertIn('apied_db_queries_per_request_bucket{route="api-tariffs",le="0"} 2', lines)
+        self.assertIn('apied_db_queries_per_request_sum{route="api-tariffs"} 1', lines)
+        self.assertIn('apied_cache_requests_total{route="api-tariffs",result="miss"} 1', lines)
+        self.assertIn('apied_cache_hit_ratio{route="api-tariffs"} 0.5000', lines)
+
+    def test_other_worker_processes_are_merged_in(self):
+        self.client.get('/api/tariffs/')
+        other = {
+            'requests': [['api-tariffs', 'GET', '200', 4]],
+            'histograms': {'apied_db_queries_per_request': {'api-tariffs': [4, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]}},
+            'cache': {'api-tariffs': [4, 0]},
+        }
+        with open(f'{self.metrics_dir}/apied-other.json', 'w', encoding='utf-8') as f:
+            json.dump(other, f)
+        lines = self.scrape()
+        self.assertIn('apied_requests_total{route="api-tariffs",method="GET",status="200"} 5', lines)
+        self.assertIn('apied_db_queries_per_request_count{route="api-tariffs"} 5', lines)
+        self.assertIn('apied_cache_hit_ratio{route="api-tariffs"} 0.8000', lines)
+        # This process's own snapshot was written for the other workers to read
+        self.assertEqual(len(list(Path(self.metrics_dir).glob('apied-*.json'))), 2)
@@ -13,6 +13,7 @@ urlpatterns = [
     # Project Endpoints
     path('projects/', views.projects_list_create_view, name='api-projects'),
     path('projects/<int:pk>/', views.project_detail_update_delete_view, name='api-project-detail'),
+    path('projects/batch/', views.project_batch_view, name='api-project-batch'),
     
     # Interaction Endpoints
     path('projects/<int:pk>/like/', views.like_toggle_view, name='api-like-toggle'),
@@ -24,6 +25,7 @@ urlpatterns = [
 
     # --- NEW: Search Endpoint ---
     path('search/', views.project_search_view, name='api-search'),
+    path('search/suggest/', views.project_suggest_view, name='api-search-suggest'),
 
     # Portfolio Endpoint
     path('portfolio/<str:username>/', views.user_portfolio_view, name='api-user-portfolio'),
@@ -31,7 +33,13 @@ urlpatterns = [
     # --- NEW: Service Request Endpoints ---
     path('service-request/create/', views.service_request_create_view, name='api-service-request-create'),
     path('service-request/view/', views.service_request_detail_view, name='api-service-request-detail'),
+    path('service-requests/', views.service_request_list_view, name='api-service-request-list'),
+    path('service-requests/export/', views.service_request_export_view, name='api-service-request-export'),
+    path('service-requests/stats/', views.service_request_stats_view, name='api-service-request-stats'),
 
     # --- NEW: Tariff Endpoint ---
     path('tariffs/', views.tariff_list_view, name='api-tariffs'),
+
+    # Prometheus scrape target (staff or APIED_METRICS_ALLOWED_IPS only)
+    path('metrics/', views.metrics_view, name='api-metrics'),
 ]
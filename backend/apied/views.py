@@ -1,14 +1,40 @@
 # apied/views.py
 
-from django.http import JsonResponse
+from django.http import HttpResponse
 from django.views.decorators.csrf import csrf_exempt, ensure_csrf_cookie
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
 from django.shortcuts import get_object_or_404
-from django.db.models import Count, Q # Added Q for search queries
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Prefetch, Q, prefetch_related_objects # Added Q for search queries
+import hashlib
 import json
 from .models import ProjectPost, ProjectResource, Comment, Like, ServiceRequest, AdminReview, Tariff
+from .caching import PROJECT_CACHE_TIMEOUT, TARIFF_CACHE_KEY, project_cache_key, project_changed_at
+from .responses import JsonResponse, dumps
+from .pagination import InvalidCursor, encode_cursor, get_page_size, paginate_queryset, set_next_cursor
+from .analytics import report_range, service_request_report
+from .exports import EXPORT_FORMATS, service_request_export_response
+from .instrumentation import record_cache
+from .jobs import enqueue
+from .metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, collect, render as render_metrics
+from .search import fts_available, search_project_ids
+from .streaming import streaming_json_response, wants_stream
+from .suggest import DEFAULT_SUGGESTIONS, MAX_SUGGESTIONS, suggest
+
+# Newest comments embedded in a project's detail payload (comments_count holds the total)
+DETAIL_COMMENT_LIMIT = getattr(settings, 'APIED_DETAIL_COMMENTS', 20)
+
+# Largest number of ids accepted by project_batch_view
+BATCH_MAX_PROJECTS = getattr(settings, 'APIED_BATCH_MAX_PROJECTS', 50)
+
+# Addresses allowed to scrape /api/metrics/ without a staff login, when connecting directly
+METRICS_ALLOWED_IPS = getattr(settings, 'APIED_METRICS_ALLOWED_IPS', [])
 
 # --- Helper Serializer Functions ---
 
@@ -37,14 +63,15 @@ def serialize_comment(comment):
         'id': comment.id,
         'content': comment.content,
         'username': comment.user.username,
-        'user_id': comment.user.id,
-        'created_at': comment.created_at.isoformat(),
+        'user_id': comment.user_id,
+        'created_at': comment.created_at,
     }
 
 def serialize_project(project, request=None, include_details=False):
     """
     Returns project post data, with optional details for the full view.
     The 'request' object is crucial for building absolute URLs for media.
+    Callers wanting details must load PROJECT_DETAIL_PREFETCHES first.
     """
     data = {
         'id': project.id,
@@ -53,11 +80,13 @@ def serialize_project(project, request=None, include_details=False):
         'project_url': project.project_url,
         'project_type': project.get_project_type_display(),
         'screenshot_url': project.get_screenshot_url(request), # Pass request to get absolute URL
+        'screenshot_srcset': project.get_screenshot_srcset(request),
         'is_public': project.is_public,
-        'created_at': project.created_at.isoformat(),
+        'created_at': project.created_at,
         'username': project.user.username,
-        'user_id': project.user.id,
-        'likes_count': project.likes.count(),
+        'user_id': project.user_id,
+        'likes_count': project.likes_count,
+        'comments_count': project.comments_count,
         # --- NEW: Serialize additional fields ---
         'source_code_url': project.source_code_url,
         'custom_field_name': project.custom_field_name,
@@ -66,7 +95,11 @@ def serialize_project(project, request=None, include_details=False):
 
     if include_details:
         data['resources'] = [serialize_resource(r) for r in project.resources.all()]
-        data['comments'] = [serialize_comment(c) for c in project.comments.all().order_by('-created_at')]
+        comments = project.latest_comments
+        data['comments'] = [serialize_comment(c) for c in comments]
+        # Older comments are served by GET /projects/<pk>/comments/?cursor=...
+        more = len(comments) == DETAIL_COMMENT_LIMIT and project.comments_count > len(comments)
+        data['comments_next_cursor'] = encode_cursor(comments[-1].created_at.isoformat(), comments[-1].id) if more else None
     
     return data
 
@@ -78,7 +111,7 @@ def serialize_admin_review(review):
         'id': review.id,
         'admin_username': review.admin_user.username,
         'comment': review.comment,
-        'created_at': review.created_at.isoformat(),
+        'created_at': review.created_at,
     }
 
 def serialize_service_request(service_request):
@@ -94,12 +127,12 @@ def serialize_service_request(service_request):
         'job_category': service_request.job_category,
         'job_description': service_request.job_description,
         'job_attachment_url': service_request.job_attachment_url,
-        'due_date': service_request.due_date.isoformat() if service_request.due_date else None,
+        'due_date': service_request.due_date,
         'primary_phone': service_request.primary_phone,
         'secondary_phone': service_request.secondary_phone,
         'primary_email': service_request.primary_email,
         'budget_range': service_request.get_budget_range_display(),
-        'created_at': service_request.created_at.isoformat(),
+        'created_at': service_request.created_at,
         'reviews': [serialize_admin_review(r) for r in service_request.reviews.all()]
     }
     if service_request.user:
@@ -120,6 +153,126 @@ def serialize_tariff(tariff):
     }
 
 
+# --- Query Helpers ---
+
+# Everything serialize_project(include_details=True) reads: resources and the newest comments.
+# The sliced Prefetch is a single windowed query however many comments a project has.
+PROJECT_DETAIL_PREFETCHES = (
+    'resources',
+    Prefetch(
+        'comments',
+        queryset=Comment.objects.select_related('user').order_by('-created_at', '-id')[:DETAIL_COMMENT_LIMIT],
+        to_attr='latest_comments',
+    ),
+)
+
+def with_project_relations(projects):
+    """Loads the owner in the same query as the projects."""
+    return projects.select_related('user')
+
+def with_viewer_state(projects, user):
+    """
+    Annotates user_has_liked for the viewer as an EXISTS subquery, so like state
+    for a whole page costs no extra queries. Anonymous viewers get no annotation.
+    """
+    if not user.is_authenticated:
+        return projects
+    return projects.annotate(user_has_liked=Exists(Like.objects.filter(project=OuterRef('pk'), user=user)))
+
+def with_service_request_relations(service_requests):
+    """Loads the submitter and all reviews (with their authors) in two queries."""
+    reviews = AdminReview.objects.select_related('admin_user')
+    return service_requests.select_related('user').prefetch_related(Prefetch('reviews', queryset=reviews))
+
+def cached_project_payloads(projects, request, include_details=False):
+    """
+    Returns serialize_project() output for each project, reusing cached payloads
+    for unchanged versions. Viewer- and owner-specific fields are merged afterwards,
+    so one entry serves every visitor.
+    """
+    keys = {p.id: project_cache_key(p, request, include_details) for p in projects}
+    cached = cache.get_many(keys.values())
+    missing = [p for p in projects if keys[p.id] not in cached]
+    record_cache(len(projects) - len(missing), len(missing))
+    if missing:
+        if include_details:
+            prefetch_related_objects(missing, *PROJECT_DETAIL_PREFETCHES)
+        misses = {keys[p.id]: serialize_project(p, request, include_details) for p in missing}
+        cache.set_many(misses, PROJECT_CACHE_TIMEOUT)
+        cached.update(misses)
+    return merge_owner_fields(projects, [cached[keys[p.id]] for p in projects])
+
+def merge_owner_fields(projects, payloads):
+    """
+    Overlays fields that can change without bumping the project version,
+    plus the viewer's like state from with_viewer_state().
+    """
+    for project, data in zip(projects, payloads):
+        data['username'] = project.user.username
+        data['user_has_liked'] = getattr(project, 'user_has_liked', False)
+    return payloads
+
+def serialize_project_for_viewer(project, request):
+    """serialize_project() plus the merged owner/viewer fields, for streamed lists."""
+    return merge_owner_fields([project], [serialize_project(project, request)])[0]
+
+# --- Conditional GET Helpers ---
+
+def project_validators(request, projects, user, with_last_modified=False):
+    """
+    Returns (etag, last_modified) for already-loaded projects, built only from
+    ids and change timestamps, so it costs no serialization and no extra queries.
+    last_modified is only given for a single project's detail: a list's newest
+    timestamp stays put when a project leaves it (deleted, made private) or the
+    viewer changes, so lists are validated by ETag alone.
+    """
+    stamps, last_modified = [], None
+    for p in projects:
+        changed = project_changed_at(p)
+        last_modified = changed if last_modified is None else max(last_modified, changed)
+        stamps.append(f"{p.id}:{changed.timestamp()}")
+    # The viewer and the page/filters shape the body too (private projects, user_has_liked)
+    key = f"{user.id}|{request.get_full_path()}|{','.join(stamps)}"
+    etag = '"%s"' % hashlib.sha256(key.encode()).hexdigest()[:32]
+    if not with_last_modified or last_modified is None:
+        return etag, None
+    return etag, int(last_modified.timestamp())
+
+def conditional_project_response(request, projects, build_response, with_last_modified=False):
+    """Answers If-None-Match (and, for a detail, If-Modified-Since) with a 304, or calls build_response()."""
+    etag, last_modified = project_validators(request, projects, request.user, with_last_modified)
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = build_response()
+    return set_project_validators(response, etag, last_modified)
+
+def set_project_validators(response, etag, last_modified):
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+def paginated_project_response(request, projects):
+    """
+    Serializes one cursor page of projects, with the next cursor in the headers.
+    With ?stream=1 the whole result set is streamed instead, in constant memory.
+    """
+    projects = with_viewer_state(with_project_relations(projects), request.user)
+    if wants_stream(request):
+        projects = projects.order_by('-created_at', '-id')
+        return streaming_json_response(projects, lambda p: serialize_project_for_viewer(p, request))
+    try:
+        page, next_cursor = paginate_queryset(projects, request)
+    except InvalidCursor as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    def build_response():
+        response = JsonResponse(cached_project_payloads(page, request), safe=False)
+        return set_next_cursor(response, request, next_cursor)
+    return conditional_project_response(request, page, build_response)
+
+
 # --- Authentication Views (Unchanged) ---
 @ensure_csrf_cookie
 def current_user_view(request):
@@ -170,9 +323,8 @@ def logout_view(request):
 @csrf_exempt
 def projects_list_create_view(request):
     if request.method == 'GET':
-        projects = ProjectPost.objects.filter(is_public=True).order_by('-created_at')
-        data = [serialize_project(p, request) for p in projects]
-        return JsonResponse(data, safe=False)
+        projects = ProjectPost.objects.filter(is_public=True)
+        return paginated_project_response(request, projects)
 
     elif request.method == 'POST':
         if not request.user.is_authenticated:
@@ -202,15 +354,16 @@ def projects_list_create_view(request):
 
 @csrf_exempt
 def project_detail_update_delete_view(request, pk):
-    project = get_object_or_404(ProjectPost, pk=pk)
+    project = get_object_or_404(with_viewer_state(with_project_relations(ProjectPost.objects.all()), request.user), pk=pk)
     
     if request.method == 'GET':
         # Check if user has access (is owner or project is public)
         if not project.is_public and project.user != request.user:
              return JsonResponse({'error': 'Project not found or you do not have permission.'}, status=404)
-        data = serialize_project(project, request, include_details=True)
-        data['user_has_liked'] = request.user.is_authenticated and project.likes.filter(user=request.user).exists()
-        return JsonResponse(data)
+
+        def build_response():
+            return JsonResponse(cached_project_payloads([project], request, include_details=True)[0])
+        return conditional_project_response(request, [project], build_response, with_last_modified=True)
 
     if not request.user.is_authenticated:
         return JsonResponse({'error': 'Authentication required.'}, status=403)
@@ -235,14 +388,50 @@ def project_detail_update_delete_view(request, pk):
             project.source_code_url = data.get('source_code_url', project.source_code_url)
             project.custom_field_name = data.get('custom_field_name', project.custom_field_name)
             project.custom_field_value = data.get('custom_field_value', project.custom_field_value)
-            project.save()
-            return JsonResponse(serialize_project(project, request, include_details=True))
+            # Only the edited columns: counters, activity time and derivatives are written concurrently
+            project.save(update_fields=[
+                'title', 'description', 'project_url', 'project_type', 'is_public',
+                'source_code_url', 'custom_field_name', 'custom_field_value', 'updated_at',
+            ])
+            return JsonResponse(cached_project_payloads([project], request, include_details=True)[0])
         except Exception as e:
             return JsonResponse({'error': f'Update failed: {e}'}, status=400)
 
     return JsonResponse({'error': 'Method not allowed.'}, status=405)
 
 
+# --- NEW: Batch project fetch ---
+def project_batch_view(request):
+    """
+    Returns full project details for up to BATCH_MAX_PROJECTS ids (?ids=1,2,3), keyed by id.
+    Ids that don't exist or that the viewer may not see are listed under 'missing'.
+    Costs a constant number of queries however many ids are requested.
+    """
+    if request.method != 'GET':
+        return JsonResponse({'error': 'Only GET requests are allowed.'}, status=405)
+    try:
+        ids = list(dict.fromkeys(int(i) for i in request.GET.get('ids', '').split(',') if i.strip()))
+    except ValueError:
+        return JsonResponse({'error': 'ids must be a comma-separated list of integers.'}, status=400)
+    if not ids:
+        return JsonResponse({'error': 'At least one id is required.'}, status=400)
+    if len(ids) > BATCH_MAX_PROJECTS:
+        return JsonResponse({'error': f'At most {BATCH_MAX_PROJECTS} ids per request.'}, status=400)
+
+    # Same rule as the detail view: public, or owned by the viewer
+    visible = Q(is_public=True)
+    if request.user.is_authenticated:
+        visible |= Q(user=request.user)
+    found = with_viewer_state(with_project_relations(ProjectPost.objects.filter(visible)), request.user).in_bulk(ids)
+    projects = [found[pk] for pk in ids if pk in found]
+
+    def build_response():
+        payloads = cached_project_payloads(projects, request, include_details=True)
+        results = {str(project.id): data for project, data in zip(projects, payloads)}
+        return JsonResponse({'results': results, 'missing': [pk for pk in ids if pk not in found]})
+    return conditional_project_response(request, projects, build_response)
+
+
 # --- Interaction Views (Like, Comment, etc.) ---
 @csrf_exempt
 @login_required
@@ -250,24 +439,40 @@ def like_toggle_view(request, pk):
     if request.method != 'POST':
         return JsonResponse({'error': 'Only POST allowed'}, status=405)
     project = get_object_or_404(ProjectPost, pk=pk)
-    like, created = Like.objects.get_or_create(project=project, user=request.user)
-    action = 'liked' if created else 'unliked'
-    if not created:
-        like.delete()
-    return JsonResponse({'action': action, 'likes_count': project.likes.count()})
+    with transaction.atomic():
+        like, created = Like.objects.get_or_create(project=project, user=request.user)
+        action = 'liked' if created else 'unliked'
+        if not created:
+            # like_deleted (signals.py) decrements the counter, clamped at zero by Greatest()
+            Like.objects.filter(pk=like.pk).delete()
+    project.refresh_from_db(fields=['likes_count'])
+    return JsonResponse({'action': action, 'likes_count': project.likes_count})
 
 
 @csrf_exempt
-@login_required
 def comment_list_create_view(request, pk):
     project = get_object_or_404(ProjectPost, pk=pk)
+    if request.method == 'GET':
+        # Comments are readable wherever the project is, newest first, one cursor page at a time
+        if not project.is_public and project.user_id != request.user.id:
+            return JsonResponse({'error': 'Project not found or you do not have permission.'}, status=404)
+        try:
+            page, next_cursor = paginate_queryset(project.comments.select_related('user'), request)
+        except InvalidCursor as e:
+            return JsonResponse({'error': str(e)}, status=400)
+        response = JsonResponse([serialize_comment(c) for c in page], safe=False)
+        return set_next_cursor(response, request, next_cursor)
+
+    if not request.user.is_authenticated:
+        return JsonResponse({'error': 'Authentication required.'}, status=403)
     if request.method == 'POST':
         try:
             data = json.loads(request.body)
             content = data.get('content')
             if not content:
                 return JsonResponse({'error': 'Comment content is required.'}, status=400)
-            comment = Comment.objects.create(project=project, user=request.user, content=content)
+            with transaction.atomic():
+                comment = Comment.objects.create(project=project, user=request.user, content=content)
             return JsonResponse(serialize_comment(comment), status=201)
         except Exception as e:
             return JsonResponse({'error': f'Failed to post comment: {e}'}, status=400)
@@ -278,12 +483,12 @@ def comment_list_create_view(request, pk):
 @csrf_exempt
 @login_required
 def comment_delete_view(request, pk, comment_id):
-    comment = get_object_or_404(Comment, pk=comment_id, project__id=pk)
+    comment = get_object_or_404(Comment.objects.select_related('project'), pk=comment_id, project__id=pk)
     
     # Allow deletion if user is comment owner, project owner, or staff
-    if request.user == comment.user or request.user == comment.project.user or request.user.is_staff:
+    if request.user.id in (comment.user_id, comment.project.user_id) or request.user.is_staff:
         if request.method == 'DELETE':
-            comment.delete()
+            Comment.objects.filter(pk=comment.pk).delete()
             return JsonResponse({'message': 'Comment deleted successfully.'}, status=204)
         return JsonResponse({'error': 'Only DELETE method allowed.'}, status=405)
     
@@ -291,33 +496,56 @@ def comment_delete_view(request, pk, comment_id):
 
 
 # --- NEW: View for project search ---
-def project_search_view(request):
-    query = request.GET.get('q', '')
-    if not query:
-        return JsonResponse([], safe=False)
-
+def icontains_search_queryset(query):
+    """Fallback search for databases without the FTS5 index."""
     # Search in title, description, and username
-    projects = ProjectPost.objects.filter(
+    return ProjectPost.objects.filter(
         Q(is_public=True) & (
             Q(title__icontains=query) |
             Q(description__icontains=query) |
             Q(user__username__icontains=query)
         )
-    ).order_by('-created_at')
+    )
+
+def project_search_view(request):
+    query = request.GET.get('q', '')
+    if not query:
+        return JsonResponse([], safe=False)
 
-    data = [serialize_project(p, request) for p in projects]
-    return JsonResponse(data, safe=False)
+    if not fts_available():
+        return paginated_project_response(request, icontains_search_queryset(query))
+
+    # Full-text index over title, description, custom field and username, ranked by BM25
+    try:
+        ids, next_cursor = search_project_ids(query, get_page_size(request), request.GET.get('cursor'))
+    except InvalidCursor as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    projects = with_viewer_state(with_project_relations(ProjectPost.objects.all()), request.user).in_bulk(ids)
+    response = JsonResponse(cached_project_payloads([projects[pk] for pk in ids if pk in projects], request), safe=False)
+    return set_next_cursor(response, request, next_cursor)
+
+
+# --- NEW: Search-as-you-type suggestions ---
+def project_suggest_view(request):
+    """
+    Returns the top title and username completions for the prefix in 'q'.
+    Served entirely from the SearchSuggestion prefix index.
+    """
+    try:
+        limit = max(1, min(int(request.GET.get('limit', DEFAULT_SUGGESTIONS)), MAX_SUGGESTIONS))
+    except ValueError:
+        limit = DEFAULT_SUGGESTIONS
+    return JsonResponse(suggest(request.GET.get('q', ''), limit))
 
 
 # --- Portfolio and Resource Views (Largely Unchanged) ---
 def user_portfolio_view(request, username):
     user = get_object_or_404(User, username=username)
-    projects = user.projects.all().order_by('-created_at')
+    projects = user.projects.all()
     # Filter for public projects if the viewer is not the owner
     if request.user != user:
         projects = projects.filter(is_public=True)
-    data = [serialize_project(p, request) for p in projects]
-    return JsonResponse(data, safe=False)
+    return paginated_project_response(request, projects)
 
 @csrf_exempt
 @login_required
@@ -382,6 +610,7 @@ def service_request_create_view(request):
             budget_range=data.get('budget_range'),
             terms_accepted=data.get('terms_accepted'),
         )
+        enqueue('notify_service_request', {'request_id': new_request.pk})
         return JsonResponse({'message': 'Request submitted successfully.', 'request_code': new_request.request_code}, status=201)
     
     except json.JSONDecodeError:
@@ -390,6 +619,72 @@ def service_request_create_view(request):
         return JsonResponse({'error': f'An unexpected error occurred: {e}'}, status=500)
 
 
+def service_request_list_view(request):
+    """Staff-only listing of every service request, newest first, streamed as a JSON array."""
+    if not request.user.is_staff:
+        return JsonResponse({'error': 'Staff access required.'}, status=403)
+    if request.method != 'GET':
+        return JsonResponse({'error': 'Only GET requests are allowed.'}, status=405)
+
+    return streaming_json_response(filtered_service_requests(request), serialize_service_request)
+
+
+def service_request_export_view(request):
+    """Staff-only download of every (optionally filtered) service request with its reviews, as ?format=csv or ndjson."""
+    if not request.user.is_staff:
+        return JsonResponse({'error': 'Staff access required.'}, status=403)
+    if request.method != 'GET':
+        return JsonResponse({'error': 'Only GET requests are allowed.'}, status=405)
+    fmt = request.GET.get('format', 'csv')
+    if fmt not in EXPORT_FORMATS:
+        return JsonResponse({'error': f"format must be one of: {', '.join(EXPORT_FORMATS)}."}, status=400)
+    return service_request_export_response(filtered_service_requests(request), fmt, serialize_service_request)
+
+
+def is_allowed_scraper(request):
+    # A reverse proxy on this host makes every request it relays come from 127.0.0.1
+    if 'HTTP_X_FORWARDED_FOR' in request.META or 'HTTP_FORWARDED' in request.META:
+        return False
+    return request.META.get('REMOTE_ADDR') in METRICS_ALLOWED_IPS
+
+
+def metrics_view(request):
+    """
+    Request, latency, SQL and cache metrics for every worker process, in the Prometheus text format.
+    Open to staff and to scrapers connecting straight from APIED_METRICS_ALLOWED_IPS.
+    """
+    if not is_allowed_scraper(request) and not request.user.is_staff:
+        return JsonResponse({'error': 'Staff access required.'}, status=403)
+    if request.method != 'GET':
+        return JsonResponse({'error': 'Only GET requests are allowed.'}, status=405)
+    return HttpResponse(render_metrics(collect()), content_type=METRICS_CONTENT_TYPE)
+
+
+def filtered_service_requests(request):
+    """Service requests newest first, narrowed by the optional ?service_type= filter."""
+    service_requests = ServiceRequest.objects.order_by('-created_at', '-id')
+    service_type = request.GET.get('service_type')
+    if service_type:
+        service_requests = service_requests.filter(service_type=service_type)
+    return with_service_request_relations(service_requests)
+
+
+def service_request_stats_view(request):
+    """
+    Staff-only request analytics for ?from=YYYY-MM-DD&to=YYYY-MM-DD (default: the last 30 days),
+    served from the daily rollup table.
+    """
+    if not request.user.is_staff:
+        return JsonResponse({'error': 'Staff access required.'}, status=403)
+    if request.method != 'GET':
+        return JsonResponse({'error': 'Only GET requests are allowed.'}, status=405)
+    try:
+        start, end = report_range(request.GET)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    return JsonResponse(service_request_report(start, end))
+
+
 @csrf_exempt
 def service_request_detail_view(request):
     """Fetches a service request by its unique code."""
@@ -398,7 +693,7 @@ def service_request_detail_view(request):
         return JsonResponse({'error': 'A request code is required.'}, status=400)
 
     try:
-        service_request = get_object_or_404(ServiceRequest, request_code=code)
+        service_request = get_object_or_404(with_service_request_relations(ServiceRequest.objects.all()), request_code=code)
         return JsonResponse(serialize_service_request(service_request))
     except ServiceRequest.DoesNotExist:
         return JsonResponse({'error': 'Invalid request code.'}, status=404)
@@ -406,14 +701,40 @@ def service_request_detail_view(request):
         return JsonResponse({'error': f'An error occurred: {e}'}, status=500)
 
 # --- NEW: Tariff View ---
+def get_cached_tariffs():
+    """
+    Returns (body, etag) for the active tariff list, serializing it only on a cache miss.
+    Tariff saves/deletes (including admin list edits) drop the entry, see apied/signals.py.
+    """
+    cached = cache.get(TARIFF_CACHE_KEY)
+    record_cache(cached is not None, cached is None)
+    if cached is None:
+        cached = build_tariff_entry(Tariff.objects.filter(is_active=True).order_by('order'))
+        cache.set(TARIFF_CACHE_KEY, cached, None)
+    return cached
+
+def build_tariff_entry(tariffs):
+    """Serializes tariffs once and derives a strong ETag from the bytes."""
+    body = dumps([serialize_tariff(t) for t in tariffs])
+    return body, '"%s"' % hashlib.sha256(body).hexdigest()[:32]
+
+def tariff_response(request, body, etag):
+    """A 304 when the client's copy is current, otherwise the cached body."""
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(body, content_type='application/json')
+    response['ETag'] = etag
+    patch_cache_control(response, public=True, no_cache=True)
+    return response
+
 def tariff_list_view(request):
     """
     Provides a list of all active tariffs, ordered by the 'order' field.
     This view is public and does not require authentication.
+    Repeat visitors revalidate with If-None-Match and get a 304 straight from the cache.
     """
-    if request.method == 'GET':
-        tariffs = Tariff.objects.filter(is_active=True).order_by('order')
-        data = [serialize_tariff(t) for t in tariffs]
-        return JsonResponse(data, safe=False)
+    if request.method in ('GET', 'HEAD'):
+        body, etag = get_cached_tariffs()
+        return tariff_response(request, body, etag)
     
     return JsonResponse({'error': 'Only GET requests are allowed.'}, status=405)
@@ -11,6 +11,7 @@ import os
 
 from django.core.asgi import get_asgi_application
 
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "apied_service.settings")
+# The ASGI profile routes public reads to async views (see settings_asgi.py)
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "apied_service.settings_asgi")
 
 application = get_asgi_application()
@@ -0,0 +1,17 @@
+"""
+URL configuration for the ASGI profile (apied_service.settings_asgi).
+Identical to apied_service.urls except that /api/ routes public reads to async views.
+"""
+from django.contrib import admin
+from django.urls import path, include
+
+from django.conf import settings
+from django.conf.urls.static import static
+
+urlpatterns = [
+    path('admin/', admin.site.urls),
+    path('api/', include('apied.async_urls')),
+]
+
+if settings.DEBUG:
+    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
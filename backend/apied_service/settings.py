@@ -50,6 +50,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # First, so its Server-Timing covers every other middleware (session lookup included)
+    'apied.instrumentation.RequestInstrumentationMiddleware',
     # CORS Middleware MUST be placed very high up, before common middleware
     'corsheaders.middleware.CorsMiddleware',
     "django.middleware.security.SecurityMiddleware",
@@ -94,6 +96,17 @@ DATABASES = {
 }
 
 
+# Cache
+# File-based so every worker process on the host shares (and invalidates) the same entries
+
+CACHES = {
+    "default": {
+        "BACKEND": config('CACHE_BACKEND', default="django.core.cache.backends.filebased.FileBasedCache"),
+        "LOCATION": config('CACHE_LOCATION', default=str(BASE_DIR / "cache")),
+    }
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -143,6 +156,53 @@ STATIC_ROOT = '/home/gloex/apied_service/static'
 # STATIC_URL is defined above but we keep the root defined for deployment
 
 
+# Cursor pagination for the project feed, search and portfolio endpoints
+APIED_PAGE_SIZE = 50
+APIED_MAX_PAGE_SIZE = 200
+
+# Newest comments embedded in a project's detail response; older ones are paged via /comments/
+APIED_DETAIL_COMMENTS = 20
+
+# Most project ids accepted by /api/projects/batch/
+APIED_BATCH_MAX_PROJECTS = 50
+
+# Request instrumentation (apied/instrumentation.py): Server-Timing header and slow request/query logging.
+# The header is sent to every client, so settings_production.py turns it off unless asked for.
+APIED_SERVER_TIMING = config('APIED_SERVER_TIMING', default=True, cast=bool)
+APIED_SLOW_REQUEST_MS = config('APIED_SLOW_REQUEST_MS', default=500, cast=int)
+APIED_SLOW_QUERY_MS = config('APIED_SLOW_QUERY_MS', default=100, cast=int)
+
+# Prometheus metrics at /api/metrics/ (apied/metrics.py). With several worker processes, point
+# APIED_METRICS_DIR at a directory they all share so every scrape covers all of them; left empty,
+# each process only reports its own requests. Staff can always scrape; APIED_METRICS_ALLOWED_IPS
+# (comma-separated, none by default) also admits a scraper connecting straight to the app server.
+# It is matched against REMOTE_ADDR, which behind a reverse proxy is the proxy's own address, so
+# requests a proxy relayed (with X-Forwarded-For or Forwarded) never match it.
+APIED_METRICS_DIR = config('APIED_METRICS_DIR', default='')
+APIED_METRICS_FLUSH_SECONDS = config('APIED_METRICS_FLUSH_SECONDS', default=5, cast=float)
+APIED_METRICS_ALLOWED_IPS = config('APIED_METRICS_ALLOWED_IPS', default='', cast=lambda v: [ip.strip() for ip in v.split(',') if ip.strip()])
+
+# The apied loggers (slow requests/queries, failed background jobs) write to stderr,
+# which the WSGI server collects into its error log.
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'apied': {'format': '{asctime} {levelname} {name}: {message}', 'style': '{'},
+    },
+    'handlers': {
+        'apied_console': {'class': 'logging.StreamHandler', 'formatter': 'apied'},
+    },
+    'loggers': {
+        'apied': {
+            'handlers': ['apied_console'],
+            'level': config('APIED_LOG_LEVEL', default='INFO'),
+            'propagate': False,
+        },
+    },
+}
+
+
 # --- CORS and Session Configuration (CRITICAL for Cross-Origin API) ---
 
 # settings.py on the gloex.pythonanywhere.com server
@@ -157,6 +217,9 @@ CORS_ALLOWED_ORIGINS = [
     "https://www.gloex.org",
 ]
 
+# List endpoints return a plain JSON array; the next page cursor travels in these headers
+CORS_EXPOSE_HEADERS = ['Link', 'X-Next-Cursor']
+
 # This MUST be True to allow the browser to send cookies (like session ID) cross-origin
 CORS_ALLOW_CREDENTIALS = True
 
@@ -0,0 +1,19 @@
+"""
+ASGI deployment profile for apied_service.
+
+Serves the public read endpoints (feed, detail, search, portfolio, tariffs and
+service-request lookup) from async views, so one process can hold many slow
+clients open without tying up a worker thread each. It builds on the production
+SQLite profile (settings_production.py). Run it with any ASGI server, for example:
+
+    pip install "uvicorn[standard]"
+    uvicorn apied_service.asgi:application --host 127.0.0.1 --port 8000 --workers 2
+"""
+from .settings_production import *  # noqa: F401,F403
+
+ROOT_URLCONF = "apied_service.asgi_urls"
+
+# Under ASGI each request may run ORM work on a different thread, so persistent
+# connections would be opened per thread and never reused; keep them per request
+# (the production PRAGMAs are still applied to each new connection).
+DATABASES["default"]["CONN_MAX_AGE"] = 0  # noqa: F405